@@ -0,0 +1,244 @@
+"""
+Tables d'analyse par requête: blessures par (saison, poste) et joueurs par poste, sans ALLOW FILTERING
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from cassandra import InvalidRequest
+from cassandra.query import BatchStatement, BatchType, SimpleStatement
+
+from database.bulk_loader import (
+    DEFAULT_CONCURRENCY, UNKNOWN_DAYS, UNKNOWN_KEY, bulk_execute, injury_by_season_position_parameters,
+    player_by_position_parameters
+)
+from database.session import get_session_manager
+
+CREATE_INJURIES_BY_SEASON_POSITION = """
+    CREATE TABLE IF NOT EXISTS injuries_by_season_position (
+        season_name text,
+        main_position text,
+        days_missed float,
+        injury_id uuid,
+        player_id int,
+        injury_reason text,
+        from_date date,
+        end_date date,
+        games_missed int,
+        severity_score float,
+        PRIMARY KEY ((season_name, main_position), days_missed, injury_id)
+    ) WITH CLUSTERING ORDER BY (days_missed DESC, injury_id ASC)
+"""
+
+CREATE_PLAYERS_BY_POSITION = """
+    CREATE TABLE IF NOT EXISTS players_by_position (
+        main_position text,
+        player_id int,
+        player_name text,
+        date_of_birth date,
+        height float,
+        position text,
+        foot text,
+        current_club_name text,
+        PRIMARY KEY ((main_position), player_id)
+    )
+"""
+
+# Catalogue des partitions (saison, poste) existantes: une seule petite partition
+CREATE_INJURY_PARTITIONS = """
+    CREATE TABLE IF NOT EXISTS injury_partitions (
+        bucket int,
+        season_name text,
+        main_position text,
+        PRIMARY KEY ((bucket), season_name, main_position)
+    )
+"""
+
+# Poste dénormalisé dans injuries: la clé de injuries_by_season_position reste
+# connue pour la suppression, même si le joueur change de poste ensuite
+ADD_INJURY_POSITION = "ALTER TABLE injuries ADD main_position text"
+
+# Partitions (saison, poste) lues en parallèle par les requêtes multi-partitions
+PARTITION_READ_WORKERS = 16
+
+# Lignes lues par page pendant le backfill
+BACKFILL_FETCH_SIZE = 5000
+
+# Colonnes de players, dans l'ordre de la requête insert_player
+PLAYER_FIELDS = [
+    'player_id', 'player_name', 'date_of_birth', 'place_of_birth', 'country_of_birth', 'height',
+    'position', 'main_position', 'foot', 'current_club_name', 'created_at', 'updated_at'
+]
+
+
+def create_tables():
+    """Créer les tables d'analyse (sans effet si elles existent)"""
+    session = get_session_manager().session
+    for statement in (CREATE_INJURIES_BY_SEASON_POSITION, CREATE_PLAYERS_BY_POSITION, CREATE_INJURY_PARTITIONS):
+        session.execute(statement)
+    try:
+        session.execute(ADD_INJURY_POSITION)
+    except InvalidRequest:
+        pass  # Colonne déjà ajoutée
+    print("✅ Tables d'analyse prêtes (injuries_by_season_position, players_by_position)")
+
+
+def injury_partitions(season_name=None, main_position=None):
+    """Partitions (saison, poste) existantes, éventuellement filtrées"""
+    return [
+        (row.season_name, row.main_position)
+        for row in get_session_manager().execute('get_injury_partitions')
+        if (season_name is None or row.season_name == season_name)
+        and (main_position is None or row.main_position == main_position)
+    ]
+
+
+def _read_partitions(statement_name, partitions, extra=()):
+    """Lire plusieurs partitions en parallèle (chacune est une lecture bornée)"""
+    manager = get_session_manager()
+    if not partitions:
+        return []
+    with ThreadPoolExecutor(max_workers=min(PARTITION_READ_WORKERS, len(partitions))) as executor:
+        pages = executor.map(lambda partition: list(manager.execute(statement_name, (*partition, *extra))),
+                             partitions)
+        return [row for page in pages for row in page]
+
+
+def get_injuries_by_season_position(season_name, main_position):
+    """Blessures d'une saison pour un poste, de la plus longue à la plus courte"""
+    return list(get_session_manager().execute('get_injuries_by_season_position', (season_name, main_position)))
+
+
+def get_injuries_by_season(season_name):
+    """Blessures d'une saison (une partition par poste)"""
+    return _read_partitions('get_injuries_by_season_position', injury_partitions(season_name=season_name))
+
+
+def get_severe_injuries(min_days, season_name=None, main_position=None):
+    """Blessures d'au moins min_days jours (tranche en tête de chaque partition)"""
+    partitions = injury_partitions(season_name, main_position)
+    rows = _read_partitions('get_severe_injuries_by_season_position', partitions, (float(min_days),))
+    return sorted(rows, key=lambda row: row.days_missed, reverse=True)
+
+
+def search_players_by_position(main_position):
+    """Joueurs d'un poste (une seule partition)"""
+    return list(get_session_manager().execute('search_players_by_position', (main_position,)))
+
+
+def write_player(player_data: dict):
+    """Insérer ou mettre à jour un joueur dans players et players_by_position (batch logged)
+
+    Si le poste change, l'ancienne ligne (poste, joueur) de players_by_position
+    est supprimée dans le même batch. Retourne l'identifiant du joueur.
+    """
+    manager = get_session_manager()
+    player = {field: player_data.get(field) for field in PLAYER_FIELDS}
+    existing = manager.execute('get_player', (player['player_id'],)).one()
+    now = datetime.now()
+    player['created_at'] = player['created_at'] or (existing.created_at if existing is not None else None) or now
+    player['updated_at'] = now
+
+    parameters = [player[field] for field in PLAYER_FIELDS]
+    by_position = player_by_position_parameters([parameters])[0]
+    batch = BatchStatement(batch_type=BatchType.LOGGED)
+    batch.add(manager.prepare('insert_player'), parameters)
+    # Suppression seulement si la clé change: à horodatage égal, une suppression l'emporte sur l'insertion
+    old_position = (existing.main_position or UNKNOWN_KEY) if existing is not None else None
+    if old_position is not None and old_position != by_position[0]:
+        batch.add(manager.prepare('delete_player_by_position'), (old_position, player['player_id']))
+    batch.add(manager.prepare('insert_player_by_position'), by_position)
+    manager.session.execute(batch)
+    return player['player_id']
+
+
+def delete_player(player_id):
+    """Supprimer un joueur de players et de players_by_position (False s'il n'existe pas)"""
+    manager = get_session_manager()
+    existing = manager.execute('get_player', (player_id,)).one()
+    if existing is None:
+        return False
+    batch = BatchStatement(batch_type=BatchType.LOGGED)
+    batch.add(manager.prepare('delete_player'), (player_id,))
+    batch.add(manager.prepare('delete_player_by_position'), (existing.main_position or UNKNOWN_KEY, player_id))
+    manager.session.execute(batch)
+    return True
+
+
+def injury_write_statements(injury, main_position):
+    """Requêtes (nom, paramètres) qui maintiennent les tables d'analyse pour une blessure
+
+    Le poste utilisé est aussi enregistré dans injuries.main_position.
+    """
+    parameters = (
+        injury['injury_id'], injury['player_id'], injury['season_name'], injury['injury_reason'],
+        injury['from_date'], injury['end_date'], injury['days_missed'], injury['games_missed'],
+        injury['severity_score'], injury['created_at']
+    )
+    rows, partitions = injury_by_season_position_parameters([parameters], {injury['player_id']: main_position})
+    return [
+        ('insert_injury_by_season_position', rows[0]),
+        ('set_injury_position', (main_position, injury['injury_id'])),
+    ] + [('insert_injury_partition', partition) for partition in partitions]
+
+
+def injury_delete_statement(injury_id, season_name, main_position, days_missed):
+    """Requête (nom, paramètres) qui retire une blessure de injuries_by_season_position
+
+    Les valeurs doivent être celles stockées (voir delete_injury): une valeur
+    manquante cible la ligne 'Unknown' écrite pour les blessures incomplètes.
+    """
+    return ('delete_injury_by_season_position', (
+        season_name or UNKNOWN_KEY, main_position or UNKNOWN_KEY,
+        days_missed if days_missed is not None else UNKNOWN_DAYS, injury_id
+    ))
+
+
+def backfill(fetch_size=BACKFILL_FETCH_SIZE, concurrency=DEFAULT_CONCURRENCY):
+    """Remplir les tables d'analyse à partir de players et injuries (idempotent)"""
+    manager = get_session_manager()
+    start = time.perf_counter()
+    report = {'players': 0, 'injuries': 0, 'failed': 0}
+
+    player_rows = manager.session.execute(SimpleStatement("SELECT * FROM players", fetch_size=fetch_size))
+    player_positions = {}
+    for page in _pages(player_rows):
+        parameters = [
+            (row.player_id, row.player_name, row.date_of_birth, None, None, row.height, row.position,
+             row.main_position, row.foot, row.current_club_name, None, None)
+            for row in page
+        ]
+        player_positions.update((row.player_id, row.main_position) for row in page)
+        result = bulk_execute('insert_player_by_position', player_by_position_parameters(parameters), concurrency)
+        report['players'] += result['inserted']
+        report['failed'] += result['failed']
+
+    injury_rows = manager.session.execute(SimpleStatement(
+        "SELECT injury_id, player_id, season_name, injury_reason, from_date, end_date, "
+        "days_missed, games_missed, severity_score, created_at FROM injuries",
+        fetch_size=fetch_size
+    ))
+    for page in _pages(injury_rows):
+        rows, partitions = injury_by_season_position_parameters([tuple(row) for row in page], player_positions)
+        bulk_execute('insert_injury_partition', sorted(partitions), concurrency)
+        bulk_execute('set_injury_position', [
+            (player_positions.get(row.player_id), row.injury_id) for row in page
+        ], concurrency)
+        result = bulk_execute('insert_injury_by_season_position', rows, concurrency)
+        report['injuries'] += result['inserted']
+        report['failed'] += result['failed']
+        print(f"  🔁 {report['injuries']:,} blessures recopiées")
+
+    report['seconds'] = time.perf_counter() - start
+    status = "✅" if report['failed'] == 0 else "⚠️"
+    print(f"{status} Tables d'analyse remplies: {report['players']:,} joueurs, "
+          f"{report['injuries']:,} blessures, {report['failed']} erreurs en {report['seconds']:.1f}s")
+    return report
+
+
+def _pages(rows):
+    """Pages successives d'un résultat paginé"""
+    while True:
+        yield rows.current_rows
+        if not rows.has_more_pages:
+            break
+        rows.fetch_next_page()
@@ -0,0 +1,245 @@
+"""
+Import en masse des CSV dans Cassandra avec une fenêtre bornée de requêtes concurrentes
+"""
+import time
+import uuid
+from datetime import datetime
+import pandas as pd
+from cassandra.concurrent import execute_concurrent_with_args
+from cassandra.query import SimpleStatement
+
+from database.session import get_session_manager
+from src.categories import severity_score
+from src.schema import normalize_injuries, normalize_players
+
+# Requêtes en vol simultanément (borne la mémoire et la charge des coordinateurs)
+DEFAULT_CONCURRENCY = 100
+
+# Lignes du CSV lues et envoyées par bloc
+CSV_CHUNK_ROWS = 20000
+
+# Erreurs détaillées conservées dans le rapport (les suivantes sont seulement comptées)
+MAX_RECORDED_ERRORS = 1000
+
+PLAYER_COLUMNS = [
+    'player_id', 'player_name', 'date_of_birth', 'place_of_birth', 'country_of_birth',
+    'height', 'position', 'main_position', 'foot', 'current_club_name'
+]
+# Valeurs de clé des colonnes manquantes (une colonne de clé ne peut pas être nulle)
+UNKNOWN_KEY = 'Unknown'
+UNKNOWN_DAYS = -1.0
+
+INJURY_COLUMNS = [
+    'player_id', 'season_name', 'injury_reason', 'from_date', 'end_date',
+    'days_missed', 'games_missed'
+]
+
+
+def _column_values(series):
+    """Valeurs Python d'une colonne (None pour les manquants, date pour les dates)"""
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return [value.date() if not pd.isna(value) else None for value in series]
+    values = series.astype(object)
+    return values.where(series.notna(), None).tolist()
+
+
+def player_parameters(players_df, created_at=None):
+    """Paramètres de la requête insert_player pour chaque ligne"""
+    created_at = created_at or datetime.now()
+    players_df = normalize_players(players_df)
+    columns = [
+        _column_values(players_df[col]) if col in players_df.columns else [None] * len(players_df)
+        for col in PLAYER_COLUMNS
+    ]
+    return [(*values, created_at, created_at) for values in zip(*columns)]
+
+
+def injury_parameters(injuries_df, created_at=None):
+    """Paramètres de la requête insert_injury pour chaque ligne (identifiant et sévérité calculés)"""
+    created_at = created_at or datetime.now()
+    injuries_df = normalize_injuries(injuries_df)
+    columns = {
+        col: _column_values(injuries_df[col]) if col in injuries_df.columns else [None] * len(injuries_df)
+        for col in INJURY_COLUMNS
+    }
+    # Même règle de sévérité que les autres chemins d'écriture (src.categories)
+    days_missed = pd.Series(columns['days_missed'], dtype='float64')
+    columns['severity_score'] = _column_values(pd.Series(severity_score(days_missed)).where(days_missed.notna()))
+    parameters = []
+    for player_id, season, reason, from_date, end_date, days, games, severity in zip(*columns.values()):
+        parameters.append((
+            uuid.uuid4(), player_id, season, reason, from_date, end_date, days, games, severity, created_at
+        ))
+    return parameters
+
+
+def injury_by_player_parameters(parameters):
+    """Paramètres de insert_injury_by_player dérivés de ceux de insert_injury
+
+    Retourne (positions, paramètres): les blessures sans joueur ou sans
+    date de début ne peuvent pas entrer dans la clé de injuries_by_player.
+    """
+    positions, by_player = [], []
+    for position, (injury_id, player_id, season, reason, from_date, end_date,
+                   days, games, severity, created_at) in enumerate(parameters):
+        if player_id is None or from_date is None:
+            continue
+        positions.append(position)
+        by_player.append((player_id, from_date, injury_id, season, reason, end_date,
+                          days, games, severity, created_at))
+    return positions, by_player
+
+
+def player_by_position_parameters(parameters):
+    """Paramètres de insert_player_by_position dérivés de ceux de insert_player"""
+    return [
+        (main_position or UNKNOWN_KEY, player_id, name, date_of_birth, height, position, foot, club)
+        for (player_id, name, date_of_birth, _, _, height, position, main_position,
+             foot, club, _, _) in parameters
+    ]
+
+
+def injury_by_season_position_parameters(parameters, player_positions):
+    """Paramètres de insert_injury_by_season_position dérivés de ceux de insert_injury
+
+    player_positions associe player_id -> main_position. Retourne aussi les
+    partitions (saison, poste) touchées, à enregistrer dans injury_partitions.
+    """
+    rows, partitions = [], set()
+    for (injury_id, player_id, season, reason, from_date, end_date,
+         days, games, severity, _) in parameters:
+        partition = (season or UNKNOWN_KEY, player_positions.get(player_id) or UNKNOWN_KEY)
+        partitions.add(partition)
+        rows.append((*partition, days if days is not None else UNKNOWN_DAYS, injury_id,
+                     player_id, reason, from_date, end_date, games, severity))
+    return rows, partitions
+
+
+def load_player_positions(fetch_size=5000):
+    """player_id -> main_position lus dans la table players"""
+    session = get_session_manager().session
+    rows = session.execute(SimpleStatement("SELECT player_id, main_position FROM players", fetch_size=fetch_size))
+    return {row.player_id: row.main_position for row in rows}
+
+
+def bulk_execute(statement_name, parameters, concurrency=DEFAULT_CONCURRENCY, first_row=0,
+                 query=None, row_numbers=None):
+    """Exécuter une requête préparée pour chaque jeu de paramètres
+
+    Au plus concurrency requêtes sont en vol; une erreur n'interrompt pas le
+    lot: elle est enregistrée avec le numéro de ligne (first_row + position,
+    ou row_numbers[position] si fourni). 'succeeded' liste les positions
+    (dans parameters) des requêtes réussies.
+    """
+    manager = get_session_manager()
+    statement = manager.prepare(statement_name, query)
+
+    start = time.perf_counter()
+    results = execute_concurrent_with_args(
+        manager.session, statement, parameters,
+        concurrency=concurrency, raise_on_first_error=False, results_generator=True
+    )
+
+    failed, errors, succeeded = 0, [], []
+    for position, (success, result) in enumerate(results):
+        if success:
+            succeeded.append(position)
+        else:
+            failed += 1
+            if len(errors) < MAX_RECORDED_ERRORS:
+                row = first_row + (row_numbers[position] if row_numbers is not None else position)
+                errors.append({'row': row, 'error': f"{type(result).__name__}: {result}"})
+
+    seconds = time.perf_counter() - start
+    return {
+        'rows': len(parameters),
+        'inserted': len(parameters) - failed,
+        'failed': failed,
+        'errors': errors,
+        'succeeded': succeeded,
+        'seconds': seconds,
+        'rows_per_second': len(parameters) / seconds if seconds > 0 else float('inf')
+    }
+
+
+def _empty_report(table):
+    return {'table': table, 'rows': 0, 'inserted': 0, 'failed': 0, 'errors': [], 'seconds': 0.0}
+
+
+def _merge_reports(total, report):
+    """Cumuler le rapport d'un bloc dans le rapport global"""
+    for key in ('rows', 'inserted', 'failed', 'seconds'):
+        total[key] += report[key]
+    total['errors'].extend(report['errors'][:MAX_RECORDED_ERRORS - len(total['errors'])])
+
+
+def import_csv(csv_path, table, concurrency=DEFAULT_CONCURRENCY, chunk_rows=CSV_CHUNK_ROWS,
+               player_positions=None):
+    """Importer player_profiles.csv (table='players') ou player_injuries.csv (table='injuries')
+
+    Le CSV est lu par blocs: le bloc suivant n'est lu qu'une fois le
+    précédent écrit, ce qui borne la mémoire quel que soit le volume. Les
+    tables dérivées sont écrites avec chaque bloc (rapports séparés dans
+    'derived'): players_by_position pour les joueurs, injuries_by_player,
+    injuries_by_season_position et le poste enregistré dans
+    injuries.main_position pour les blessures. Seules les lignes dont
+    l'écriture principale a réussi sont recopiées. Le poste des joueurs
+    vient de player_positions (player_id -> main_position) ou, à défaut,
+    de la table players.
+    """
+    builders = {
+        'players': ('insert_player', player_parameters),
+        'injuries': ('insert_injury', injury_parameters),
+    }
+    if table not in builders:
+        raise ValueError(f"Table inconnue: {table} (attendu: {tuple(builders)})")
+    statement_name, build_parameters = builders[table]
+    if table == 'injuries' and player_positions is None:
+        player_positions = load_player_positions()
+
+    total = _empty_report(table)
+    derived = {}
+    start = time.perf_counter()
+    for chunk in pd.read_csv(csv_path, chunksize=chunk_rows):
+        parameters = build_parameters(chunk)
+        report = bulk_execute(statement_name, parameters, concurrency, first_row=total['rows'])
+
+        # Tables dérivées alimentées par les seules lignes présentes dans la table principale
+        succeeded = report['succeeded']
+        written = [parameters[position] for position in succeeded]
+        writes = []
+        if table == 'players':
+            writes.append(('players_by_position', 'insert_player_by_position',
+                           player_by_position_parameters(written), succeeded))
+        else:
+            positions, by_player_parameters = injury_by_player_parameters(written)
+            writes.append(('injuries_by_player', 'insert_injury_by_player', by_player_parameters,
+                           [succeeded[position] for position in positions]))
+            by_season_parameters, partitions = injury_by_season_position_parameters(written, player_positions)
+            writes.append(('injuries_by_season_position', 'insert_injury_by_season_position',
+                           by_season_parameters, succeeded))
+            writes.append(('injuries.main_position', 'set_injury_position', [
+                (player_positions.get(player_id), injury_id) for injury_id, player_id, *_ in written
+            ], succeeded))
+            bulk_execute('insert_injury_partition', sorted(partitions), concurrency)
+
+        for derived_table, derived_statement, derived_parameters, row_numbers in writes:
+            _merge_reports(derived.setdefault(derived_table, _empty_report(derived_table)), bulk_execute(
+                derived_statement, derived_parameters, concurrency,
+                first_row=total['rows'], row_numbers=row_numbers
+            ))
+        _merge_reports(total, report)
+        print(f"  📥 {table}: {total['rows']:,} lignes ({report['rows_per_second']:,.0f} lignes/s, "
+              f"{total['failed']} erreurs)")
+
+    total['seconds'] = time.perf_counter() - start
+    total['rows_per_second'] = total['rows'] / total['seconds'] if total['seconds'] > 0 else float('inf')
+    total['derived'] = derived
+    status = "✅" if total['failed'] == 0 else "⚠️"
+    print(f"{status} {table}: {total['inserted']:,}/{total['rows']:,} lignes importées en "
+          f"{total['seconds']:.1f}s ({total['rows_per_second']:,.0f} lignes/s)")
+    for error in total['errors'][:5]:
+        print(f"   ❌ ligne {error['row']}: {error['error']}")
+    for derived_table, report in derived.items():
+        print(f"   ↳ {derived_table}: {report['inserted']:,} lignes, {report['failed']} erreurs")
+    return total
@@ -0,0 +1,214 @@
+"""
+Table injuries_by_player: blessures partitionnées par joueur, triées par date décroissante
+"""
+import time
+import uuid
+from datetime import date, datetime
+import numpy as np
+from cassandra.query import BatchStatement, BatchType, SimpleStatement
+from cassandra.util import Date
+
+from database.analytics_tables import injury_delete_statement, injury_write_statements
+from database.bulk_loader import DEFAULT_CONCURRENCY, bulk_execute
+from database.session import get_session_manager
+from src.categories import severity_score
+
+CREATE_INJURIES_BY_PLAYER = """
+    CREATE TABLE IF NOT EXISTS injuries_by_player (
+        player_id int,
+        from_date date,
+        injury_id uuid,
+        season_name text,
+        injury_reason text,
+        end_date date,
+        days_missed float,
+        games_missed int,
+        severity_score float,
+        created_at timestamp,
+        PRIMARY KEY ((player_id), from_date, injury_id)
+    ) WITH CLUSTERING ORDER BY (from_date DESC, injury_id ASC)
+"""
+
+# Index secondaire remplacé par la table (nom par défaut attribué par Cassandra)
+PLAYER_ID_INDEX = "injuries_player_id_idx"
+
+# Lignes lues par page pendant le backfill, puis écrites en un lot concurrent
+BACKFILL_FETCH_SIZE = 5000
+
+INJURY_FIELDS = [
+    'injury_id', 'player_id', 'season_name', 'injury_reason', 'from_date', 'end_date',
+    'days_missed', 'games_missed', 'severity_score', 'created_at'
+]
+
+
+def create_table():
+    """Créer la table injuries_by_player (sans effet si elle existe)"""
+    get_session_manager().session.execute(CREATE_INJURIES_BY_PLAYER)
+    print("✅ Table injuries_by_player prête")
+
+
+def _derived_delete_statements(injury, main_position):
+    """Requêtes (nom, paramètres) qui retirent une blessure de ses tables dérivées"""
+    statements = []
+    if injury['player_id'] is not None and injury['from_date'] is not None:
+        statements.append(('delete_injury_by_player', (injury['player_id'], injury['from_date'], injury['injury_id'])))
+    statements.append(injury_delete_statement(
+        injury['injury_id'], injury['season_name'], main_position, injury['days_missed']
+    ))
+    return statements
+
+
+def _key_value(value):
+    """Valeur de clé telle que stockée (dates ramenées à date, float en précision float32)"""
+    if isinstance(value, Date):
+        return value.date()
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, str):
+        try:
+            return date.fromisoformat(value)
+        except ValueError:
+            return value
+    if isinstance(value, float):
+        return float(np.float32(value))
+    return value
+
+
+def _key_statement(statement):
+    """Requête (nom, paramètres) comparable d'une écriture à l'autre"""
+    statement_name, parameters = statement
+    return statement_name, tuple(_key_value(value) for value in parameters)
+
+
+def _stored_position(manager, injury_row):
+    """Poste enregistré avec la blessure (poste actuel du joueur pour les lignes antérieures)"""
+    if injury_row.main_position is not None or injury_row.player_id is None:
+        return injury_row.main_position
+    player = manager.execute('get_player', (injury_row.player_id,)).one()
+    return player.main_position if player is not None else None
+
+
+def write_injury(injury_data: dict):
+    """Insérer ou remplacer une blessure dans injuries et ses tables dérivées (batch logged)
+
+    injuries_by_player et injuries_by_season_position sont écrites dans le
+    même batch: toutes les écritures réussissent ou échouent ensemble. Le
+    poste vient de injury_data['main_position'] ou de la table players, et
+    est enregistré dans injuries. Si la blessure existe déjà, ses anciennes
+    lignes dérivées dont la clé change (joueur, date, saison, poste, durée)
+    sont supprimées dans le même batch. Retourne l'identifiant de la blessure.
+    """
+    manager = get_session_manager()
+    injury = {field: injury_data.get(field) for field in INJURY_FIELDS}
+    existing = None
+    if injury['injury_id'] is not None:
+        existing = manager.execute('get_injury', (injury['injury_id'],)).one()
+    injury['injury_id'] = injury['injury_id'] or uuid.uuid4()
+    injury['created_at'] = injury['created_at'] or datetime.now()
+    if injury['severity_score'] is None and injury['days_missed'] is not None:
+        injury['severity_score'] = float(severity_score(injury['days_missed']))
+
+    main_position = injury_data.get('main_position')
+    if main_position is None and injury['player_id'] is not None:
+        player = manager.execute('get_player', (injury['player_id'],)).one()
+        main_position = player.main_position if player is not None else None
+
+    batch = BatchStatement(batch_type=BatchType.LOGGED)
+    if existing is not None:
+        # Suppression seulement des clés qui changent: à horodatage égal, une
+        # suppression l'emporte sur l'insertion de la même ligne
+        new_keys = {_key_statement(statement) for statement in _derived_delete_statements(injury, main_position)}
+        for statement in _derived_delete_statements(existing._asdict(), _stored_position(manager, existing)):
+            if _key_statement(statement) not in new_keys:
+                statement_name, parameters = statement
+                batch.add(manager.prepare(statement_name), parameters)
+
+    batch.add(manager.prepare('insert_injury'), [injury[field] for field in INJURY_FIELDS])
+    if injury['player_id'] is not None and injury['from_date'] is not None:
+        batch.add(manager.prepare('insert_injury_by_player'), (
+            injury['player_id'], injury['from_date'], injury['injury_id'], injury['season_name'],
+            injury['injury_reason'], injury['end_date'], injury['days_missed'], injury['games_missed'],
+            injury['severity_score'], injury['created_at']
+        ))
+    for statement_name, parameters in injury_write_statements(injury, main_position):
+        batch.add(manager.prepare(statement_name), parameters)
+
+    manager.session.execute(batch)
+    return injury['injury_id']
+
+
+def delete_injury(injury_id):
+    """Supprimer une blessure de injuries et de ses tables dérivées
+
+    Les clés des tables dérivées (joueur, date, saison, durée, poste) sont
+    relues dans injuries; le poste actuel du joueur ne sert que pour les
+    blessures enregistrées sans poste. Retourne False si la blessure
+    n'existe pas.
+    """
+    manager = get_session_manager()
+    injury = manager.execute('get_injury', (injury_id,)).one()
+    if injury is None:
+        return False
+
+    batch = BatchStatement(batch_type=BatchType.LOGGED)
+    batch.add(manager.prepare('delete_injury'), (injury_id,))
+    for statement_name, parameters in _derived_delete_statements(injury._asdict(),
+                                                                 _stored_position(manager, injury)):
+        batch.add(manager.prepare(statement_name), parameters)
+    manager.session.execute(batch)
+    return True
+
+
+def get_player_injuries(player_id, since=None, limit=None):
+    """Blessures d'un joueur, de la plus récente à la plus ancienne (une seule partition)"""
+    manager = get_session_manager()
+    if since is None:
+        rows = manager.execute('get_player_injuries', (player_id,))
+    else:
+        rows = manager.execute('get_player_injuries_since', (player_id, since))
+    if limit is None:
+        return list(rows)
+    return [row for _, row in zip(range(limit), rows)]
+
+
+def backfill(fetch_size=BACKFILL_FETCH_SIZE, concurrency=DEFAULT_CONCURRENCY):
+    """Recopier injuries dans injuries_by_player (idempotent: simples upserts)
+
+    La table source est parcourue page par page; chaque page est écrite en
+    requêtes concurrentes avant de lire la suivante.
+    """
+    manager = get_session_manager()
+    columns = ', '.join(INJURY_FIELDS)
+    rows = manager.session.execute(SimpleStatement(f"SELECT {columns} FROM injuries", fetch_size=fetch_size))
+
+    start = time.perf_counter()
+    copied, skipped, failed = 0, 0, 0
+    while True:
+        page = rows.current_rows
+        parameters = [
+            (row.player_id, row.from_date, row.injury_id, row.season_name, row.injury_reason,
+             row.end_date, row.days_missed, row.games_missed, row.severity_score, row.created_at)
+            for row in page
+            if row.player_id is not None and row.from_date is not None
+        ]
+        skipped += len(page) - len(parameters)
+        if parameters:
+            report = bulk_execute('insert_injury_by_player', parameters, concurrency)
+            copied += report['inserted']
+            failed += report['failed']
+        print(f"  🔁 {copied:,} blessures recopiées ({copied / (time.perf_counter() - start):,.0f} lignes/s)")
+
+        if not rows.has_more_pages:
+            break
+        rows.fetch_next_page()
+
+    status = "✅" if failed == 0 else "⚠️"
+    print(f"{status} Backfill terminé: {copied:,} recopiées, {skipped:,} sans joueur ou date, {failed} erreurs")
+    return {'copied': copied, 'skipped': skipped, 'failed': failed,
+            'seconds': time.perf_counter() - start}
+
+
+def drop_player_index():
+    """Supprimer l'index secondaire sur injuries.player_id (après le backfill)"""
+    get_session_manager().session.execute(f"DROP INDEX IF EXISTS {PLAYER_ID_INDEX}")
+    print(f"🗑️ Index {PLAYER_ID_INDEX} supprimé")
@@ -0,0 +1,209 @@
+"""
+Session Cassandra partagée par le processus et registre des requêtes préparées
+"""
+import atexit
+import os
+import threading
+from cassandra.auth import PlainTextAuthProvider
+from cassandra.cluster import Cluster, ExecutionProfile, EXEC_PROFILE_DEFAULT
+from cassandra.policies import DCAwareRoundRobinPolicy, TokenAwarePolicy
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Requêtes de la couche CRUD, préparées une seule fois par session
+STATEMENTS = {
+    'insert_player': """
+        INSERT INTO players (player_id, player_name, date_of_birth, place_of_birth,
+                             country_of_birth, height, position, main_position, foot,
+                             current_club_name, created_at, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """,
+    'get_player': "SELECT * FROM players WHERE player_id = ?",
+    'get_all_players': "SELECT * FROM players",
+    'delete_player': "DELETE FROM players WHERE player_id = ?",
+    # Joueurs d'un poste: une seule partition de players_by_position
+    'search_players_by_position': "SELECT * FROM players_by_position WHERE main_position = ?",
+    'insert_player_by_position': """
+        INSERT INTO players_by_position (main_position, player_id, player_name, date_of_birth,
+                                         height, position, foot, current_club_name)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    """,
+    'delete_player_by_position': "DELETE FROM players_by_position WHERE main_position = ? AND player_id = ?",
+    'insert_injury': """
+        INSERT INTO injuries (injury_id, player_id, season_name, injury_reason,
+                              from_date, end_date, days_missed, games_missed,
+                              severity_score, created_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """,
+    'get_injury': "SELECT * FROM injuries WHERE injury_id = ?",
+    # Poste du joueur au moment de la blessure (clé de injuries_by_season_position)
+    'set_injury_position': "UPDATE injuries SET main_position = ? WHERE injury_id = ?",
+    'delete_injury': "DELETE FROM injuries WHERE injury_id = ?",
+    # Blessures d'un joueur: une seule partition de injuries_by_player, triée par date décroissante
+    'get_player_injuries': "SELECT * FROM injuries_by_player WHERE player_id = ?",
+    'get_player_injuries_since': "SELECT * FROM injuries_by_player WHERE player_id = ? AND from_date >= ?",
+    'insert_injury_by_player': """
+        INSERT INTO injuries_by_player (player_id, from_date, injury_id, season_name, injury_reason,
+                                        end_date, days_missed, games_missed, severity_score, created_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """,
+    'delete_injury_by_player': "DELETE FROM injuries_by_player WHERE player_id = ? AND from_date = ? AND injury_id = ?",
+    # Analyses saison x poste: partitions bornées de injuries_by_season_position,
+    # triées par durée décroissante (voir database/analytics_tables.py)
+    'get_injuries_by_season_position':
+        "SELECT * FROM injuries_by_season_position WHERE season_name = ? AND main_position = ?",
+    'get_severe_injuries_by_season_position': """
+        SELECT * FROM injuries_by_season_position
+        WHERE season_name = ? AND main_position = ? AND days_missed >= ?
+    """,
+    'insert_injury_by_season_position': """
+        INSERT INTO injuries_by_season_position (season_name, main_position, days_missed, injury_id,
+                                                 player_id, injury_reason, from_date, end_date,
+                                                 games_missed, severity_score)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """,
+    'delete_injury_by_season_position': """
+        DELETE FROM injuries_by_season_position
+        WHERE season_name = ? AND main_position = ? AND days_missed = ? AND injury_id = ?
+    """,
+    'insert_injury_partition': "INSERT INTO injury_partitions (bucket, season_name, main_position) VALUES (0, ?, ?)",
+    'get_injury_partitions': "SELECT season_name, main_position FROM injury_partitions WHERE bucket = 0",
+}
+
+
+class CassandraConfig:
+    """Paramètres de connexion lus dans l'environnement (.env)"""
+
+    def __init__(self):
+        self.hosts = [host.strip() for host in os.getenv('CASSANDRA_HOSTS', 'localhost').split(',') if host.strip()]
+        self.port = int(os.getenv('CASSANDRA_PORT', '9042'))
+        self.keyspace = os.getenv('CASSANDRA_KEYSPACE', 'football_injuries')
+        self.username = os.getenv('CASSANDRA_USERNAME', '')
+        self.password = os.getenv('CASSANDRA_PASSWORD', '')
+        self.datacenter = os.getenv('CASSANDRA_DATACENTER', 'datacenter1')
+
+
+class SessionManager:
+    """Cluster et session uniques pour tout le processus
+
+    La connexion est ouverte au premier usage (ou par connect()) et fermée
+    par shutdown(), appelé automatiquement à la sortie du processus. Le
+    driver gère lui-même le pool de connexions par nœud; chaque requête de
+    STATEMENTS est préparée une seule fois pour la session courante, puis
+    réutilisée par tous les appels (plus d'analyse de la requête côté
+    serveur à chaque exécution).
+    """
+
+    def __init__(self, config: CassandraConfig = None):
+        self.config = config or CassandraConfig()
+        self.cluster = None
+        self._session = None
+        self._prepared = {}
+        self._lock = threading.RLock()
+
+    @property
+    def is_connected(self):
+        return self._session is not None
+
+    def connect(self):
+        """Ouvrir la session (sans effet si elle est déjà ouverte)"""
+        with self._lock:
+            if self._session is not None:
+                return self._session
+
+            auth_provider = None
+            if self.config.username:
+                auth_provider = PlainTextAuthProvider(self.config.username, self.config.password)
+
+            profile = ExecutionProfile(
+                load_balancing_policy=TokenAwarePolicy(DCAwareRoundRobinPolicy(local_dc=self.config.datacenter))
+            )
+            self.cluster = Cluster(
+                self.config.hosts,
+                port=self.config.port,
+                auth_provider=auth_provider,
+                execution_profiles={EXEC_PROFILE_DEFAULT: profile},
+                protocol_version=4
+            )
+            try:
+                self._session = self.cluster.connect(self.config.keyspace)
+            except Exception:
+                self.cluster.shutdown()
+                self.cluster = None
+                raise
+
+            print(f"🔗 Session Cassandra ouverte ({', '.join(self.config.hosts)} / {self.config.keyspace})")
+            return self._session
+
+    @property
+    def session(self):
+        """Session partagée (connexion au premier accès)"""
+        if self._session is None:
+            return self.connect()
+        return self._session
+
+    def prepare(self, name, query=None):
+        """Requête préparée enregistrée sous name (préparée au premier appel)
+
+        query est facultatif pour les requêtes de STATEMENTS; les autres
+        modules enregistrent leurs propres requêtes en la fournissant.
+        """
+        statement = self._prepared.get(name)
+        if statement is not None:
+            return statement
+
+        with self._lock:
+            statement = self._prepared.get(name)
+            if statement is None:
+                if query is None:
+                    if name not in STATEMENTS:
+                        raise KeyError(f"Requête inconnue: {name}")
+                    query = STATEMENTS[name]
+                statement = self.session.prepare(query)
+                self._prepared[name] = statement
+            return statement
+
+    def execute(self, name, parameters=None, **kwargs):
+        """Exécuter une requête enregistrée"""
+        return self.session.execute(self.prepare(name), parameters, **kwargs)
+
+    def execute_async(self, name, parameters=None, **kwargs):
+        """Exécuter une requête enregistrée sans attendre la réponse (ResponseFuture)"""
+        return self.session.execute_async(self.prepare(name), parameters, **kwargs)
+
+    def shutdown(self):
+        """Fermer la session et le cluster (les requêtes préparées sont oubliées)"""
+        with self._lock:
+            if self.cluster is not None:
+                self.cluster.shutdown()
+                print("🔌 Session Cassandra fermée")
+            self.cluster = None
+            self._session = None
+            self._prepared.clear()
+
+    def __enter__(self):
+        self.connect()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.shutdown()
+
+
+_session_manager = SessionManager()
+atexit.register(_session_manager.shutdown)
+
+
+def get_session_manager():
+    """Gestionnaire de session partagé du processus"""
+    return _session_manager
+
+
+def get_session():
+    """Session Cassandra partagée du processus"""
+    return _session_manager.session
+
+
+def prepared(name, query=None):
+    """Requête préparée du registre partagé"""
+    return _session_manager.prepare(name, query)
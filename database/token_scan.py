@@ -0,0 +1,232 @@
+"""
+Lecture complète d'une table en parallèle par plages de tokens (DataFrame typé ou lots Arrow)
+"""
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import islice
+import pandas as pd
+import pyarrow as pa
+from cassandra.query import SimpleStatement
+from cassandra.util import Date
+
+from database.session import get_session_manager
+from src.schema import INJURY_DATE_COLUMNS, PLAYER_DATE_COLUMNS, apply_injury_schema, apply_player_schema, parse_dates
+
+# Bornes de l'anneau du partitionneur Murmur3 (partitionneur par défaut de Cassandra)
+MIN_TOKEN = -2 ** 63
+MAX_TOKEN = 2 ** 63 - 1
+
+# Lecteurs simultanés (pages en vol) et plages minimales par lecteur: les
+# plages possédées sont redécoupées si l'anneau en compte moins
+SCAN_WORKERS = 8
+SPLITS_PER_WORKER = 4
+
+# Lignes par page de chaque plage (la mémoire reste bornée à SCAN_WORKERS pages)
+SCAN_FETCH_SIZE = 5000
+
+# Types Arrow des colonnes Cassandra (les autres types, collections comprises, sont exportés en texte)
+CQL_ARROW_TYPES = {
+    'ascii': pa.string(), 'text': pa.string(), 'varchar': pa.string(),
+    'uuid': pa.string(), 'timeuuid': pa.string(), 'inet': pa.string(),
+    'boolean': pa.bool_(),
+    'tinyint': pa.int8(), 'smallint': pa.int16(), 'int': pa.int32(),
+    'bigint': pa.int64(), 'counter': pa.int64(),
+    'float': pa.float32(), 'double': pa.float64(),
+    'date': pa.date32(), 'timestamp': pa.timestamp('ms'),
+}
+
+# Typage des tables connues (schéma partagé avec les CSV)
+TABLE_SCHEMAS = {
+    'injuries': (apply_injury_schema, INJURY_DATE_COLUMNS),
+    'injuries_by_player': (apply_injury_schema, INJURY_DATE_COLUMNS),
+    'injuries_by_season_position': (apply_injury_schema, INJURY_DATE_COLUMNS),
+    'players': (apply_player_schema, PLAYER_DATE_COLUMNS),
+    'players_by_position': (apply_player_schema, PLAYER_DATE_COLUMNS),
+}
+
+
+def token_ranges(n_splits, start=MIN_TOKEN, end=MAX_TOKEN):
+    """Découper ]start, end] (l'anneau entier par défaut) en n_splits plages contiguës"""
+    bounds = [start + (end - start) * i // n_splits for i in range(n_splits)] + [end]
+    return [(lower, upper) for lower, upper in zip(bounds[:-1], bounds[1:]) if lower < upper]
+
+
+def owned_ranges(manager):
+    """Plages ]token précédent, token] de l'anneau, avec les réplicas qui les possèdent
+
+    Les plages et leurs réplicas viennent de cluster.metadata.token_map. La
+    plage du premier token fait le tour de l'anneau: elle est coupée en
+    ]dernier, MAX_TOKEN] et [MIN_TOKEN, premier]. Sans métadonnées de
+    tokens, l'anneau entier est rendu sans réplica.
+    """
+    token_map = manager.cluster.metadata.token_map
+    if token_map is None or not token_map.ring:
+        return [((MIN_TOKEN, MAX_TOKEN), [])]
+
+    ring = token_map.ring
+    ranges = []
+    for previous, token in zip(ring[-1:] + ring[:-1], ring):
+        replicas = [host for host in token_map.get_replicas(manager.config.keyspace, token) if host.is_up]
+        if previous.value < token.value:
+            ranges.append(((previous.value, token.value), replicas))
+        else:
+            ranges.append(((previous.value, MAX_TOKEN), replicas))
+            ranges.append(((MIN_TOKEN, token.value), replicas))
+    return ranges
+
+
+def scan_ranges(manager, n_splits):
+    """Au moins n_splits plages à lire, chacune associée à un réplica qui la possède
+
+    Chaque plage possédée est redécoupée si l'anneau compte moins de
+    n_splits plages. Les réplicas du datacenter local sont préférés et
+    alternés d'une plage à l'autre pour répartir la lecture; None laisse le
+    choix du nœud à la politique de répartition.
+    """
+    owned = owned_ranges(manager)
+    pieces = -(-n_splits // len(owned))
+    ranges = []
+    for token_range, replicas in owned:
+        local = [host for host in replicas if host.datacenter == manager.config.datacenter] or replicas
+        for sub_range in token_ranges(pieces, *token_range):
+            ranges.append((sub_range, local[len(ranges) % len(local)] if local else None))
+    return ranges
+
+
+def _table_metadata(table):
+    """Métadonnées d'une table du keyspace courant"""
+    manager = get_session_manager()
+    manager.connect()
+    return manager.cluster.metadata.keyspaces[manager.config.keyspace].tables[table]
+
+
+def _partition_key(table):
+    """Colonnes de la clé de partition d'une table (métadonnées du cluster)"""
+    return [column.name for column in _table_metadata(table).partition_key]
+
+
+def arrow_schema(table, columns=None):
+    """Schéma Arrow fixe d'une table, déduit des types Cassandra (toutes les colonnes par défaut)"""
+    table_columns = _table_metadata(table).columns
+    return pa.schema([
+        pa.field(name, CQL_ARROW_TYPES.get(table_columns[name].cql_type, pa.string()))
+        for name in (columns or list(table_columns))
+    ])
+
+
+def _read_page(table, columns, partition_key, scan_range, fetch_size, paging_state=None):
+    """Lire une page d'une plage de tokens sur son réplica
+
+    Retourne (noms de colonnes, lignes, paging_state de la page suivante
+    ou None en fin de plage).
+    """
+    session = get_session_manager().session
+    token_range, host = scan_range
+    key = ', '.join(partition_key)
+    # La plage qui commence au token minimal doit l'inclure
+    lower = ">=" if token_range[0] == MIN_TOKEN else ">"
+    query = SimpleStatement(
+        f"SELECT {columns} FROM {table} WHERE token({key}) {lower} %s AND token({key}) <= %s",
+        fetch_size=fetch_size
+    )
+    result = session.execute(query, token_range, paging_state=paging_state, host=host)
+    return result.column_names, result.current_rows, result.paging_state
+
+
+def _to_frame(table, column_names, rows):
+    """DataFrame typé: dates Cassandra converties, schéma partagé appliqué aux tables connues"""
+    df = pd.DataFrame.from_records(rows, columns=column_names)
+    for col in df.columns:
+        sample = df[col].dropna()
+        if len(sample) and isinstance(sample.iloc[0], Date):
+            df[col] = pd.to_datetime(df[col].map(lambda value: str(value) if value is not None else None))
+    if table in TABLE_SCHEMAS:
+        apply_schema, date_columns = TABLE_SCHEMAS[table]
+        df = parse_dates(apply_schema(df), date_columns)
+    return df
+
+
+def _scan(table, columns, workers, splits_per_worker, fetch_size):
+    """Pages lues en parallèle (au plus workers en vol), rendues au fil de leur arrivée
+
+    Une page lue relance la page suivante de sa plage, ou la plage
+    suivante en fin de plage: seules workers pages sont en mémoire en plus
+    de celle rendue, quelle que soit la taille de la table.
+    """
+    manager = get_session_manager()
+    partition_key = _partition_key(table)
+    column_list = ', '.join(columns) if columns else '*'
+    pending = iter(scan_ranges(manager, workers * splits_per_worker))
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        in_flight = {
+            executor.submit(_read_page, table, column_list, partition_key, scan_range, fetch_size): scan_range
+            for scan_range in islice(pending, workers)
+        }
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                scan_range = in_flight.pop(future)
+                column_names, rows, paging_state = future.result()
+                if paging_state is not None:
+                    in_flight[executor.submit(_read_page, table, column_list, partition_key, scan_range,
+                                              fetch_size, paging_state)] = scan_range
+                else:
+                    for next_range in islice(pending, 1):
+                        in_flight[executor.submit(_read_page, table, column_list, partition_key,
+                                                  next_range, fetch_size)] = next_range
+                yield column_names, rows
+
+
+def scan_table(table, columns=None, workers=SCAN_WORKERS, splits_per_worker=SPLITS_PER_WORKER,
+               fetch_size=SCAN_FETCH_SIZE):
+    """Lire une table entière en DataFrame typé
+
+    Chaque plage possédée de l'anneau (token_map du cluster) est lue page
+    par page sur l'un de ses réplicas, au plus workers pages à la fois:
+    les lectures se répartissent sur les nœuds qui possèdent les données.
+    L'ordre des lignes n'est pas garanti.
+    """
+    start = time.perf_counter()
+    column_names, rows = None, []
+    for page_columns, page_rows in _scan(table, columns, workers, splits_per_worker, fetch_size):
+        column_names = column_names or page_columns
+        rows.extend(page_rows)
+
+    df = _to_frame(table, column_names or list(columns or []), rows)
+    elapsed = time.perf_counter() - start
+    print(f"⚡ {table}: {len(df):,} lignes lues en {elapsed:.1f}s "
+          f"({len(df) / elapsed if elapsed > 0 else 0:,.0f} lignes/s, {workers} lecteurs)")
+    return df
+
+
+def _arrow_column(series, arrow_type):
+    """Colonne d'un DataFrame convertie au type Arrow du schéma fixe"""
+    if pa.types.is_string(arrow_type):
+        # Catégories, UUID et collections en texte: même type dans tous les lots
+        values = series.astype(object).where(series.notna(), None)
+        return pa.array([None if value is None else str(value) for value in values], type=arrow_type)
+    if pa.types.is_date(arrow_type) or pa.types.is_timestamp(arrow_type):
+        return pa.array(pd.to_datetime(series), from_pandas=True).cast(arrow_type)
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        series = series.astype(series.cat.categories.dtype)
+    return pa.array(series, type=arrow_type, from_pandas=True)
+
+
+def scan_batches(table, columns=None, workers=SCAN_WORKERS, splits_per_worker=SPLITS_PER_WORKER,
+                 fetch_size=SCAN_FETCH_SIZE, schema=None):
+    """Lire une table entière sous forme de lots Arrow (un lot par page lue)
+
+    Tous les lots ont le même schéma (par défaut arrow_schema de la table):
+    il ne dépend ni de l'ordre des pages ni de leur contenu (colonne vide,
+    nombre de catégories). Chaque lot est rendu dès que sa page est lue: la
+    mémoire reste bornée à workers pages de fetch_size lignes, quelle que
+    soit la taille de la table.
+    """
+    schema = schema or arrow_schema(table, columns)
+    for column_names, rows in _scan(table, schema.names, workers, splits_per_worker, fetch_size):
+        if rows:
+            df = _to_frame(table, column_names, rows)
+            yield pa.RecordBatch.from_arrays(
+                [_arrow_column(df[field.name], field.type) for field in schema], schema=schema
+            )
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+⏱️ Comparaison des moteurs du modèle de prédiction (Random Forest / gradient boosting)
+Mêmes features et même découpage: entraînement, latence d'inférence et AUC
+"""
+import os
+import sys
+import argparse
+
+# Ajouter le répertoire parent au path pour les imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data_cache import DATA_DIR, load_datasets
+from src.engine_benchmark import BATCH_SIZE, LATENCY_SAMPLES, benchmark_engines
+from src.ml_predictor import InjuryPredictor
+
+
+def main():
+    """Lancer la comparaison depuis la ligne de commande"""
+    parser = argparse.ArgumentParser(description="Comparaison des moteurs de InjuryPredictor")
+    parser.add_argument("--data-dir", default=DATA_DIR,
+                        help="Dossier contenant player_injuries.csv et player_profiles.csv")
+    parser.add_argument("--engines", nargs="+", choices=list(InjuryPredictor.ENGINES),
+                        default=list(InjuryPredictor.ENGINES),
+                        help="Moteurs à comparer (défaut: tous)")
+    parser.add_argument("--latency-samples", type=int, default=LATENCY_SAMPLES,
+                        help=f"Prédictions unitaires chronométrées (défaut: {LATENCY_SAMPLES})")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE,
+                        help=f"Taille du lot chronométré (défaut: {BATCH_SIZE})")
+    args = parser.parse_args()
+
+    injuries_df, players_df = load_datasets(args.data_dir)
+    print(f"📊 Données: {len(injuries_df):,} blessures, {len(players_df):,} joueurs")
+
+    results = benchmark_engines(
+        injuries_df, players_df,
+        engines=args.engines,
+        latency_samples=args.latency_samples,
+        batch_size=args.batch_size
+    )
+    if results.empty:
+        sys.exit(1)
+
+    print("\n🏁 Résultats:")
+    print(results.to_string(index=False, float_format=lambda value: f"{value:,.3f}"))
+
+
+if __name__ == "__main__":
+    main()
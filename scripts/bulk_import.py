@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+📥 Import initial des CSV dans Cassandra (requêtes concurrentes, rapport d'erreurs)
+Joueurs (player_profiles.csv) puis blessures (player_injuries.csv)
+"""
+import os
+import sys
+import json
+import argparse
+
+# Ajouter le répertoire parent au path pour les imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.bulk_loader import CSV_CHUNK_ROWS, DEFAULT_CONCURRENCY, import_csv
+from database.analytics_tables import create_tables as create_analytics_tables
+from database.injuries_by_player import create_table
+from database.session import get_session_manager
+from src.data_cache import DATA_DIR, INJURIES_FILE, PLAYERS_FILE
+
+
+def main():
+    """Lancer l'import depuis la ligne de commande"""
+    parser = argparse.ArgumentParser(description="Import en masse des CSV dans Cassandra")
+    parser.add_argument("--data-dir", default=DATA_DIR,
+                        help="Dossier contenant player_injuries.csv et player_profiles.csv")
+    parser.add_argument("--tables", nargs="+", choices=["players", "injuries"],
+                        default=["players", "injuries"],
+                        help="Tables à importer (défaut: les deux)")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help=f"Requêtes en vol simultanément (défaut: {DEFAULT_CONCURRENCY})")
+    parser.add_argument("--chunk-rows", type=int, default=CSV_CHUNK_ROWS,
+                        help=f"Lignes lues par bloc (défaut: {CSV_CHUNK_ROWS})")
+    parser.add_argument("--errors-file", default=None,
+                        help="Fichier JSON recevant le détail des lignes en erreur")
+    args = parser.parse_args()
+
+    files = {'players': PLAYERS_FILE, 'injuries': INJURIES_FILE}
+    reports = []
+    with get_session_manager():
+        create_analytics_tables()
+        if 'injuries' in args.tables:
+            create_table()
+        for table in args.tables:
+            csv_path = os.path.join(args.data_dir, files[table])
+            print(f"🚀 Import de {csv_path}")
+            reports.append(import_csv(csv_path, table, args.concurrency, args.chunk_rows))
+
+    if args.errors_file:
+        with open(args.errors_file, 'w', encoding='utf-8') as f:
+            json.dump({report['table']: report['errors'] for report in reports}, f, indent=2)
+        print(f"💾 Erreurs enregistrées: {args.errors_file}")
+
+    if any(report['failed'] or any(derived['failed'] for derived in report['derived'].values())
+           for report in reports):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+📤 Export d'une table Cassandra en Parquet ou CSV (lecture parallèle par plages de tokens)
+"""
+import os
+import sys
+import time
+import argparse
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+
+# Ajouter le répertoire parent au path pour les imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.session import get_session_manager
+from database.token_scan import SCAN_FETCH_SIZE, SCAN_WORKERS, SPLITS_PER_WORKER, arrow_schema, scan_batches
+
+
+def export_table(table, output_path, columns=None, workers=SCAN_WORKERS,
+                 splits_per_worker=SPLITS_PER_WORKER, fetch_size=SCAN_FETCH_SIZE):
+    """Écrire une table lot par lot (mémoire bornée), au format déduit de l'extension
+
+    Le schéma du fichier est fixé avant la lecture (types Cassandra de la
+    table) et chaque lot y est converti: le résultat ne dépend pas de la
+    plage de tokens lue en premier.
+    """
+    start = time.perf_counter()
+    schema = arrow_schema(table, columns)
+    rows = 0
+    if output_path.endswith('.parquet'):
+        writer = pq.ParquetWriter(output_path, schema)
+    else:
+        writer = pa_csv.CSVWriter(output_path, schema)
+    try:
+        for batch in scan_batches(table, columns, workers, splits_per_worker, fetch_size, schema=schema):
+            writer.write_batch(batch.cast(schema))
+            rows += batch.num_rows
+    finally:
+        writer.close()
+
+    elapsed = time.perf_counter() - start
+    print(f"💾 {rows:,} lignes exportées dans {output_path} en {elapsed:.1f}s")
+    return rows
+
+
+def main():
+    """Lancer l'export depuis la ligne de commande"""
+    parser = argparse.ArgumentParser(description="Export parallèle d'une table Cassandra")
+    parser.add_argument("table", help="Table à exporter (ex: injuries, players)")
+    parser.add_argument("--output", default=None,
+                        help="Fichier de sortie .parquet ou .csv (défaut: exports/<table>.parquet)")
+    parser.add_argument("--columns", nargs="+", default=None,
+                        help="Colonnes à exporter (défaut: toutes)")
+    parser.add_argument("--workers", type=int, default=SCAN_WORKERS,
+                        help=f"Lecteurs simultanés (défaut: {SCAN_WORKERS})")
+    parser.add_argument("--splits-per-worker", type=int, default=SPLITS_PER_WORKER,
+                        help=f"Plages de tokens par lecteur (défaut: {SPLITS_PER_WORKER})")
+    parser.add_argument("--fetch-size", type=int, default=SCAN_FETCH_SIZE,
+                        help=f"Lignes lues par page (défaut: {SCAN_FETCH_SIZE})")
+    args = parser.parse_args()
+
+    output_path = args.output or os.path.join("exports", f"{args.table}.parquet")
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+
+    with get_session_manager():
+        export_table(args.table, output_path, args.columns, args.workers,
+                     args.splits_per_worker, args.fetch_size)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+📊 Migration vers les tables d'analyse (blessures par saison et poste, joueurs par poste)
+Création des tables puis remplissage à partir de players et injuries
+"""
+import os
+import sys
+import argparse
+
+# Ajouter le répertoire parent au path pour les imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.analytics_tables import BACKFILL_FETCH_SIZE, backfill, create_tables
+from database.bulk_loader import DEFAULT_CONCURRENCY
+from database.session import get_session_manager
+
+
+def main():
+    """Lancer la migration depuis la ligne de commande"""
+    parser = argparse.ArgumentParser(description="Création et remplissage des tables d'analyse")
+    parser.add_argument("--fetch-size", type=int, default=BACKFILL_FETCH_SIZE,
+                        help=f"Lignes lues par page (défaut: {BACKFILL_FETCH_SIZE})")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help=f"Écritures en vol simultanément (défaut: {DEFAULT_CONCURRENCY})")
+    args = parser.parse_args()
+
+    with get_session_manager():
+        create_tables()
+        report = backfill(args.fetch_size, args.concurrency)
+    if report['failed']:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
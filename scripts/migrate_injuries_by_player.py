@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+🔁 Migration vers la table injuries_by_player
+Création de la table, recopie de injuries, puis suppression facultative de l'index secondaire
+"""
+import os
+import sys
+import argparse
+
+# Ajouter le répertoire parent au path pour les imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.bulk_loader import DEFAULT_CONCURRENCY
+from database.injuries_by_player import BACKFILL_FETCH_SIZE, backfill, create_table, drop_player_index
+from database.session import get_session_manager
+
+
+def main():
+    """Lancer la migration depuis la ligne de commande"""
+    parser = argparse.ArgumentParser(description="Migration des blessures vers injuries_by_player")
+    parser.add_argument("--fetch-size", type=int, default=BACKFILL_FETCH_SIZE,
+                        help=f"Lignes lues par page (défaut: {BACKFILL_FETCH_SIZE})")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help=f"Écritures en vol simultanément (défaut: {DEFAULT_CONCURRENCY})")
+    parser.add_argument("--drop-index", action="store_true",
+                        help="Supprimer l'index secondaire injuries(player_id) si le backfill réussit")
+    args = parser.parse_args()
+
+    with get_session_manager():
+        create_table()
+        report = backfill(args.fetch_size, args.concurrency)
+        if report['failed']:
+            print("⚠️ Index secondaire conservé: relancez la migration pour les lignes en erreur")
+            sys.exit(1)
+        if args.drop_index:
+            drop_player_index()
+
+
+if __name__ == "__main__":
+    main()
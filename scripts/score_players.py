@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+🌙 Calcul nocturne du risque de blessure grave de tous les joueurs
+Écrit models/player_risk_scores.parquet, lu par le tableau de bord et les profils
+"""
+import os
+import sys
+import time
+import argparse
+
+# Ajouter le répertoire parent au path pour les imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.batch_scoring import RISK_SCORES_PATH, SCORING_CHUNK_SIZE, score_all_players
+from src.data_cache import DATA_DIR, load_datasets
+from src.model_cache import ModelCache
+
+
+def run_nightly_scoring(data_dir=DATA_DIR, output_path=RISK_SCORES_PATH,
+                        chunk_size=SCORING_CHUNK_SIZE, workers=None):
+    """Tâche planifiable: modèle des données courantes puis scoring de tous les joueurs
+
+    Le modèle est relu depuis models/ (entraîné seulement si les données ont
+    changé depuis le dernier calcul).
+    """
+    injuries_df, players_df = load_datasets(data_dir)
+    print(f"📊 Données: {len(injuries_df):,} blessures, {len(players_df):,} joueurs")
+
+    cache = ModelCache()
+    predictor = cache.get_predictor(injuries_df, players_df)
+    if predictor is None:
+        print("❌ Aucun modèle disponible, scoring annulé")
+        return None
+
+    return score_all_players(
+        players_df, predictor,
+        model_path=cache.model_path(predictor.fingerprint),
+        output_path=output_path,
+        chunk_size=chunk_size,
+        workers=workers
+    )
+
+
+def main():
+    """Lancer le scoring depuis la ligne de commande (une fois ou chaque jour)"""
+    parser = argparse.ArgumentParser(description="Scoring en lot du risque de blessure de tous les joueurs")
+    parser.add_argument("--data-dir", default=DATA_DIR,
+                        help="Dossier contenant player_injuries.csv et player_profiles.csv")
+    parser.add_argument("--output", default=RISK_SCORES_PATH,
+                        help="Fichier Parquet de sortie")
+    parser.add_argument("--chunk-size", type=int, default=SCORING_CHUNK_SIZE,
+                        help=f"Joueurs par lot (défaut: {SCORING_CHUNK_SIZE})")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Nombre de processus (défaut: tous les cœurs)")
+    parser.add_argument("--daily-at", default=None, metavar="HH:MM",
+                        help="Relancer chaque jour à cette heure au lieu d'un calcul unique")
+    args = parser.parse_args()
+
+    def job():
+        return run_nightly_scoring(args.data_dir, args.output, args.chunk_size, args.workers)
+
+    if args.daily_at is None:
+        if job() is None:
+            sys.exit(1)
+        return
+
+    import schedule
+
+    schedule.every().day.at(args.daily_at).do(job)
+    print(f"⏰ Scoring planifié chaque jour à {args.daily_at}")
+    while True:
+        schedule.run_pending()
+        time.sleep(60)
+
+
+if __name__ == "__main__":
+    main()
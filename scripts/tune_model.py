@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+🔍 Recherche des hyperparamètres du modèle de prédiction (successive halving)
+Enregistre la configuration gagnante dans models/model_config.json
+"""
+import os
+import sys
+import argparse
+
+# Ajouter le répertoire parent au path pour les imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data_cache import DATA_DIR, load_datasets
+from src.tuning import tune_hyperparameters
+
+
+def main():
+    """Lancer la recherche depuis la ligne de commande"""
+    parser = argparse.ArgumentParser(
+        description="Recherche d'hyperparamètres du Random Forest (successive halving)"
+    )
+    parser.add_argument("--data-dir", default=DATA_DIR,
+                        help="Dossier contenant player_injuries.csv et player_profiles.csv")
+    parser.add_argument("--budget", type=float, default=600,
+                        help="Budget de temps en secondes (défaut: 600)")
+    parser.add_argument("--candidates", type=int, default=27,
+                        help="Nombre de configurations tirées dans la grille (défaut: 27)")
+    parser.add_argument("--eta", type=int, default=3,
+                        help="Facteur de réduction entre deux tours (défaut: 3)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Nombre de processus (défaut: tous les cœurs)")
+    args = parser.parse_args()
+
+    injuries_df, players_df = load_datasets(args.data_dir)
+    print(f"📊 Données: {len(injuries_df):,} blessures, {len(players_df):,} joueurs")
+
+    result = tune_hyperparameters(
+        injuries_df, players_df,
+        budget_seconds=args.budget,
+        n_candidates=args.candidates,
+        eta=args.eta,
+        workers=args.workers
+    )
+    if result['winner'] is None:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
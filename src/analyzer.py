@@ -12,96 +12,118 @@ from sklearn.model_selection import train_test_split
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.preprocessing import LabelEncoder
 from sklearn.metrics import classification_report, confusion_matrix
+from src.schema import normalize_injuries, normalize_players
+from src.categories import categorize_injury_reasons, severity_buckets, is_severe_injury
+from src.player_index import PlayerIndex
+from src.cube import InjuryCube
+from src.injury_stats import InjuryStatistics, get_statistics
+import copy as copy_module
+import threading
 import warnings
 warnings.filterwarnings('ignore')
 
 class InjuryAnalyzer:
     """Analyseur de blessures de joueurs"""
     
-    def __init__(self, injuries_df: pd.DataFrame, players_df: pd.DataFrame):
-        self.injuries_df = injuries_df.copy()
-        self.players_df = players_df.copy()
+    def __init__(self, injuries_df: pd.DataFrame, players_df: pd.DataFrame, copy: bool = True,
+                 version: str = None):
+        # copy=False pour des tables partagées: l'analyseur ne modifie jamais ses entrées
+        self.injuries_df = injuries_df.copy() if copy else injuries_df
+        self.players_df = players_df.copy() if copy else players_df
+        # Version du jeu de données (clé du cache des statistiques)
+        self.version = version
         self.merged_df = None
+        self._cube = None
+        self._statistics = None
+        # L'analyseur d'un InjuryDataset est partagé entre sessions Streamlit
+        self._lock = threading.Lock()
         self._prepare_data()
     
+    @classmethod
+    def from_data_dir(cls, data_dir=None):
+        """Créer un analyseur à partir du cache colonnaire du dossier de données"""
+        from src.data_cache import DATA_DIR, load_datasets
+        injuries_df, players_df = load_datasets(data_dir or DATA_DIR)
+        return cls(injuries_df, players_df)
+    
     def _prepare_data(self):
         """Préparer et nettoyer les données"""
-        # Conversion des dates
-        self.injuries_df['from_date'] = pd.to_datetime(self.injuries_df['from_date'])
-        self.injuries_df['end_date'] = pd.to_datetime(self.injuries_df['end_date'])
-        self.players_df['date_of_birth'] = pd.to_datetime(self.players_df['date_of_birth'])
+        # Types déclarés et dates (sans effet si déjà normalisées au chargement)
+        self.injuries_df = normalize_injuries(self.injuries_df)
+        self.players_df = normalize_players(self.players_df)
         
         # Calculer l'âge des joueurs
         current_date = pd.Timestamp.now()
-        self.players_df['age'] = (current_date - self.players_df['date_of_birth']).dt.days / 365.25
+        self.players_df = self.players_df.assign(
+            age=(current_date - self.players_df['date_of_birth']).dt.days / 365.25
+        )
+        
+        # Fusionner, catégoriser et calculer la sévérité
+        self.merged_df = self._enrich_injuries(self.injuries_df)
+        
+        # Index par joueur pour les profils individuels
+        self.player_index = PlayerIndex(self.merged_df, name_col='player_name')
         
-        # Fusionner les données
-        self.merged_df = self.injuries_df.merge(
+        print(f"✅ Données préparées: {len(self.merged_df)} blessures analysées")
+    
+    def _enrich_injuries(self, injuries_df):
+        """Joindre les infos joueurs, catégoriser et calculer la sévérité"""
+        merged_df = injuries_df.merge(
             self.players_df[['player_id', 'player_name', 'main_position', 'age', 'height', 'current_club_name']],
             on='player_id',
             how='left'
         )
         
         # Catégoriser les blessures
-        self.merged_df['injury_category'] = self._categorize_injuries(self.merged_df['injury_reason'])
+        merged_df['injury_category'] = self._categorize_injuries(merged_df['injury_reason'])
         
         # Calculer la sévérité
-        self.merged_df['severity'] = self._calculate_severity(self.merged_df['days_missed'])
+        merged_df['severity'] = self._calculate_severity(merged_df['days_missed'])
         
-        # Extraire l'année et le mois
-        self.merged_df['injury_year'] = self.merged_df['from_date'].dt.year
-        self.merged_df['injury_month'] = self.merged_df['from_date'].dt.month
+        return merged_df
+    
+    @property
+    def statistics(self):
+        """Statistiques générales (une passe, en cache par version des données)"""
+        if self._statistics is None:
+            with self._lock:
+                if self._statistics is None:
+                    if self.version is not None:
+                        self._statistics = get_statistics(self.merged_df, self.version)
+                    else:
+                        self._statistics = InjuryStatistics.from_frame(self.merged_df)
+        return self._statistics
+    
+    def updated_statistics(self, new_injuries_df: pd.DataFrame):
+        """Statistiques incluant de nouvelles blessures, sans recalcul de l'historique
         
-        print(f"✅ Données préparées: {len(self.merged_df)} blessures analysées")
+        Les statistiques en cache (partagées) ne sont pas modifiées.
+        """
+        new_rows = self._enrich_injuries(normalize_injuries(new_injuries_df))
+        statistics = copy_module.deepcopy(self.statistics)
+        statistics.version = f"{self.statistics.version}+{len(new_rows)}"
+        return statistics.update(new_rows)
+    
+    @property
+    def cube(self):
+        """Cube d'agrégats position × année × mois × catégorie × sévérité (construit une fois)"""
+        if self._cube is None:
+            with self._lock:
+                if self._cube is None:
+                    self._cube = InjuryCube(self.merged_df)
+        return self._cube
     
     def _categorize_injuries(self, injury_reasons):
-        """Catégoriser les types de blessures"""
-        categories = []
-        for reason in injury_reasons:
-            reason_lower = str(reason).lower()
-            if any(word in reason_lower for word in ['muscle', 'muscular', 'hamstring', 'thigh', 'calf']):
-                categories.append('Musculaire')
-            elif any(word in reason_lower for word in ['knee', 'ankle', 'foot', 'leg']):
-                categories.append('Membres inférieurs')
-            elif any(word in reason_lower for word in ['back', 'spine', 'lumbago']):
-                categories.append('Dos')
-            elif any(word in reason_lower for word in ['head', 'concussion', 'brain']):
-                categories.append('Tête')
-            elif any(word in reason_lower for word in ['shoulder', 'arm', 'hand', 'wrist']):
-                categories.append('Membres supérieurs')
-            else:
-                categories.append('Autre')
-        return categories
+        """Catégoriser les types de blessures (une fois par libellé distinct)"""
+        return categorize_injury_reasons(injury_reasons)
     
     def _calculate_severity(self, days_missed):
-        """Calculer la sévérité des blessures"""
-        severity = []
-        for days in days_missed:
-            if pd.isna(days) or days <= 0:
-                severity.append('Inconnue')
-            elif days <= 7:
-                severity.append('Légère')
-            elif days <= 21:
-                severity.append('Modérée')
-            elif days <= 60:
-                severity.append('Grave')
-            else:
-                severity.append('Très grave')
-        return severity
+        """Calculer la sévérité des blessures (catégorie ordonnée)"""
+        return severity_buckets(days_missed)
     
     def generate_injury_statistics(self):
         """Générer des statistiques générales sur les blessures"""
-        stats = {
-            'total_injuries': len(self.merged_df),
-            'unique_players': self.merged_df['player_id'].nunique(),
-            'avg_days_missed': self.merged_df['days_missed'].mean(),
-            'most_common_injury': self.merged_df['injury_category'].mode().iloc[0],
-            'most_affected_position': self.merged_df['main_position'].mode().iloc[0],
-            'injuries_by_category': self.merged_df['injury_category'].value_counts().to_dict(),
-            'injuries_by_severity': self.merged_df['severity'].value_counts().to_dict(),
-            'injuries_by_position': self.merged_df['main_position'].value_counts().head(10).to_dict()
-        }
-        return stats
+        return self.statistics.summary()
     
     def plot_injury_trends(self):
         """Graphique des tendances de blessures dans le temps"""
@@ -114,7 +136,7 @@ class InjuryAnalyzer:
         )
         
         # Tendance annuelle
-        yearly_trend = self.merged_df.groupby('injury_year').size()
+        yearly_trend = self.cube.rollup(['injury_year'])['injury_count']
         fig.add_trace(
             go.Scatter(x=yearly_trend.index, y=yearly_trend.values, 
                       mode='lines+markers', name='Blessures/an'),
@@ -122,21 +144,21 @@ class InjuryAnalyzer:
         )
         
         # Tendance mensuelle
-        monthly_trend = self.merged_df.groupby('injury_month').size()
+        monthly_trend = self.cube.rollup(['injury_month'])['injury_count']
         fig.add_trace(
             go.Bar(x=monthly_trend.index, y=monthly_trend.values, name='Blessures/mois'),
             row=1, col=2
         )
         
         # Répartition par catégorie
-        category_counts = self.merged_df['injury_category'].value_counts()
+        category_counts = self.cube.rollup(['injury_category'])['injury_count'].sort_values(ascending=False)
         fig.add_trace(
             go.Pie(labels=category_counts.index, values=category_counts.values, name='Catégories'),
             row=2, col=1
         )
         
         # Sévérité
-        severity_counts = self.merged_df['severity'].value_counts()
+        severity_counts = self.cube.rollup(['severity'])['injury_count'].sort_values(ascending=False)
         fig.add_trace(
             go.Bar(x=severity_counts.index, y=severity_counts.values, name='Sévérité'),
             row=2, col=2
@@ -147,11 +169,9 @@ class InjuryAnalyzer:
     
     def plot_position_analysis(self):
         """Analyse des blessures par position"""
-        position_stats = self.merged_df.groupby('main_position').agg({
-            'player_id': 'count',
-            'days_missed': 'mean',
-            'games_missed': 'mean'
-        }).round(2)
+        position_stats = self.cube.rollup(['main_position'])[
+            ['injury_count', 'days_mean', 'games_mean']
+        ].round(2)
         
         position_stats.columns = ['Nombre_blessures', 'Jours_moyens_manqués', 'Matchs_moyens_manqués']
         position_stats = position_stats.sort_values('Nombre_blessures', ascending=False).head(10)
@@ -190,6 +210,8 @@ class InjuryAnalyzer:
         """Corrélation entre âge et blessures"""
         # Filtrer les données avec âge valide
         valid_age_df = self.merged_df.dropna(subset=['age'])
+        # Taille des points: Plotly refuse les valeurs manquantes
+        valid_age_df = valid_age_df.assign(games_missed=valid_age_df['games_missed'].astype('float32').fillna(0))
         
         fig = px.scatter(
             valid_age_df, 
@@ -269,7 +291,7 @@ class InjuryAnalyzer:
             X = ml_df[features].dropna()
             
             # Variable cible (blessure grave ou non)
-            y = (ml_df.loc[X.index, 'days_missed'] > 21).astype(int)
+            y = is_severe_injury(ml_df.loc[X.index, 'days_missed'])
             
             print(f"🎯 Données d'entraînement: {len(X)} échantillons, {len(features)} features")
             print(f"📈 Répartition cible: {y.value_counts().to_dict()}")
@@ -345,7 +367,7 @@ class InjuryAnalyzer:
     
     def generate_player_risk_profile(self, player_id: int):
         """Générer un profil de risque pour un joueur spécifique"""
-        player_injuries = self.merged_df[self.merged_df['player_id'] == player_id]
+        player_injuries = self.player_index.rows(player_id)
         
         if player_injuries.empty:
             return {"error": "Aucune blessure trouvée pour ce joueur"}
@@ -367,6 +389,13 @@ class InjuryAnalyzer:
         
         return profile
     
+    def generate_squad_risk_profiles(self, player_ids):
+        """Générer les profils de risque d'un groupe de joueurs (effectif complet)"""
+        return {
+            player_id: self.generate_player_risk_profile(player_id)
+            for player_id in player_ids
+        }
+    
     def export_analysis_report(self, output_path: str = "analysis_report.html"):
         """Exporter un rapport d'analyse complet en HTML"""
         stats = self.generate_injury_statistics()
@@ -411,9 +440,9 @@ class InjuryAnalyzer:
             <div class="section">
                 <h2>📈 Indicateurs Clés de Performance (KPI)</h2>
                 <ul>
-                    <li>Taux de blessure grave: {(self.merged_df['severity'] == 'Grave').sum() / len(self.merged_df) * 100:.1f}%</li>
-                    <li>Efficacité de récupération: {(self.merged_df['days_missed'] <= 14).sum() / len(self.merged_df) * 100:.1f}% de récupération rapide</li>
-                    <li>Impact sur les matchs: {self.merged_df['games_missed'].sum()} matchs manqués au total</li>
+                    <li>Taux de blessure grave: {stats['severe_injury_rate']:.1f}%</li>
+                    <li>Efficacité de récupération: {stats['quick_recovery_rate']:.1f}% de récupération rapide</li>
+                    <li>Impact sur les matchs: {stats['total_games_missed']:.0f} matchs manqués au total</li>
                 </ul>
             </div>
         </body>
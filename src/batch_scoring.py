@@ -0,0 +1,133 @@
+"""
+Calcul en lot du risque de blessure grave de tous les joueurs (table Parquet pré-calculée)
+"""
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+
+from src.ml_predictor import InjuryPredictor
+from src.schema import normalize_players
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RISK_SCORES_PATH = os.path.join(PROJECT_ROOT, "models", "player_risk_scores.parquet")
+
+# Joueurs par tâche envoyée au pool de processus
+SCORING_CHUNK_SIZE = 50000
+
+# Prédicteur chargé une fois par processus du pool
+_worker_predictor = None
+
+
+def _init_worker(model_path, data_fingerprint):
+    """Charger l'artefact du modèle dans un processus du pool"""
+    global _worker_predictor
+    _worker_predictor = InjuryPredictor()
+    if not _worker_predictor.load_model(model_path, expected_fingerprint=data_fingerprint):
+        raise RuntimeError(f"Modèle illisible: {model_path}")
+
+
+def _score_chunk(chunk):
+    """Scorer un lot de joueurs avec le prédicteur du processus"""
+    return _worker_predictor.predict_batch(chunk, report=False)
+
+
+def player_features(players_df, score_date=None):
+    """Entrées du modèle pour chaque joueur à la date de calcul
+
+    L'âge est calculé à score_date et le mois est celui de score_date; les
+    joueurs sans date de naissance ou sans position ne peuvent pas être scorés.
+    """
+    score_date = pd.Timestamp(score_date or pd.Timestamp.now()).normalize()
+    players_df = normalize_players(players_df)
+
+    features = pd.DataFrame({
+        'player_id': players_df['player_id'],
+        'player_name': players_df['player_name'] if 'player_name' in players_df.columns else None,
+        'position': players_df['main_position'],
+        'age': (score_date - players_df['date_of_birth']).dt.days / 365.25,
+        'month': score_date.month,
+        'height': players_df['height'] if 'height' in players_df.columns else np.nan,
+    })
+    return features.dropna(subset=['age', 'position']).reset_index(drop=True)
+
+
+def score_all_players(players_df, predictor, model_path=None, output_path=RISK_SCORES_PATH,
+                      score_date=None, chunk_size=SCORING_CHUNK_SIZE, workers=None):
+    """Scorer tous les joueurs et écrire la table de risque (Parquet)
+
+    Les lots de chunk_size joueurs sont répartis sur un pool de processus qui
+    chargent chacun l'artefact model_path; sans artefact, ou avec un seul
+    processus, les lots sont scorés ici avec predictor.
+    """
+    start = time.perf_counter()
+    score_date = pd.Timestamp(score_date or pd.Timestamp.now()).normalize()
+    features = player_features(players_df, score_date)
+    if features.empty:
+        raise ValueError("Aucun joueur scorable (date de naissance et position requises)")
+    chunks = [features.iloc[i:i + chunk_size] for i in range(0, len(features), chunk_size)]
+    workers = min(workers or os.cpu_count() or 1, len(chunks))
+
+    if workers > 1 and model_path and os.path.exists(model_path):
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(model_path, predictor.data_fingerprint)) as executor:
+            scored = list(executor.map(_score_chunk, chunks))
+    else:
+        workers = 1
+        scored = [predictor.predict_batch(chunk, report=False) for chunk in chunks]
+
+    predictions = pd.concat(scored)
+    scores = pd.concat([features, predictions], axis=1)
+    scores['scored_at'] = score_date
+    scores['model_fingerprint'] = getattr(predictor, 'fingerprint', None)
+
+    if output_path:
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        tmp_path = f"{output_path}.tmp"
+        scores.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, output_path)
+
+    elapsed = time.perf_counter() - start
+    print(f"⚡ {len(scores):,} joueurs scorés en {elapsed:.1f}s "
+          f"({len(chunks)} lots, {workers} processus)")
+    return scores
+
+
+_scores_cache = {}
+_scores_lock = threading.Lock()
+
+
+def load_risk_scores(path=RISK_SCORES_PATH):
+    """Table de risque pré-calculée indexée par player_id (None si absente)
+
+    La table est relue seulement quand le fichier change (nouveau calcul).
+    """
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+    with _scores_lock:
+        cached = _scores_cache.get(path)
+        if cached is None or cached[0] != mtime_ns:
+            try:
+                scores = pd.read_parquet(path).set_index('player_id')
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Table de risque des joueurs illisible ({e})")
+                return None
+            cached = (mtime_ns, scores)
+            _scores_cache[path] = cached
+    return cached[1]
+
+
+def player_risk(player_id, path=RISK_SCORES_PATH):
+    """Risque pré-calculé d'un joueur (dict) ou None"""
+    scores = load_risk_scores(path)
+    if scores is None or player_id not in scores.index:
+        return None
+    row = scores.loc[player_id]
+    if isinstance(row, pd.DataFrame):
+        row = row.iloc[0]
+    return row.to_dict()
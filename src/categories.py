@@ -0,0 +1,98 @@
+"""
+Catégorisation vectorisée des blessures et niveaux de sévérité
+"""
+import re
+import numpy as np
+import pandas as pd
+
+# Catégories par ordre de priorité: la première dont un mot-clé apparaît l'emporte
+INJURY_CATEGORY_KEYWORDS = [
+    ('Musculaire', ['muscle', 'muscular', 'hamstring', 'thigh', 'calf']),
+    ('Membres inférieurs', ['knee', 'ankle', 'foot', 'leg']),
+    ('Dos', ['back', 'spine', 'lumbago']),
+    ('Tête', ['head', 'concussion', 'brain']),
+    ('Membres supérieurs', ['shoulder', 'arm', 'hand', 'wrist']),
+]
+DEFAULT_CATEGORY = 'Autre'
+INJURY_CATEGORIES = [category for category, _ in INJURY_CATEGORY_KEYWORDS] + [DEFAULT_CATEGORY]
+
+# Une seule expression compilée: chaque branche teste (par lookahead) la présence
+# d'un mot-clé de sa catégorie; l'alternation essaie les branches dans l'ordre,
+# ce qui conserve la priorité entre catégories.
+_CATEGORY_PATTERN = re.compile(
+    '|'.join(
+        f"(?=.*(?:{'|'.join(map(re.escape, keywords))}))(?P<c{i}>)"
+        for i, (_, keywords) in enumerate(INJURY_CATEGORY_KEYWORDS)
+    ),
+    re.DOTALL
+)
+_DEFAULT_CODE = len(INJURY_CATEGORIES) - 1
+
+# Sévérité selon les jours d'absence: (0, 7], (7, 21], (21, 60], > 60
+UNKNOWN_SEVERITY = 'Inconnue'
+SEVERITY_LABELS = [UNKNOWN_SEVERITY, 'Légère', 'Modérée', 'Grave', 'Très grave']
+SEVERITY_UPPER_BOUNDS = np.array([7, 21, 60], dtype=np.float64)
+
+# Seuil de la variable cible ML: blessure grave au-delà de 21 jours
+SEVERE_INJURY_DAYS = 21
+
+
+def categorize_reason(reason):
+    """Code de catégorie (index dans INJURY_CATEGORIES) pour un libellé de blessure"""
+    match = _CATEGORY_PATTERN.match(str(reason).lower())
+    if match is None:
+        return _DEFAULT_CODE
+    return int(match.lastgroup[1:])
+
+
+def categorize_injury_reasons(injury_reasons):
+    """Catégoriser une série de libellés de blessures
+
+    La catégorie est calculée une seule fois par libellé distinct puis
+    propagée aux lignes via les codes de la colonne catégorielle.
+    """
+    reasons = pd.Series(injury_reasons)
+    if not isinstance(reasons.dtype, pd.CategoricalDtype):
+        reasons = reasons.astype('category')
+
+    # Un code par libellé distinct, plus le code par défaut pour les valeurs manquantes (-1)
+    category_codes = np.fromiter(
+        (categorize_reason(reason) for reason in reasons.cat.categories),
+        dtype=np.int8,
+        count=len(reasons.cat.categories)
+    )
+    category_codes = np.append(category_codes, np.int8(_DEFAULT_CODE))
+
+    codes = category_codes[reasons.cat.codes.to_numpy()]
+    return pd.Series(
+        pd.Categorical.from_codes(codes, categories=INJURY_CATEGORIES),
+        index=reasons.index,
+        name='injury_category'
+    )
+
+
+def severity_buckets(days_missed):
+    """Sévérité (catégorie ordonnée) calculée en une passe vectorisée"""
+    days = pd.Series(days_missed)
+    values = days.to_numpy(dtype=np.float64, na_value=np.nan)
+
+    codes = np.searchsorted(SEVERITY_UPPER_BOUNDS, values, side='left').astype(np.int8) + 1
+    codes[~(values > 0)] = 0  # NaN ou jours <= 0 -> Inconnue
+
+    return pd.Series(
+        pd.Categorical.from_codes(codes, categories=SEVERITY_LABELS, ordered=True),
+        index=days.index,
+        name='severity'
+    )
+
+
+def severity_score(days_missed):
+    """Score de sévérité écrit en base: jours / 30, plafonné à 10"""
+    return np.minimum(np.asarray(days_missed, dtype=np.float64) / 30, 10)
+
+
+def is_severe_injury(days_missed):
+    """Variable cible ML: 1 si la blessure dépasse SEVERE_INJURY_DAYS jours"""
+    days = pd.Series(days_missed)
+    values = days.to_numpy(dtype=np.float64, na_value=np.nan)
+    return pd.Series((values > SEVERE_INJURY_DAYS).astype(np.int8), index=days.index)
@@ -0,0 +1,72 @@
+"""
+Cube OLAP pré-calculé pour les agrégats des tableaux de bord
+"""
+import numpy as np
+import pandas as pd
+
+# Dimensions du cube (colonnes de merged_df)
+CUBE_DIMENSIONS = ['main_position', 'injury_year', 'injury_month', 'injury_category', 'severity']
+
+# Mesures additives stockées pour chaque cellule
+CUBE_MEASURES = ['injury_count', 'days_sum', 'days_count', 'games_sum', 'games_count']
+
+
+class InjuryCube:
+    """Comptes et sommes de days_missed / games_missed par cellule du cube
+
+    Le cube est construit une seule fois (une passe groupby sur les lignes
+    brutes); les graphiques et filtres sont ensuite servis par des coupes et
+    des agrégations sur quelques milliers de cellules.
+    """
+
+    def __init__(self, merged_df: pd.DataFrame, dimensions=None):
+        self.dimensions = list(dimensions or CUBE_DIMENSIONS)
+
+        values = pd.DataFrame({
+            'days': merged_df['days_missed'].to_numpy(dtype=np.float64, na_value=np.nan),
+            'games': merged_df['games_missed'].to_numpy(dtype=np.float64, na_value=np.nan),
+        }, index=merged_df.index)
+        keys = [merged_df[dim] for dim in self.dimensions]
+
+        grouped = values.groupby(keys, observed=True, dropna=False)
+        self.cells = pd.DataFrame({
+            'injury_count': grouped.size(),
+            'days_sum': grouped['days'].sum(),
+            'days_count': grouped['days'].count(),
+            'games_sum': grouped['games'].sum(),
+            'games_count': grouped['games'].count(),
+        }).reset_index()
+        self.total_injuries = int(self.cells['injury_count'].sum())
+
+    def slice(self, **filters):
+        """Cellules correspondant aux filtres (valeur unique ou liste par dimension)
+
+        Une liste vide ou None signifie « pas de filtre » sur la dimension.
+        """
+        mask = np.ones(len(self.cells), dtype=bool)
+        for dim, selected in filters.items():
+            if selected is None:
+                continue
+            if isinstance(selected, (list, tuple, set, np.ndarray, pd.Index)):
+                if len(selected) == 0:
+                    continue
+                mask &= self.cells[dim].isin(list(selected)).to_numpy()
+            else:
+                mask &= (self.cells[dim] == selected).to_numpy()
+        return self.cells[mask]
+
+    def rollup(self, dims, **filters):
+        """Agréger les cellules (filtrées) sur les dimensions demandées
+
+        Les lignes dont une dimension demandée est manquante sont ignorées,
+        comme dans un groupby pandas classique.
+        """
+        cells = self.slice(**filters)
+        result = cells.groupby(list(dims), observed=True)[CUBE_MEASURES].sum()
+        result['days_mean'] = result['days_sum'] / result['days_count'].replace(0, np.nan)
+        result['games_mean'] = result['games_sum'] / result['games_count'].replace(0, np.nan)
+        return result
+
+    def count(self, **filters):
+        """Nombre de blessures correspondant aux filtres"""
+        return int(self.slice(**filters)['injury_count'].sum())
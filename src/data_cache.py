@@ -0,0 +1,126 @@
+"""
+Cache disque colonnaire (Parquet) pour les fichiers CSV de données
+"""
+import hashlib
+import json
+import os
+import pandas as pd
+
+from src.schema import normalize_injuries, normalize_players
+
+# Dossier de données par défaut (racine du projet / data)
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+CACHE_DIR_NAME = ".cache"
+
+# Incrémenter pour invalider tous les caches existants lorsque le format change
+CACHE_FORMAT_VERSION = 3
+
+INJURIES_FILE = "player_injuries.csv"
+PLAYERS_FILE = "player_profiles.csv"
+
+
+def _source_signature(csv_path):
+    """Signature du fichier source (date de modification et taille)"""
+    stat = os.stat(csv_path)
+    return {
+        'mtime_ns': stat.st_mtime_ns,
+        'size': stat.st_size,
+        'format_version': CACHE_FORMAT_VERSION
+    }
+
+
+def _cache_paths(csv_path, cache_dir=None):
+    """Chemins du fichier Parquet et de ses métadonnées"""
+    if cache_dir is None:
+        cache_dir = os.path.join(os.path.dirname(os.path.abspath(csv_path)), CACHE_DIR_NAME)
+    base_name = os.path.splitext(os.path.basename(csv_path))[0]
+    parquet_path = os.path.join(cache_dir, f"{base_name}.parquet")
+    meta_path = os.path.join(cache_dir, f"{base_name}.meta.json")
+    return parquet_path, meta_path
+
+
+def _is_cache_fresh(parquet_path, meta_path, signature):
+    """Vérifier que le cache correspond toujours au CSV source"""
+    if not (os.path.exists(parquet_path) and os.path.exists(meta_path)):
+        return False
+    try:
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            return json.load(f) == signature
+    except (OSError, ValueError):
+        return False
+
+
+def _write_cache(df, parquet_path, meta_path, signature):
+    """Écrire le cache de manière atomique (fichier temporaire puis renommage)"""
+    os.makedirs(os.path.dirname(parquet_path), exist_ok=True)
+
+    tmp_parquet = f"{parquet_path}.tmp"
+    df.to_parquet(tmp_parquet, index=False)
+    os.replace(tmp_parquet, parquet_path)
+
+    tmp_meta = f"{meta_path}.tmp"
+    with open(tmp_meta, 'w', encoding='utf-8') as f:
+        json.dump(signature, f)
+    os.replace(tmp_meta, meta_path)
+
+
+def load_csv_cached(csv_path, cache_dir=None, transform=None, **read_csv_kwargs):
+    """Charger un CSV via son cache Parquet, reconstruit si le CSV a changé
+
+    ``transform`` est appliqué une seule fois, avant l'écriture du cache.
+    """
+    signature = _source_signature(csv_path)
+    parquet_path, meta_path = _cache_paths(csv_path, cache_dir)
+
+    if _is_cache_fresh(parquet_path, meta_path, signature):
+        try:
+            return pd.read_parquet(parquet_path)
+        except Exception as e:
+            print(f"⚠️ Cache illisible ({parquet_path}), relecture du CSV: {e}")
+
+    df = pd.read_csv(csv_path, **read_csv_kwargs)
+    if transform is not None:
+        df = transform(df)
+
+    try:
+        _write_cache(df, parquet_path, meta_path, signature)
+        print(f"💾 Cache colonnaire créé: {parquet_path}")
+    except ImportError as e:
+        print(f"⚠️ pyarrow non disponible, cache désactivé: {e}")
+    except Exception as e:
+        print(f"⚠️ Impossible d'écrire le cache {parquet_path}: {e}")
+
+    return df
+
+
+def load_datasets(data_dir=DATA_DIR, cache_dir=None):
+    """Charger les DataFrames blessures et joueurs depuis le cache colonnaire"""
+    injuries_path = os.path.join(data_dir, INJURIES_FILE)
+    players_path = os.path.join(data_dir, PLAYERS_FILE)
+
+    injuries_df = load_csv_cached(injuries_path, cache_dir, transform=normalize_injuries)
+    players_df = load_csv_cached(players_path, cache_dir, transform=normalize_players,
+                                 low_memory=False)
+
+    return injuries_df, players_df
+
+
+def dataset_version(data_dir=DATA_DIR):
+    """Identifiant de version du jeu de données (change dès qu'un CSV source change)"""
+    signatures = [
+        _source_signature(os.path.join(data_dir, file_name))
+        for file_name in (INJURIES_FILE, PLAYERS_FILE)
+    ]
+    payload = json.dumps(signatures, sort_keys=True).encode('utf-8')
+    return hashlib.sha1(payload).hexdigest()[:16]
+
+
+def clear_cache(data_dir=DATA_DIR, cache_dir=None):
+    """Supprimer les fichiers de cache associés aux CSV du dossier de données"""
+    removed = []
+    for file_name in (INJURIES_FILE, PLAYERS_FILE):
+        for path in _cache_paths(os.path.join(data_dir, file_name), cache_dir):
+            if os.path.exists(path):
+                os.remove(path)
+                removed.append(path)
+    return removed
@@ -0,0 +1,105 @@
+"""
+Jeu de données partagé en lecture seule entre toutes les sessions
+"""
+import os
+import threading
+import pandas as pd
+
+from src.data_cache import DATA_DIR, dataset_version, load_datasets
+from src.feature_store import data_fingerprint
+
+
+def enable_copy_on_write():
+    """Activer le copy-on-write de pandas (toujours actif à partir de pandas 3)
+    
+    Option globale au processus: à appeler uniquement depuis les points
+    d'entrée (applications Streamlit) qui partagent un InjuryDataset entre
+    sessions, jamais à l'import d'un module.
+    """
+    if int(pd.__version__.split('.')[0]) < 3:
+        pd.set_option('mode.copy_on_write', True)
+
+
+class InjuryDataset:
+    """Tables blessures/joueurs chargées une fois par processus et partagées
+
+    Les tables sont exposées sous forme de copies superficielles: avec le
+    copy-on-write de pandas (voir enable_copy_on_write), une session qui
+    modifie sa vue déclenche une copie locale sans jamais altérer les
+    données partagées.
+    """
+    
+    def __init__(self, injuries_df: pd.DataFrame, players_df: pd.DataFrame, version: str):
+        self._injuries_df = injuries_df
+        self._players_df = players_df
+        self.version = version
+        self._analyzer = None
+        self._fingerprint = None
+        self._indexes = {}
+        self._lock = threading.Lock()
+    
+    @property
+    def injuries_df(self):
+        """Vue copy-on-write de la table des blessures"""
+        return self._injuries_df.copy(deep=False)
+    
+    @property
+    def players_df(self):
+        """Vue copy-on-write de la table des joueurs"""
+        return self._players_df.copy(deep=False)
+    
+    @property
+    def fingerprint(self):
+        """data_fingerprint des tables, calculé une seule fois pour ce jeu de données"""
+        if self._fingerprint is None:
+            with self._lock:
+                if self._fingerprint is None:
+                    self._fingerprint = data_fingerprint(self._injuries_df, self._players_df)
+        return self._fingerprint
+    
+    @property
+    def analyzer(self):
+        """Analyseur construit une seule fois pour ce jeu de données"""
+        if self._analyzer is None:
+            with self._lock:
+                if self._analyzer is None:
+                    from src.analyzer import InjuryAnalyzer
+                    self._analyzer = InjuryAnalyzer(self.injuries_df, self.players_df, copy=False,
+                                                    version=self.version)
+        return self._analyzer
+    
+    def player_index(self, table: str, name_col: str = None):
+        """Index par joueur de la table 'injuries' ou 'players' (construit une fois)"""
+        key = (table, name_col)
+        if key not in self._indexes:
+            with self._lock:
+                if key not in self._indexes:
+                    from src.player_index import PlayerIndex
+                    df = self._injuries_df if table == 'injuries' else self._players_df
+                    self._indexes[key] = PlayerIndex(df, name_col=name_col)
+        return self._indexes[key]
+
+
+_datasets = {}
+_registry_lock = threading.Lock()
+
+
+def get_shared_dataset(data_dir=DATA_DIR):
+    """Jeu de données partagé du processus, rechargé seulement si les CSV changent"""
+    data_dir = os.path.abspath(data_dir)
+    version = dataset_version(data_dir)
+    
+    with _registry_lock:
+        dataset = _datasets.get(data_dir)
+        if dataset is None or dataset.version != version:
+            injuries_df, players_df = load_datasets(data_dir)
+            dataset = InjuryDataset(injuries_df, players_df, version)
+            _datasets[data_dir] = dataset
+    
+    return dataset
+
+
+def clear_shared_datasets():
+    """Vider le registre (les sessions en cours gardent leurs références)"""
+    with _registry_lock:
+        _datasets.clear()
@@ -0,0 +1,74 @@
+"""
+Suivi de la dérive des données entre le dernier entraînement complet et les nouveaux lots
+"""
+import numpy as np
+from sklearn.metrics import roc_auc_score
+
+# Décalage maximal toléré de la moyenne d'une feature (en écarts-types de référence)
+MAX_FEATURE_SHIFT = 0.5
+
+# Features calendaires: un lot couvre quelques semaines, leur moyenne s'écarte
+# toujours de celle de l'historique sans que la population ait changé
+SEASONAL_FEATURES = ('injury_month', 'winter_season')
+
+# Écart maximal toléré du taux de blessures graves
+MAX_TARGET_SHIFT = 0.10
+
+# Baisse d'AUC maximale tolérée sur un nouveau lot (mesurée à partir de MIN_ROWS_FOR_AUC lignes)
+MAX_AUC_DROP = 0.05
+MIN_ROWS_FOR_AUC = 200
+
+
+def reference_statistics(X, y, auc):
+    """Statistiques de référence d'un entraînement complet"""
+    values = np.asarray(X, dtype=np.float64)
+    return {
+        'feature_names': list(X.columns),
+        'mean': values.mean(axis=0).tolist(),
+        'std': values.std(axis=0).tolist(),
+        'target_rate': float(np.mean(y)),
+        'auc': float(auc),
+        'rows': int(len(values)),
+    }
+
+
+def drift_report(reference, X_new, y_new, risk_proba_new, exclude=SEASONAL_FEATURES):
+    """Comparer un nouveau lot (features non normalisées) à la référence
+
+    ``reasons`` liste les seuils dépassés: une liste vide signifie que le
+    modèle peut être mis à jour de façon incrémentale. Le décalage des
+    features de ``exclude`` est rapporté mais ne déclenche pas de dérive.
+    """
+    values = np.asarray(X_new, dtype=np.float64)
+    y_new = np.asarray(y_new)
+
+    ref_mean = np.asarray(reference['mean'])
+    ref_std = np.asarray(reference['std'])
+    shift = np.abs(values.mean(axis=0) - ref_mean) / np.where(ref_std > 0, ref_std, 1.0)
+    feature_shift = dict(zip(reference['feature_names'], shift.round(4).tolist()))
+    target_shift = abs(float(np.mean(y_new)) - reference['target_rate'])
+
+    auc_new = None
+    if len(y_new) >= MIN_ROWS_FOR_AUC and len(np.unique(y_new)) == 2:
+        auc_new = float(roc_auc_score(y_new, risk_proba_new))
+
+    reasons = []
+    drifted = [
+        name for name, value in feature_shift.items()
+        if value > MAX_FEATURE_SHIFT and name not in exclude
+    ]
+    if drifted:
+        reasons.append(f"Dérive des features: {', '.join(drifted)}")
+    if target_shift > MAX_TARGET_SHIFT:
+        reasons.append(f"Taux de blessures graves décalé de {target_shift:.1%}")
+    if auc_new is not None and reference['auc'] - auc_new > MAX_AUC_DROP:
+        reasons.append(f"AUC en baisse: {auc_new:.3f} contre {reference['auc']:.3f}")
+
+    return {
+        'rows': int(len(values)),
+        'feature_shift': feature_shift,
+        'max_feature_shift': float(shift.max()) if len(shift) else 0.0,
+        'target_shift': target_shift,
+        'auc_new': auc_new,
+        'reasons': reasons,
+    }
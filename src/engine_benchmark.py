@@ -0,0 +1,68 @@
+"""
+Comparaison des moteurs de InjuryPredictor: durée d'entraînement, latence d'inférence et AUC
+"""
+import time
+import numpy as np
+import pandas as pd
+
+from src.ml_predictor import InjuryPredictor
+
+# Nombre de prédictions unitaires chronométrées (médiane retenue)
+LATENCY_SAMPLES = 200
+
+# Taille du lot chronométré pour le débit d'inférence
+BATCH_SIZE = 10000
+
+
+def _benchmark_players(predictor, n_rows, seed=42):
+    """Lot de joueurs aléatoires couvrant les positions connues du modèle"""
+    rng = np.random.default_rng(seed)
+    positions = np.asarray(predictor.label_encoders['position'].classes_, dtype=object)
+    return pd.DataFrame({
+        'age': rng.uniform(16, 40, n_rows),
+        'position': rng.choice(positions, n_rows),
+        'month': rng.integers(1, 13, n_rows),
+        'height': rng.uniform(160, 205, n_rows),
+    })
+
+
+def benchmark_engines(injuries_df, players_df, engines=None, test_size=0.3,
+                      latency_samples=LATENCY_SAMPLES, batch_size=BATCH_SIZE):
+    """Entraîner chaque moteur sur les mêmes features et le même découpage
+
+    Retourne un DataFrame (une ligne par moteur): durée totale de train()
+    et du seul fit, latence médiane d'une prédiction hors table de risque,
+    débit d'un lot de batch_size joueurs et AUC sur le jeu de test.
+    """
+    rows = []
+    for engine in engines or list(InjuryPredictor.ENGINES):
+        predictor = InjuryPredictor(engine=engine)
+
+        start = time.perf_counter()
+        results = predictor.train(injuries_df, players_df, test_size=test_size)
+        train_seconds = time.perf_counter() - start
+        if 'error' in results:
+            print(f"❌ Moteur {engine} non évalué: {results['error']}")
+            continue
+
+        # Prédictions unitaires par predict_batch (la table de risque est contournée)
+        players = _benchmark_players(predictor, max(latency_samples, batch_size))
+        latencies = []
+        for i in range(latency_samples):
+            start = time.perf_counter()
+            predictor.predict_batch(players.iloc[i:i + 1], report=False)
+            latencies.append(time.perf_counter() - start)
+
+        predictor.predict_batch(players.iloc[:batch_size], report=False)
+
+        rows.append({
+            'engine': engine,
+            'train_seconds': train_seconds,
+            'fit_seconds': results['fit_seconds'],
+            'single_latency_ms': float(np.median(latencies)) * 1000,
+            'batch_rows_per_second': predictor.last_batch_stats['rows_per_second'],
+            'auc_score': results['auc_score'],
+            'accuracy': results['accuracy'],
+        })
+
+    return pd.DataFrame(rows)
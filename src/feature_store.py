@@ -0,0 +1,118 @@
+"""
+Store de features: matrices d'entraînement matérialisées sur disque et relues en mmap
+"""
+import hashlib
+import json
+import os
+import shutil
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import LabelEncoder
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FEATURE_STORE_DIR = os.path.join(PROJECT_ROOT, "models", "features")
+
+# À incrémenter quand la construction des features change
+FEATURE_STORE_VERSION = 1
+
+# Colonnes lues par InjuryPredictor.prepare_features (les autres n'influencent pas le modèle)
+INJURY_FINGERPRINT_COLUMNS = ['player_id', 'injury_reason', 'from_date', 'days_missed']
+PLAYER_FINGERPRINT_COLUMNS = ['player_id', 'player_name', 'main_position', 'date_of_birth', 'height']
+
+
+def data_fingerprint(injuries_df, players_df):
+    """Empreinte du contenu des colonnes utilisées pour l'entraînement"""
+    digest = hashlib.sha1()
+    for df, columns in ((injuries_df, INJURY_FINGERPRINT_COLUMNS),
+                        (players_df, PLAYER_FINGERPRINT_COLUMNS)):
+        present = [col for col in columns if col in df.columns]
+        digest.update(json.dumps(present).encode())
+        hashed = pd.util.hash_pandas_object(df[present], index=False)
+        digest.update(hashed.to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+class FeatureStore:
+    """Features (float32) et cible (int8) indexées par empreinte des données
+
+    Chaque entrée est un dossier <clé>/ contenant X.npy, y.npy, les classes
+    des encodeurs et un fichier meta.json. L'écriture passe par un dossier
+    temporaire renommé en une fois; la lecture utilise mmap_mode='r', ce qui
+    évite de recopier la matrice en mémoire à chaque entraînement.
+    """
+
+    def __init__(self, store_dir: str = FEATURE_STORE_DIR):
+        self.store_dir = store_dir
+
+    def key(self, injuries_df, players_df, fingerprint=None):
+        """Clé d'une entrée: contenu des données + version de la construction
+
+        fingerprint évite de rehacher les tables quand l'appelant connaît déjà
+        leur data_fingerprint.
+        """
+        digest = hashlib.sha1()
+        digest.update((fingerprint or data_fingerprint(injuries_df, players_df)).encode())
+        digest.update(str(FEATURE_STORE_VERSION).encode())
+        return digest.hexdigest()[:16]
+
+    def entry_dir(self, key):
+        return os.path.join(self.store_dir, key)
+
+    def __contains__(self, key):
+        return os.path.exists(os.path.join(self.entry_dir(key), "meta.json"))
+
+    def save(self, key, X, y, label_encoders):
+        """Matérialiser une matrice de features et sa cible"""
+        entry_dir = self.entry_dir(key)
+        tmp_dir = f"{entry_dir}.tmp{os.getpid()}"
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        os.makedirs(tmp_dir)
+
+        np.save(os.path.join(tmp_dir, "X.npy"), np.ascontiguousarray(X, dtype=np.float32))
+        np.save(os.path.join(tmp_dir, "y.npy"), np.asarray(y, dtype=np.int8))
+        for name, encoder in label_encoders.items():
+            np.save(os.path.join(tmp_dir, f"classes_{name}.npy"), np.asarray(encoder.classes_, dtype=str))
+
+        meta = {
+            'version': FEATURE_STORE_VERSION,
+            'feature_names': list(X.columns),
+            'encoders': sorted(label_encoders),
+            'rows': int(len(X)),
+        }
+        with open(os.path.join(tmp_dir, "meta.json"), 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+
+        try:
+            os.replace(tmp_dir, entry_dir)
+        except OSError:
+            # Entrée écrite entre-temps par un autre processus: même contenu
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    def load(self, key):
+        """Relire une entrée (X, y, encodeurs) ou None si absente"""
+        if key not in self:
+            return None
+        entry_dir = self.entry_dir(key)
+        try:
+            with open(os.path.join(entry_dir, "meta.json"), 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            X = np.load(os.path.join(entry_dir, "X.npy"), mmap_mode='r')
+            y = np.load(os.path.join(entry_dir, "y.npy"), mmap_mode='r')
+            label_encoders = {}
+            for name in meta['encoders']:
+                encoder = LabelEncoder()
+                encoder.classes_ = np.load(os.path.join(entry_dir, f"classes_{name}.npy")).astype(object)
+                label_encoders[name] = encoder
+        except (OSError, ValueError, KeyError) as e:
+            print(f"⚠️ Entrée du store de features illisible ({e}), reconstruction")
+            return None
+
+        return (
+            pd.DataFrame(X, columns=meta['feature_names'], copy=False),
+            pd.Series(y, name='target', copy=False),
+            label_encoders
+        )
+
+    def clear(self):
+        """Supprimer toutes les entrées du store"""
+        shutil.rmtree(self.store_dir, ignore_errors=True)
@@ -0,0 +1,134 @@
+"""
+Forêt aléatoire exportée en tableaux NumPy plats pour des prédictions à faible latence
+"""
+import os
+import numpy as np
+import sklearn
+
+# Nombre de lignes évaluées simultanément (limite la taille des tableaux lignes x arbres)
+EVALUATION_CHUNK_ROWS = 4096
+
+# Depuis scikit-learn 1.4, tree_.value stocke des fractions renvoyées telles quelles
+# par predict_proba; avant, il stocke des comptes normalisés à chaque prédiction
+_NORMALIZE_TREE_VALUES = tuple(int(part) for part in sklearn.__version__.split('.')[:2]) < (1, 4)
+
+
+class FlatForest:
+    """Représentation compacte d'un RandomForestClassifier entraîné
+
+    Les noeuds de tous les arbres sont concaténés: feature, seuil, enfants
+    gauche/droit (indices globaux) et probabilités de classe par noeud. Une
+    feuille pointe vers elle-même, ce qui permet de parcourir tous les arbres
+    en parallèle pendant ``max_depth`` itérations sans branchement.
+
+    Les résultats sont identiques à ``predict_proba`` de scikit-learn:
+    comparaisons sur les features converties en float32, valeurs par noeud
+    normalisées selon la version de sklearn, puis somme des arbres dans
+    l'ordre et division par leur nombre.
+    """
+
+    ARRAY_NAMES = ['feature', 'threshold', 'left', 'right', 'value', 'roots', 'classes']
+
+    def __init__(self, feature, threshold, left, right, value, roots, classes, max_depth):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.value = value
+        self.roots = roots
+        self.classes_ = classes
+        self.max_depth = int(max_depth)
+
+    @property
+    def n_estimators(self):
+        return len(self.roots)
+
+    @property
+    def n_nodes(self):
+        return len(self.feature)
+
+    @classmethod
+    def from_sklearn(cls, forest):
+        """Exporter un RandomForestClassifier (mono-sortie) entraîné"""
+        features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+        offset = 0
+        max_depth = 0
+
+        for estimator in forest.estimators_:
+            tree = estimator.tree_
+            node_ids = np.arange(tree.node_count, dtype=np.int32)
+            is_leaf = tree.children_left == -1
+
+            features.append(np.where(is_leaf, 0, tree.feature).astype(np.int32))
+            thresholds.append(tree.threshold.astype(np.float64))
+            lefts.append(np.where(is_leaf, node_ids, tree.children_left).astype(np.int32) + offset)
+            rights.append(np.where(is_leaf, node_ids, tree.children_right).astype(np.int32) + offset)
+
+            value = np.array(tree.value[:, 0, :], dtype=np.float64)
+            if _NORMALIZE_TREE_VALUES:
+                normalizer = value.sum(axis=1)
+                normalizer[normalizer == 0.0] = 1.0
+                value = value / normalizer[:, np.newaxis]
+            values.append(value)
+
+            roots.append(offset)
+            offset += tree.node_count
+            max_depth = max(max_depth, tree.max_depth)
+
+        return cls(
+            feature=np.concatenate(features),
+            threshold=np.concatenate(thresholds),
+            left=np.concatenate(lefts),
+            right=np.concatenate(rights),
+            value=np.concatenate(values),
+            roots=np.array(roots, dtype=np.int32),
+            classes=np.asarray(forest.classes_),
+            max_depth=max_depth
+        )
+
+    def _leaves(self, X):
+        """Indice de la feuille atteinte pour chaque (ligne, arbre)"""
+        nodes = np.broadcast_to(self.roots, (len(X), self.n_estimators)).copy()
+        rows = np.arange(len(X))[:, np.newaxis]
+        for _ in range(self.max_depth):
+            go_left = X[rows, self.feature[nodes]] <= self.threshold[nodes]
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+        return nodes
+
+    def predict_proba(self, X):
+        """Probabilités de classe (n_lignes x n_classes), comme sklearn"""
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X[np.newaxis, :]
+
+        proba = np.empty((len(X), self.value.shape[1]), dtype=np.float64)
+        for start in range(0, len(X), EVALUATION_CHUNK_ROWS):
+            leaves = self._leaves(X[start:start + EVALUATION_CHUNK_ROWS])
+            # Somme cumulée dans l'ordre des arbres (même accumulation que sklearn)
+            total = np.cumsum(self.value[leaves], axis=1)[:, -1]
+            proba[start:start + len(leaves)] = total / self.n_estimators
+        return proba
+
+    def predict(self, X):
+        """Classe prédite (première classe en cas d'égalité, comme sklearn)"""
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+    def save(self, filepath):
+        """Sauvegarder les tableaux (npz non compressé)"""
+        arrays = {name: getattr(self, name if name != 'classes' else 'classes_') for name in self.ARRAY_NAMES}
+        with open(filepath, 'wb') as f:
+            np.savez(f, max_depth=np.array(self.max_depth), **arrays)
+
+    @classmethod
+    def load(cls, filepath):
+        """Charger une forêt sauvegardée avec save"""
+        with np.load(filepath, allow_pickle=False) as data:
+            return cls(
+                **{name: data[name] for name in cls.ARRAY_NAMES},
+                max_depth=int(data['max_depth'])
+            )
+
+
+def flat_forest_path(model_path):
+    """Chemin de l'export plat associé à un artefact joblib"""
+    return os.path.splitext(model_path)[0] + "_flat.npz"
@@ -0,0 +1,120 @@
+"""
+Moteur de statistiques en une passe, mis en cache par version des données
+"""
+from collections import Counter, OrderedDict
+import threading
+import numpy as np
+import pandas as pd
+
+# Nombre de versions du jeu de données conservées en cache
+STATISTICS_CACHE_SIZE = 4
+
+# Seuil de « récupération rapide » pour les KPI du rapport
+QUICK_RECOVERY_DAYS = 14
+
+
+def _count_labels(series):
+    """Comptes par modalité observée, via les codes catégoriels (une passe)"""
+    if not isinstance(series.dtype, pd.CategoricalDtype):
+        series = series.astype('category')
+    codes = series.cat.codes.to_numpy()
+    counts = np.bincount(codes[codes >= 0], minlength=len(series.cat.categories))
+    return Counter({
+        label: int(count)
+        for label, count in zip(series.cat.categories, counts)
+        if count > 0
+    })
+
+
+def _sorted_counts(counter, limit=None):
+    """Dictionnaire trié par effectif décroissant"""
+    items = sorted(counter.items(), key=lambda item: (-item[1], str(item[0])))
+    return dict(items[:limit] if limit else items)
+
+
+def _mode(counter):
+    """Modalité la plus fréquente (égalités départagées comme pandas.mode)"""
+    if not counter:
+        return 'N/A'
+    top = max(counter.values())
+    return min(label for label, count in counter.items() if count == top)
+
+
+class InjuryStatistics:
+    """Accumulateurs des statistiques générales sur les blessures
+
+    Chaque colonne n'est parcourue qu'une fois par lot de lignes; ``update``
+    permet d'ajouter de nouvelles blessures sans recalculer l'historique.
+    """
+
+    def __init__(self, version: str = None):
+        self.version = version
+        self.total_injuries = 0
+        self.player_ids = np.array([], dtype=np.int64)
+        self.days_sum = 0.0
+        self.days_count = 0
+        self.quick_recoveries = 0
+        self.games_sum = 0.0
+        self.by_category = Counter()
+        self.by_severity = Counter()
+        self.by_position = Counter()
+
+    @classmethod
+    def from_frame(cls, merged_df: pd.DataFrame, version: str = None):
+        """Construire les statistiques à partir d'une table enrichie (merged_df)"""
+        return cls(version).update(merged_df)
+
+    def update(self, merged_df: pd.DataFrame):
+        """Ajouter un lot de blessures enrichies (mêmes colonnes que merged_df)"""
+        days = merged_df['days_missed'].to_numpy(dtype=np.float64, na_value=np.nan)
+        games = merged_df['games_missed'].to_numpy(dtype=np.float64, na_value=np.nan)
+        player_ids = merged_df['player_id'].to_numpy(dtype=np.int64)
+
+        self.total_injuries += len(merged_df)
+        self.player_ids = np.union1d(self.player_ids, player_ids)
+        self.days_sum += float(np.nansum(days))
+        self.days_count += int(np.count_nonzero(~np.isnan(days)))
+        self.quick_recoveries += int(np.count_nonzero(days <= QUICK_RECOVERY_DAYS))
+        self.games_sum += float(np.nansum(games))
+
+        self.by_category.update(_count_labels(merged_df['injury_category']))
+        self.by_severity.update(_count_labels(merged_df['severity']))
+        self.by_position.update(_count_labels(merged_df['main_position']))
+        return self
+
+    def summary(self):
+        """Résumé au format de InjuryAnalyzer.generate_injury_statistics"""
+        total = max(self.total_injuries, 1)
+        return {
+            'total_injuries': self.total_injuries,
+            'unique_players': len(self.player_ids),
+            'avg_days_missed': self.days_sum / self.days_count if self.days_count else float('nan'),
+            'most_common_injury': _mode(self.by_category),
+            'most_affected_position': _mode(self.by_position),
+            'injuries_by_category': _sorted_counts(self.by_category),
+            'injuries_by_severity': _sorted_counts(self.by_severity),
+            'injuries_by_position': _sorted_counts(self.by_position, limit=10),
+            'severe_injury_rate': self.by_severity.get('Grave', 0) / total * 100,
+            'quick_recovery_rate': self.quick_recoveries / total * 100,
+            'total_games_missed': self.games_sum,
+        }
+
+
+_statistics_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def get_statistics(merged_df: pd.DataFrame, version: str):
+    """Statistiques d'une version du jeu de données (calculées une seule fois)"""
+    with _cache_lock:
+        if version in _statistics_cache:
+            _statistics_cache.move_to_end(version)
+            return _statistics_cache[version]
+
+    statistics = InjuryStatistics.from_frame(merged_df, version)
+
+    with _cache_lock:
+        _statistics_cache[version] = statistics
+        while len(_statistics_cache) > STATISTICS_CACHE_SIZE:
+            _statistics_cache.popitem(last=False)
+    return statistics
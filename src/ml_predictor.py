@@ -3,27 +3,155 @@ Module de prédiction ML spécialisé pour les blessures de football
 """
 import pandas as pd
 import numpy as np
-from sklearn.ensemble import RandomForestClassifier
+from sklearn.ensemble import RandomForestClassifier, HistGradientBoostingClassifier
+from sklearn.inspection import permutation_importance
 from sklearn.model_selection import train_test_split, cross_val_score
 from sklearn.preprocessing import LabelEncoder, StandardScaler
 from sklearn.metrics import classification_report, confusion_matrix, roc_auc_score
+import os
+import time
 import joblib
+import sklearn
+from src.schema import normalize_injuries, normalize_players
+from src.categories import is_severe_injury
+from src.flat_forest import FlatForest, flat_forest_path
+from src.risk_table import RiskLookupTable, risk_table_path
+from src.model_config import load_model_config
+from src.drift import drift_report, reference_statistics
+from src.feature_store import data_fingerprint
+from src.model_artifact import ARTIFACT_FORMAT_VERSION, ModelArtifact
 import warnings
 warnings.filterwarnings('ignore')
 
 class InjuryPredictor:
-    """Prédicteur de blessures basé sur Random Forest"""
+    """Prédicteur de blessures (Random Forest ou gradient boosting par histogrammes)"""
     
-    def __init__(self):
-        self.model = None
+    # Moteurs d'apprentissage disponibles
+    ENGINES = {
+        'random_forest': 'Random Forest',
+        'hist_gradient_boosting': 'Histogram Gradient Boosting'
+    }
+    
+    # Hyperparamètres par défaut du Random Forest (surchargés par models/model_config.json)
+    DEFAULT_MODEL_PARAMS = {
+        'n_estimators': 200,
+        'max_depth': 10,
+        'min_samples_split': 10,
+        'min_samples_leaf': 5,
+        'random_state': 42,
+        'class_weight': 'balanced'
+    }
+    
+    # Hyperparamètres par défaut du gradient boosting par histogrammes
+    HGB_MODEL_PARAMS = {
+        'max_iter': 200,
+        'learning_rate': 0.1,
+        'max_leaf_nodes': 31,
+        'min_samples_leaf': 20,
+        'random_state': 42,
+        'class_weight': 'balanced'
+    }
+    
+    # Features traitées comme catégories natives par le gradient boosting
+    CATEGORICAL_FEATURES = ['position_encoded']
+    
+    # Features normalisées par le StandardScaler
+    NUMERIC_FEATURES = ['age_at_injury', 'height_normalized', 'injury_month']
+    
+    # Taille par défaut quand elle n'est pas renseignée
+    DEFAULT_HEIGHT = 180
+    
+    # Évaluation rapide (out-of-bag) ou validation croisée complète
+    EVALUATION_MODES = ('oob', 'cv')
+    CV_FOLDS = 5
+    
+    # Mises à jour incrémentales: arbres ajoutés par lot (au prorata des lignes,
+    # au moins MIN_INCREMENTAL_TREES) et limites avant un réentraînement complet
+    MIN_INCREMENTAL_TREES = 5
+    MAX_TREE_GROWTH = 2.0
+    MAX_INCREMENTAL_SHARE = 0.5
+    
+    # Taille de lot maximale servie par l'export plat de la forêt
+    FLAT_FOREST_MAX_ROWS = 256
+    
+    def __init__(self, model_params=None, feature_store=None, engine='random_forest'):
+        if engine not in self.ENGINES:
+            raise ValueError(f"Moteur inconnu: {engine} (attendu: {tuple(self.ENGINES)})")
+        
+        self.engine = engine
+        self._model = None
+        self._model_loader = None
+        self.feature_store = feature_store
+        self.flat_forest = None
+        self.risk_table = None
+        if engine == 'random_forest':
+            self.model_params = {**self.DEFAULT_MODEL_PARAMS, **load_model_config(), **(model_params or {})}
+        else:
+            self.model_params = {**self.HGB_MODEL_PARAMS, **(model_params or {})}
         self.scaler = StandardScaler()
         self.label_encoders = {}
         self.feature_names = []
+        self.training_results = {}
+        self.reference_stats = {}
+        self.base_estimators = 0
+        self.incremental_rows = 0
+        self.last_batch_stats = {}
+        self._position_codes = None
+        self.data_fingerprint = None
         self.is_trained = False
+    
+    @property
+    def model(self):
+        """Estimateur sklearn (relu à la première utilisation pour un artefact en dossier)"""
+        if self._model is None and self._model_loader is not None:
+            self._model = self._model_loader.load()
+            self._model_loader = None
+        return self._model
+    
+    @model.setter
+    def model(self, model):
+        self._model = model
+        self._model_loader = None
+        
+    def prepare_features(self, injuries_df, players_df, fingerprint=None):
+        """Préparer les features pour l'entraînement
         
-    def prepare_features(self, injuries_df, players_df):
-        """Préparer les features pour l'entraînement"""
+        Avec un store de features, la matrice (float32) et la cible (int8) sont
+        matérialisées sur disque à la première construction puis relues en
+        mmap pour les mêmes données; le troisième élément vaut alors None.
+        fingerprint (data_fingerprint des tables, si déjà connu) évite de
+        rehacher les données pour calculer la clé du store.
+        """
+        if self.feature_store is None:
+            return self._build_features(injuries_df, players_df)
+        
+        key = self.feature_store.key(injuries_df, players_df, fingerprint)
+        stored = self.feature_store.load(key)
+        if stored is None:
+            X, y, _ = self._build_features(injuries_df, players_df)
+            self.feature_store.save(key, X, y, self.label_encoders)
+            stored = self.feature_store.load(key)
+            if stored is None:
+                raise ValueError("Écriture du store de features impossible")
+        else:
+            print(f"⚡ Features relues depuis le store ({key})")
+        
+        X, y, self.label_encoders = stored
+        self.feature_names = list(X.columns)
+        self._position_codes = None
+        return X, y, None
+    
+    def _build_features(self, injuries_df, players_df, fit_encoders=True):
+        """Construire les features à partir des tables brutes
+        
+        Avec fit_encoders=False (mise à jour incrémentale), les encodeurs et la
+        taille moyenne du dernier entraînement complet sont réutilisés.
+        """
         try:
+            # Types déclarés et dates (sans effet si déjà normalisées au chargement)
+            injuries_df = normalize_injuries(injuries_df)
+            players_df = normalize_players(players_df)
+            
             # Fusion des données
             merged_df = injuries_df.merge(
                 players_df[['player_id', 'player_name', 'main_position', 'date_of_birth', 'height']],
@@ -31,35 +159,40 @@ class InjuryPredictor:
                 how='left'
             )
             
-            # Calculer l'âge
-            merged_df['from_date'] = pd.to_datetime(merged_df['from_date'])
-            merged_df['date_of_birth'] = pd.to_datetime(merged_df['date_of_birth'])
+            # Calculer l'âge (injury_month / injury_day_of_year viennent de la normalisation)
             merged_df['age_at_injury'] = (merged_df['from_date'] - merged_df['date_of_birth']).dt.days / 365.25
             
-            # Extraire des features temporelles
-            merged_df['injury_month'] = merged_df['from_date'].dt.month
-            merged_df['injury_day_of_year'] = merged_df['from_date'].dt.dayofyear
-            
             # Nettoyer les données
             clean_df = merged_df.dropna(subset=['age_at_injury', 'main_position', 'days_missed']).copy()
             
             print(f"📊 Données après nettoyage: {len(clean_df)} blessures")
             
-            if len(clean_df) < 50:
+            if fit_encoders and len(clean_df) < 50:
                 raise ValueError("Données insuffisantes pour l'entraînement ML (minimum: 50)")
             
-            # Encoder les variables catégorielles
-            position_encoder = LabelEncoder()
-            clean_df['position_encoded'] = position_encoder.fit_transform(clean_df['main_position'])
-            self.label_encoders['position'] = position_encoder
-            
-            # Encoder les types de blessures pour features additionnelles
-            injury_encoder = LabelEncoder()
-            clean_df['injury_type_encoded'] = injury_encoder.fit_transform(clean_df['injury_reason'])
-            self.label_encoders['injury_type'] = injury_encoder
+            if fit_encoders:
+                # Encoder les variables catégorielles
+                position_encoder = LabelEncoder()
+                clean_df['position_encoded'] = position_encoder.fit_transform(clean_df['main_position'])
+                self.label_encoders['position'] = position_encoder
+                self._position_codes = None
+                
+                # Encoder les types de blessures pour features additionnelles
+                injury_encoder = LabelEncoder()
+                clean_df['injury_type_encoded'] = injury_encoder.fit_transform(clean_df['injury_reason'])
+                self.label_encoders['injury_type'] = injury_encoder
+                
+                height_mean = clean_df['height'].mean()
+            else:
+                # Position inconnue du modèle: code 0, comme pour les prédictions
+                position_codes = self._position_code_map()
+                clean_df['position_encoded'] = [
+                    position_codes.get(position, 0) for position in clean_df['main_position']
+                ]
+                height_mean = self.scaler.mean_[self.NUMERIC_FEATURES.index('height_normalized')]
             
             # Créer des features dérivées
-            clean_df['height_normalized'] = clean_df['height'].fillna(clean_df['height'].mean())
+            clean_df['height_normalized'] = clean_df['height'].fillna(height_mean)
             clean_df['is_young'] = (clean_df['age_at_injury'] < 25).astype(int)
             clean_df['is_old'] = (clean_df['age_at_injury'] > 30).astype(int)
             clean_df['winter_season'] = clean_df['injury_month'].isin([12, 1, 2]).astype(int)
@@ -73,7 +206,7 @@ class InjuryPredictor:
             X = clean_df[self.feature_names]
             
             # Variable cible: blessure grave (>21 jours)
-            y = (clean_df['days_missed'] > 21).astype(int)
+            y = is_severe_injury(clean_df['days_missed'])
             
             print(f"🎯 Features: {self.feature_names}")
             print(f"📈 Distribution cible: {y.value_counts().to_dict()}")
@@ -84,11 +217,24 @@ class InjuryPredictor:
             print(f"❌ Erreur préparation features: {e}")
             raise
     
-    def train(self, injuries_df, players_df, test_size=0.3):
-        """Entraîner le modèle prédictif"""
+    def train(self, injuries_df, players_df, test_size=0.3, evaluation='oob', fingerprint=None):
+        """Entraîner le modèle prédictif
+        
+        evaluation='oob' estime la généralisation avec les prédictions
+        out-of-bag de la forêt (aucun réentraînement); evaluation='cv' lance
+        la validation croisée complète, les plis étant entraînés en parallèle.
+        Le gradient boosting n'a pas d'échantillons out-of-bag: en mode 'oob',
+        il est évalué sur le seul jeu de test. fingerprint est le
+        data_fingerprint des tables s'il est déjà connu (sinon calculé).
+        """
+        if evaluation not in self.EVALUATION_MODES:
+            raise ValueError(f"Mode d'évaluation inconnu: {evaluation} (attendu: {self.EVALUATION_MODES})")
+        
         try:
             # Préparer les données
-            X, y, data_info = self.prepare_features(injuries_df, players_df)
+            fingerprint = fingerprint or data_fingerprint(injuries_df, players_df)
+            X, y, data_info = self.prepare_features(injuries_df, players_df, fingerprint)
+            self.data_fingerprint = fingerprint
             
             # Division train/test
             X_train, X_test, y_train, y_test = train_test_split(
@@ -96,24 +242,25 @@ class InjuryPredictor:
             )
             
             # Normalisation des features numériques
-            numeric_features = ['age_at_injury', 'height_normalized', 'injury_month']
+            numeric_features = self.NUMERIC_FEATURES
             X_train_scaled = X_train.copy()
             X_test_scaled = X_test.copy()
             
             X_train_scaled[numeric_features] = self.scaler.fit_transform(X_train[numeric_features])
             X_test_scaled[numeric_features] = self.scaler.transform(X_test[numeric_features])
             
-            # Entraînement du modèle
-            self.model = RandomForestClassifier(
-                n_estimators=200,
-                max_depth=10,
-                min_samples_split=10,
-                min_samples_leaf=5,
-                random_state=42,
-                class_weight='balanced'
-            )
+            # Entraînement du modèle (OOB impossible sans bootstrap: validation croisée)
+            is_forest = self.engine == 'random_forest'
+            use_oob = is_forest and evaluation == 'oob' and self.model_params.get('bootstrap', True)
+            use_holdout = not is_forest and evaluation == 'oob'
+            self.model = self._make_estimator(oob_score=use_oob)
             
+            fit_start = time.perf_counter()
             self.model.fit(X_train_scaled, y_train)
+            fit_seconds = time.perf_counter() - fit_start
+            
+            # Export en tableaux plats pour les prédictions interactives
+            self.flat_forest = FlatForest.from_sklearn(self.model) if is_forest else None
             
             # Évaluation
             y_pred = self.model.predict(X_test_scaled)
@@ -127,13 +274,29 @@ class InjuryPredictor:
             except:
                 auc_score = 0.5
             
-            # Validation croisée
-            cv_scores = cross_val_score(self.model, X_train_scaled, y_train, cv=5)
-            
-            # Feature importance
+            # Estimation de la généralisation
+            if use_oob:
+                evaluation_results = self._oob_evaluation(y_train)
+            elif use_holdout:
+                evaluation_results = {'evaluation': 'holdout', 'cv_mean': None, 'cv_std': None}
+            else:
+                evaluation_results = self._cross_validation(X_train_scaled, y_train)
+            
+            # Référence pour le suivi de dérive des mises à jour incrémentales
+            self.reference_stats = reference_statistics(X_train, y_train, auc_score)
+            self.base_estimators = self._n_trees()
+            self.incremental_rows = 0
+            
+            # Feature importance (par permutation sur le jeu de test pour le boosting)
+            if is_forest:
+                importances = self.model.feature_importances_
+            else:
+                importances = permutation_importance(
+                    self.model, X_test_scaled, y_test, scoring='roc_auc', n_repeats=5, random_state=42
+                ).importances_mean
             feature_importance = pd.DataFrame({
                 'feature': self.feature_names,
-                'importance': self.model.feature_importances_
+                'importance': importances
             }).sort_values('importance', ascending=False)
             
             # Rapport détaillé
@@ -141,11 +304,15 @@ class InjuryPredictor:
             
             self.is_trained = True
             
+            # Table de risque des simulateurs: une seule inférence en lot
+            self.risk_table = RiskLookupTable.build(self)
+            
             results = {
+                'engine': self.engine,
                 'accuracy': accuracy,
                 'auc_score': auc_score,
-                'cv_mean': cv_scores.mean(),
-                'cv_std': cv_scores.std(),
+                'fit_seconds': fit_seconds,
+                **evaluation_results,
                 'feature_importance': feature_importance,
                 'classification_report': report,
                 'confusion_matrix': confusion_matrix(y_test, y_pred),
@@ -155,8 +322,18 @@ class InjuryPredictor:
                 'label_encoders': self.label_encoders
             }
             
+            # Métriques conservées avec le modèle sauvegardé
+            self.training_results = {
+                key: value for key, value in results.items()
+                if key not in ('model', 'label_encoders')
+            }
+            
             print(f"✅ Modèle entraîné - Précision: {accuracy:.3f}, AUC: {auc_score:.3f}")
-            print(f"📊 Validation croisée: {cv_scores.mean():.3f} ± {cv_scores.std():.3f}")
+            if use_oob:
+                print(f"📊 Out-of-bag: précision {evaluation_results['oob_score']:.3f}, "
+                      f"AUC {evaluation_results['oob_auc']:.3f}")
+            elif not use_holdout:
+                print(f"📊 Validation croisée: {evaluation_results['cv_mean']:.3f} ± {evaluation_results['cv_std']:.3f}")
             
             return results
             
@@ -166,49 +343,257 @@ class InjuryPredictor:
             traceback.print_exc()
             return {'error': str(e)}
     
+    def update(self, new_injuries_df, players_df, history_injuries_df=None, test_size=0.3, evaluation='oob'):
+        """Mettre à jour le modèle avec de nouvelles blessures uniquement
+        
+        Des arbres supplémentaires (warm_start) sont entraînés sur les nouvelles
+        lignes, avec les encodeurs et la normalisation du dernier entraînement
+        complet. Si le lot dérive de la référence ou si les mises à jour
+        cumulées deviennent trop importantes, un réentraînement complet est
+        lancé sur history_injuries_df (historique complet, nouvelles lignes
+        incluses) ou signalé par le statut 'retrain_required'. test_size et
+        evaluation sont ceux de ce réentraînement (voir train).
+        """
+        if not self.is_trained:
+            raise ValueError("Le modèle n'est pas encore entraîné")
+        
+        X_new, y_new, _ = self._build_features(new_injuries_df, players_df, fit_encoders=False)
+        if len(X_new) == 0:
+            return {'status': 'skipped', 'reasons': ["Aucune nouvelle blessure exploitable"]}
+        
+        X_scaled = X_new.astype(np.float64)
+        X_scaled[self.NUMERIC_FEATURES] = self.scaler.transform(X_new[self.NUMERIC_FEATURES])
+        if not self.reference_stats:
+            drift = {'reasons': ["Aucune statistique de référence (modèle antérieur au suivi de dérive)"]}
+            reference_rows = len(X_new)
+        else:
+            risk_proba, _ = self._predict_matrix(X_scaled.to_numpy())
+            drift = drift_report(self.reference_stats, X_new, y_new, risk_proba)
+            reference_rows = self.reference_stats['rows']
+        
+        n_new_trees = max(
+            self.MIN_INCREMENTAL_TREES,
+            round(self.base_estimators * len(X_new) / max(reference_rows, 1))
+        )
+        reasons = list(drift['reasons'])
+        if self.engine != 'random_forest':
+            reasons.append(f"Mise à jour incrémentale indisponible pour le moteur {self.ENGINES[self.engine]}")
+        elif self.model.n_estimators + n_new_trees > self.base_estimators * self.MAX_TREE_GROWTH:
+            reasons.append(f"Forêt limitée à {self.MAX_TREE_GROWTH:.0f}x les {self.base_estimators} arbres initiaux")
+        if self.incremental_rows + len(X_new) > reference_rows * self.MAX_INCREMENTAL_SHARE:
+            reasons.append("Trop de lignes ajoutées depuis le dernier entraînement complet")
+        
+        if reasons:
+            if history_injuries_df is None:
+                print(f"⚠️ Réentraînement complet nécessaire: {'; '.join(reasons)}")
+                return {'status': 'retrain_required', 'reasons': reasons, 'drift': drift}
+            print(f"🔄 Réentraînement complet: {'; '.join(reasons)}")
+            results = self.train(history_injuries_df, players_df, test_size=test_size, evaluation=evaluation)
+            status = 'error' if 'error' in results else 'retrained'
+            return {'status': status, 'reasons': reasons, 'drift': drift, 'results': results}
+        
+        if y_new.nunique() < 2:
+            return {'status': 'skipped', 'reasons': ["Lot sans les deux classes cibles"], 'drift': drift}
+        
+        # Nouveaux arbres entraînés sur les seules nouvelles lignes; 'balanced' est
+        # remplacé par les poids de la distribution de référence (et non du lot)
+        class_weight = self.model.class_weight
+        if class_weight == 'balanced':
+            severe_rate = min(max(self.reference_stats['target_rate'], 1e-6), 1 - 1e-6)
+            class_weight = {0: 0.5 / (1 - severe_rate), 1: 0.5 / severe_rate}
+        self.model.set_params(
+            warm_start=True, oob_score=False, class_weight=class_weight,
+            n_estimators=self.model.n_estimators + n_new_trees
+        )
+        self.model.fit(X_scaled, y_new)
+        self.model.set_params(warm_start=False, class_weight=self.model_params.get('class_weight'))
+        self.incremental_rows += len(X_new)
+        self.data_fingerprint = (
+            data_fingerprint(history_injuries_df, players_df) if history_injuries_df is not None else None
+        )
+        
+        self.flat_forest = FlatForest.from_sklearn(self.model)
+        self.risk_table = RiskLookupTable.build(self)
+        
+        print(f"➕ {n_new_trees} arbres ajoutés sur {len(X_new)} nouvelles blessures "
+              f"({self.model.n_estimators} arbres au total)")
+        return {
+            'status': 'updated',
+            'added_trees': n_new_trees,
+            'n_estimators': self.model.n_estimators,
+            'drift': drift
+        }
+    
+    def _make_estimator(self, oob_score=False):
+        """Estimateur non entraîné du moteur choisi"""
+        if self.engine == 'random_forest':
+            params = {**self.model_params, 'oob_score': True} if oob_score else self.model_params
+            return RandomForestClassifier(**params)
+        
+        # Catégories natives: la position n'est pas traitée comme une valeur ordonnée
+        categorical = [self.feature_names.index(name) for name in self.CATEGORICAL_FEATURES]
+        return HistGradientBoostingClassifier(categorical_features=categorical, **self.model_params)
+    
+    def _n_trees(self):
+        """Nombre d'arbres (forêt) ou d'itérations de boosting du modèle entraîné"""
+        if self.engine == 'random_forest':
+            return self.model.n_estimators
+        return self.model.n_iter_
+    
+    def _oob_evaluation(self, y_train):
+        """Précision et AUC out-of-bag (prédictions des arbres n'ayant pas vu la ligne)"""
+        oob_proba = self.model.oob_decision_function_
+        scored = ~np.isnan(oob_proba).any(axis=1)
+        y_oob = np.asarray(y_train)[scored]
+        
+        try:
+            oob_auc = roc_auc_score(y_oob, oob_proba[scored, list(self.model.classes_).index(1)])
+        except ValueError:
+            oob_auc = 0.5
+        
+        return {
+            'evaluation': 'oob',
+            'oob_score': self.model.oob_score_,
+            'oob_auc': oob_auc,
+            'cv_mean': None,
+            'cv_std': None
+        }
+    
+    def _cross_validation(self, X_train, y_train):
+        """Validation croisée complète, un pli par processus"""
+        cv_scores = cross_val_score(
+            self._make_estimator(), X_train, y_train,
+            cv=self.CV_FOLDS, n_jobs=-1
+        )
+        return {
+            'evaluation': 'cv',
+            'cv_mean': cv_scores.mean(),
+            'cv_std': cv_scores.std()
+        }
+    
+    def _position_code_map(self):
+        """Position -> code de l'encodeur (calculé une fois par modèle)"""
+        if self._position_codes is None:
+            classes = self.label_encoders['position'].classes_
+            self._position_codes = {position: code for code, position in enumerate(classes)}
+        return self._position_codes
+    
+    def _feature_matrix(self, age, position, month, height=None):
+        """Matrice des features (float64) normalisée, dans l'ordre de feature_names"""
+        age = np.asarray(age, dtype=np.float64)
+        month = np.asarray(month, dtype=np.float64)
+        
+        if height is None:
+            height = np.full(len(age), self.DEFAULT_HEIGHT, dtype=np.float64)
+        else:
+            height = np.asarray(height, dtype=np.float64)
+            height = np.where(np.isnan(height) | (height == 0), self.DEFAULT_HEIGHT, height)
+        
+        # Position inconnue: code 0, comme l'ancien encodage ligne à ligne
+        position_codes = self._position_code_map()
+        position_encoded = np.fromiter(
+            (position_codes.get(value, 0) for value in position),
+            dtype=np.float64, count=len(age)
+        )
+        
+        columns = {
+            'age_at_injury': age,
+            'height_normalized': height,
+            'position_encoded': position_encoded,
+            'injury_month': month,
+            'is_young': (age < 25).astype(np.float64),
+            'is_old': (age > 30).astype(np.float64),
+            'winter_season': np.isin(month, [12, 1, 2]).astype(np.float64),
+        }
+        matrix = np.column_stack([columns[name] for name in self.feature_names])
+        
+        # Normalisation en une passe (équivalent à StandardScaler.transform)
+        numeric_indices = [i for i, name in enumerate(self.feature_names) if name in self.NUMERIC_FEATURES]
+        matrix[:, numeric_indices] = (matrix[:, numeric_indices] - self.scaler.mean_) / self.scaler.scale_
+        return matrix
+    
+    def _predict_matrix(self, matrix):
+        """Probabilités (blessure grave, blessure légère) pour une matrice normalisée
+        
+        Les petits lots passent par l'export plat (sans surcoût par appel de
+        sklearn); les gros lots restent plus rapides avec predict_proba.
+        """
+        if self.flat_forest is not None and len(matrix) <= self.FLAT_FOREST_MAX_ROWS:
+            probabilities = self.flat_forest.predict_proba(matrix)
+            classes = list(self.flat_forest.classes_)
+        else:
+            probabilities = self.model.predict_proba(pd.DataFrame(matrix, columns=self.feature_names))
+            classes = list(self.model.classes_)
+        
+        risk_proba = probabilities[:, classes.index(1)] if 1 in classes else np.zeros(len(matrix))
+        safe_proba = probabilities[:, classes.index(0)] if 0 in classes else np.zeros(len(matrix))
+        return risk_proba, safe_proba
+    
+    def predict_batch(self, players_df, report=True):
+        """Prédire le risque de blessure grave pour un lot de joueurs
+        
+        players_df contient les colonnes age, position, month et (optionnel) height.
+        Retourne un DataFrame typé aligné sur l'index d'entrée.
+        """
+        if not self.is_trained:
+            raise ValueError("Le modèle n'est pas encore entraîné")
+        
+        start = time.perf_counter()
+        
+        height = None
+        if 'height' in players_df.columns:
+            height = players_df['height'].to_numpy(dtype=np.float64, na_value=np.nan)
+        matrix = self._feature_matrix(
+            players_df['age'].to_numpy(dtype=np.float64),
+            players_df['position'].to_numpy(dtype=object),
+            players_df['month'].to_numpy(dtype=np.float64),
+            height
+        )
+        risk_proba, safe_proba = self._predict_matrix(matrix)
+        
+        results = pd.DataFrame({
+            'risk_probability': (risk_proba * 100).astype(np.float32),
+            'safe_probability': (safe_proba * 100).astype(np.float32),
+            'prediction': pd.Categorical.from_codes(
+                (risk_proba > safe_proba).astype(np.int8), categories=['Légère', 'Grave']
+            ),
+            'confidence': (np.maximum(risk_proba, safe_proba) * 100).astype(np.float32),
+        }, index=players_df.index)
+        
+        elapsed = time.perf_counter() - start
+        self.last_batch_stats = {
+            'rows': len(results),
+            'seconds': elapsed,
+            'rows_per_second': len(results) / elapsed if elapsed > 0 else float('inf')
+        }
+        if report:
+            print(f"⚡ {len(results)} prédictions en {elapsed * 1000:.1f} ms "
+                  f"({self.last_batch_stats['rows_per_second']:,.0f} lignes/s)")
+        
+        return results
+    
     def predict_risk(self, age, position, month, height=None, is_young=None, is_old=None):
         """Prédire le risque de blessure grave pour un joueur"""
         if not self.is_trained:
             raise ValueError("Le modèle n'est pas encore entraîné")
         
         try:
-            # Préparer les features
-            features = {}
-            features['age_at_injury'] = age
-            features['height_normalized'] = height if height else 180  # Valeur moyenne
-            features['injury_month'] = month
-            features['is_young'] = 1 if age < 25 else 0
-            features['is_old'] = 1 if age > 30 else 0
-            features['winter_season'] = 1 if month in [12, 1, 2] else 0
-            
-            # Encoder la position
-            try:
-                features['position_encoded'] = self.label_encoders['position'].transform([position])[0]
-            except:
-                # Position inconnue, utiliser la plus fréquente
-                features['position_encoded'] = 0
+            height = height if height else self.DEFAULT_HEIGHT
             
-            # Créer le vecteur de features
-            feature_vector = np.array([[features[name] for name in self.feature_names]])
-            
-            # Normaliser les features numériques
-            numeric_features = ['age_at_injury', 'height_normalized', 'injury_month']
-            feature_vector_scaled = feature_vector.copy()
-            
-            numeric_indices = [i for i, name in enumerate(self.feature_names) if name in numeric_features]
-            feature_vector_scaled[:, numeric_indices] = self.scaler.transform(
-                feature_vector[:, numeric_indices]
-            )
-            
-            # Prédiction
-            risk_proba = self.model.predict_proba(feature_vector_scaled)[0]
-            risk_class = self.model.predict(feature_vector_scaled)[0]
+            # Combinaison couverte par la table pré-calculée: simple accès au tableau
+            cached = self.risk_table.lookup(age, position, month, height) if self.risk_table else None
+            if cached is not None:
+                risk, safe = cached[0] / 100, cached[1] / 100
+            else:
+                matrix = self._feature_matrix([age], [position], [month], [height])
+                risk_proba, safe_proba = self._predict_matrix(matrix)
+                risk, safe = float(risk_proba[0]), float(safe_proba[0])
             
             return {
-                'risk_probability': risk_proba[1] * 100,  # Probabilité de blessure grave
-                'safe_probability': risk_proba[0] * 100,  # Probabilité de blessure légère
-                'prediction': 'Grave' if risk_class == 1 else 'Légère',
-                'confidence': max(risk_proba) * 100
+                'risk_probability': risk * 100,  # Probabilité de blessure grave
+                'safe_probability': safe * 100,  # Probabilité de blessure légère
+                'prediction': 'Grave' if risk > safe else 'Légère',
+                'confidence': max(risk, safe) * 100
             }
             
         except Exception as e:
@@ -216,31 +601,60 @@ class InjuryPredictor:
             return {'error': str(e)}
     
     def save_model(self, filepath):
-        """Sauvegarder le modèle entraîné"""
+        """Sauvegarder le modèle entraîné (dossier d'artefact, voir ModelArtifact)
+        
+        L'export plat de la forêt et la table de risque sont des tableaux .npy
+        relus en mmap; l'estimateur sklearn, les encodeurs et la normalisation
+        sont des fichiers joblib annexes.
+        """
         if not self.is_trained:
             raise ValueError("Aucun modèle entraîné à sauvegarder")
         
-        model_data = {
-            'model': self.model,
-            'scaler': self.scaler,
-            'label_encoders': self.label_encoders,
+        header = {
+            'engine': self.engine,
+            'data_fingerprint': self.data_fingerprint,
+            'sklearn_version': sklearn.__version__,
             'feature_names': self.feature_names,
-            'is_trained': self.is_trained
+            'model_params': self.model_params,
+            'reference_stats': self.reference_stats,
+            'base_estimators': self.base_estimators,
+            'incremental_rows': self.incremental_rows,
+            'is_trained': self.is_trained,
+            'flat_forest': None,
+            'risk_table': None
         }
+        arrays = {}
+        
+        if self.flat_forest is not None:
+            header['flat_forest'] = {'max_depth': self.flat_forest.max_depth, 'n_nodes': self.flat_forest.n_nodes}
+            for name in FlatForest.ARRAY_NAMES:
+                arrays[f"flat_{name}"] = getattr(self.flat_forest, 'classes_' if name == 'classes' else name)
+        if self.risk_table is not None:
+            header['risk_table'] = {'positions': [str(position) for position in self.risk_table.positions]}
+            arrays['risk_table_risk'] = self.risk_table.risk_probability
+            arrays['risk_table_safe'] = self.risk_table.safe_probability
         
-        joblib.dump(model_data, filepath)
+        ModelArtifact.write(filepath, header, arrays, objects={
+            'model': self.model,
+            'scaler': self.scaler,
+            'label_encoders': self.label_encoders,
+            'training_results': self.training_results
+        })
         print(f"💾 Modèle sauvegardé: {filepath}")
     
-    def load_model(self, filepath):
-        """Charger un modèle pré-entraîné"""
+    def load_model(self, filepath, expected_fingerprint=None):
+        """Charger un modèle pré-entraîné
+        
+        Un dossier d'artefact est chargé sans désérialiser l'estimateur
+        sklearn (relu seulement s'il devient nécessaire). expected_fingerprint
+        refuse un artefact entraîné sur d'autres données. Les anciens fichiers
+        joblib (.pkl) restent lisibles.
+        """
         try:
-            model_data = joblib.load(filepath)
-            
-            self.model = model_data['model']
-            self.scaler = model_data['scaler']
-            self.label_encoders = model_data['label_encoders']
-            self.feature_names = model_data['feature_names']
-            self.is_trained = model_data['is_trained']
+            if ModelArtifact.is_artifact(filepath):
+                self._load_artifact(ModelArtifact(filepath), expected_fingerprint)
+            else:
+                self._load_joblib_model(filepath)
             
             print(f"📂 Modèle chargé: {filepath}")
             return True
@@ -249,6 +663,95 @@ class InjuryPredictor:
             print(f"❌ Erreur chargement modèle: {e}")
             return False
     
+    def _load_artifact(self, artifact, expected_fingerprint=None):
+        """Charger un dossier d'artefact (tableaux en mmap, estimateur à la demande)"""
+        header = artifact.header
+        if header.get('format_version') != ARTIFACT_FORMAT_VERSION:
+            raise ValueError(f"Format d'artefact {header.get('format_version')} non supporté "
+                             f"(attendu: {ARTIFACT_FORMAT_VERSION})")
+        if expected_fingerprint is not None and header.get('data_fingerprint') != expected_fingerprint:
+            raise ValueError("Artefact entraîné sur d'autres données")
+        
+        self.engine = header['engine']
+        self.model = None
+        # Fichier ouvert dès maintenant: lisible même si cette version est supprimée ensuite
+        self._model_loader = artifact.lazy_object('model')
+        self.scaler = artifact.object('scaler')
+        self.label_encoders = artifact.object('label_encoders')
+        self._position_codes = None
+        self.feature_names = header['feature_names']
+        self.model_params = header['model_params']
+        self.training_results = artifact.object('training_results')
+        self.reference_stats = header['reference_stats']
+        self.base_estimators = header['base_estimators']
+        self.incremental_rows = header['incremental_rows']
+        self.data_fingerprint = header['data_fingerprint']
+        self.is_trained = header['is_trained']
+        
+        self.flat_forest = None
+        flat = header['flat_forest']
+        if flat is not None:
+            self.flat_forest = FlatForest(
+                **{name: artifact.array(f"flat_{name}") for name in FlatForest.ARRAY_NAMES},
+                max_depth=flat['max_depth']
+            )
+            if self.flat_forest.n_nodes != flat['n_nodes']:
+                print("⚠️ Export plat incomplet, reconstruction")
+                self.flat_forest = FlatForest.from_sklearn(self.model)
+        
+        table = header['risk_table']
+        if table is not None and table['positions'] == list(self.label_encoders['position'].classes_):
+            self.risk_table = RiskLookupTable(
+                table['positions'], artifact.array('risk_table_risk'), artifact.array('risk_table_safe')
+            )
+        else:
+            self.risk_table = RiskLookupTable.build(self)
+    
+    def _load_joblib_model(self, filepath):
+        """Charger un ancien artefact joblib (.pkl) et ses exports .npz"""
+        model_data = joblib.load(filepath)
+        
+        self.engine = model_data.get('engine', 'random_forest')
+        self.model = model_data['model']
+        self.scaler = model_data['scaler']
+        self.label_encoders = model_data['label_encoders']
+        self._position_codes = None
+        self.feature_names = model_data['feature_names']
+        self.model_params = model_data.get('model_params', self.model_params)
+        self.training_results = model_data.get('training_results', {})
+        self.reference_stats = model_data.get('reference_stats', {})
+        self.base_estimators = model_data.get('base_estimators', self._n_trees())
+        self.incremental_rows = model_data.get('incremental_rows', 0)
+        self.data_fingerprint = None
+        self.is_trained = model_data['is_trained']
+        self.flat_forest = self._load_flat_forest(filepath) if self.engine == 'random_forest' else None
+        self.risk_table = self._load_risk_table(filepath)
+    
+    def _load_flat_forest(self, filepath):
+        """Export plat sauvegardé avec le modèle (reconstruit s'il manque ou ne correspond pas)"""
+        path = flat_forest_path(filepath)
+        if os.path.exists(path):
+            try:
+                flat_forest = FlatForest.load(path)
+                expected_nodes = sum(tree.tree_.node_count for tree in self.model.estimators_)
+                if flat_forest.n_nodes == expected_nodes:
+                    return flat_forest
+            except (OSError, ValueError, KeyError) as e:
+                print(f"⚠️ Export plat illisible ({e}), reconstruction")
+        return FlatForest.from_sklearn(self.model)
+    
+    def _load_risk_table(self, filepath):
+        """Table de risque sauvegardée avec le modèle (régénérée si absente ou obsolète)"""
+        path = risk_table_path(filepath)
+        if os.path.exists(path):
+            try:
+                risk_table = RiskLookupTable.load(path)
+                if risk_table.positions == list(self.label_encoders['position'].classes_):
+                    return risk_table
+            except (OSError, ValueError, KeyError) as e:
+                print(f"⚠️ Table de risque illisible ({e}), régénération")
+        return RiskLookupTable.build(self)
+    
     def get_model_info(self):
         """Informations sur le modèle"""
         if not self.is_trained:
@@ -258,8 +761,9 @@ class InjuryPredictor:
             "status": "Entraîné",
             "features": self.feature_names,
             "positions_available": list(self.label_encoders['position'].classes_),
-            "model_type": "Random Forest",
-            "n_estimators": self.model.n_estimators
+            "engine": self.engine,
+            "model_type": self.ENGINES[self.engine],
+            "n_estimators": self._n_trees()
         }
 
 def test_predictor():
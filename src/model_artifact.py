@@ -0,0 +1,175 @@
+"""
+Artefact de modèle en dossier: en-tête versionné, tableaux .npy relus en mmap et petits fichiers annexes
+"""
+import json
+import os
+import shutil
+import threading
+import joblib
+import numpy as np
+
+# À incrémenter quand la disposition de l'artefact change
+ARTIFACT_FORMAT_VERSION = 1
+
+HEADER_FILE = "header.json"
+
+# Préfixe des sous-dossiers de version (v000001, v000002, ...)
+VERSION_PREFIX = "v"
+
+
+class ModelArtifact:
+    """Dossier d'artefact d'un modèle entraîné
+
+    Chaque écriture crée un nouveau sous-dossier de version (v000001, ...)
+    qui n'est plus jamais modifié: un artefact projeté en mémoire par un
+    autre processus n'est ni renommé ni écrasé (ce que Windows refuse), et
+    un lecteur voit toujours une version complète. Les versions plus
+    anciennes que les KEEP_VERSIONS dernières sont supprimées au mieux.
+
+    header.json décrit le contenu (version du format, empreinte des données,
+    métadonnées JSON). Les tableaux NumPy sont stockés non compressés, un
+    fichier .npy chacun, et relus avec mmap_mode='r': plusieurs processus
+    qui chargent le même artefact partagent les mêmes pages du cache
+    système. Les objets Python (encodeurs, normalisation) sont des
+    fichiers joblib séparés. L'estimateur, volumineux, est ouvert au
+    chargement mais désérialisé seulement à la demande (voir LazyObject):
+    les prédictions passent par l'export plat .npy, jamais par l'estimateur.
+    """
+
+    # Versions conservées: la précédente reste lisible par un processus qui a
+    # lu son en-tête mais pas encore ouvert ses fichiers
+    KEEP_VERSIONS = 2
+
+    def __init__(self, path):
+        self.path = path
+        self._header = None
+        self._version_path = None
+
+    @staticmethod
+    def _versions(path, complete=True):
+        """Numéros des versions, de la plus ancienne à la plus récente
+
+        complete=False inclut les dossiers de version sans en-tête
+        (suppression interrompue par un fichier encore ouvert).
+        """
+        if not os.path.isdir(path):
+            return []
+        versions = []
+        for name in os.listdir(path):
+            if (name.startswith(VERSION_PREFIX) and name[len(VERSION_PREFIX):].isdigit()
+                    and (not complete or os.path.exists(os.path.join(path, name, HEADER_FILE)))):
+                versions.append(int(name[len(VERSION_PREFIX):]))
+        return sorted(versions)
+
+    @staticmethod
+    def _version_dir(path, version):
+        return os.path.join(path, f"{VERSION_PREFIX}{version:06d}")
+
+    @property
+    def version_path(self):
+        """Dossier de la version lue (la plus récente à la première lecture, puis figée)"""
+        if self._version_path is None:
+            versions = self._versions(self.path)
+            # Dossier sans versions: ancienne disposition (en-tête à la racine)
+            self._version_path = self._version_dir(self.path, versions[-1]) if versions else self.path
+        return self._version_path
+
+    @property
+    def header(self):
+        """En-tête JSON de l'artefact (lu une seule fois)"""
+        if self._header is None:
+            with open(os.path.join(self.version_path, HEADER_FILE), 'r', encoding='utf-8') as f:
+                self._header = json.load(f)
+        return self._header
+
+    @classmethod
+    def is_artifact(cls, path):
+        return bool(cls._versions(path)) or os.path.exists(os.path.join(path, HEADER_FILE))
+
+    def array_path(self, name):
+        return os.path.join(self.version_path, f"{name}.npy")
+
+    def object_path(self, name):
+        return os.path.join(self.version_path, f"{name}.joblib")
+
+    def array(self, name, mmap_mode='r'):
+        """Tableau stocké (projeté en mémoire par défaut)"""
+        return np.load(self.array_path(name), mmap_mode=mmap_mode, allow_pickle=False)
+
+    def object(self, name, mmap_mode=None):
+        """Objet annexe désérialisé (mmap_mode='r' projette ses tableaux NumPy)"""
+        return load_object(self.object_path(name), mmap_mode)
+
+    def lazy_object(self, name):
+        """Objet annexe ouvert maintenant, désérialisé à la demande"""
+        return LazyObject(self.object_path(name))
+
+    @classmethod
+    def write(cls, path, header, arrays=None, objects=None):
+        """Écrire une nouvelle version de l'artefact (dossier temporaire renommé en une fois)"""
+        os.makedirs(path, exist_ok=True)
+        tmp_path = os.path.join(path, f".tmp{os.getpid()}-{threading.get_ident()}")
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        os.makedirs(tmp_path)
+
+        for name, values in (arrays or {}).items():
+            np.save(os.path.join(tmp_path, f"{name}.npy"), np.ascontiguousarray(values), allow_pickle=False)
+        for name, value in (objects or {}).items():
+            joblib.dump(value, os.path.join(tmp_path, f"{name}.joblib"))
+
+        # En-tête écrit en dernier: un dossier sans en-tête n'est jamais lu
+        with open(os.path.join(tmp_path, HEADER_FILE), 'w', encoding='utf-8') as f:
+            json.dump({'format_version': ARTIFACT_FORMAT_VERSION, **header}, f, indent=2, default=str)
+
+        # Renommage vers un nom neuf uniquement (un autre écrivain peut avoir pris le numéro)
+        version = (cls._versions(path) or [0])[-1] + 1
+        while True:
+            try:
+                os.rename(tmp_path, cls._version_dir(path, version))
+                break
+            except OSError:
+                if not os.path.exists(cls._version_dir(path, version)):
+                    raise
+                version += 1
+
+        # Anciennes versions supprimées au mieux: sous Windows, un fichier encore
+        # ouvert ou projeté bloque la suppression, reprise à l'écriture suivante
+        kept = cls._versions(path)[-cls.KEEP_VERSIONS:]
+        for old_version in cls._versions(path, complete=False):
+            if old_version < kept[0]:
+                shutil.rmtree(cls._version_dir(path, old_version), ignore_errors=True)
+
+        artifact = cls(path)
+        artifact._version_path = cls._version_dir(path, version)
+        return artifact
+
+
+class LazyObject:
+    """Fichier joblib ouvert au chargement de l'artefact, désérialisé à la demande
+
+    Le descripteur ouvert garde le fichier lisible même si sa version est
+    supprimée entre-temps (POSIX) ou empêche cette suppression (Windows).
+    Les copies profondes d'un prédicteur partagent le descripteur; chaque
+    load() rend un objet neuf.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        self._lock = threading.Lock()
+
+    def load(self):
+        with self._lock:
+            self._file.seek(0)
+            return joblib.load(self._file)
+
+    def close(self):
+        self._file.close()
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+def load_object(path, mmap_mode=None):
+    """Fichier joblib annexe (mmap_mode='r': tableaux NumPy projetés en mémoire, lecture seule)"""
+    return joblib.load(path, mmap_mode=mmap_mode)
@@ -0,0 +1,211 @@
+"""
+Cache des modèles entraînés, indexé par empreinte des données et des hyperparamètres
+"""
+import copy
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+import pandas as pd
+
+from src.feature_store import FeatureStore, data_fingerprint
+from src.ml_predictor import InjuryPredictor
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODELS_DIR = os.path.join(PROJECT_ROOT, "models")
+
+# Modèles gardés en mémoire; les moins récemment servis sont relus depuis models/ au besoin
+MAX_CACHED_MODELS = 4
+
+
+def training_fingerprint(injuries_df, players_df, model_params, test_size=0.3, evaluation='oob',
+                         engine='random_forest', data_fp=None):
+    """Empreinte d'un entraînement: données + moteur + hyperparamètres + mode d'évaluation
+
+    data_fp est le data_fingerprint des tables s'il est déjà connu (par
+    exemple InjuryDataset.fingerprint): les tables ne sont alors pas rehachées.
+    """
+    params = json.dumps(
+        {'model_params': model_params, 'test_size': test_size, 'evaluation': evaluation, 'engine': engine},
+        sort_keys=True, default=str
+    )
+    digest = hashlib.sha1()
+    digest.update((data_fp or data_fingerprint(injuries_df, players_df)).encode())
+    digest.update(params.encode())
+    return digest.hexdigest()[:16]
+
+
+class ModelCache:
+    """Modèles entraînés partagés par toutes les sessions du processus
+
+    Un modèle est cherché en mémoire, puis sur disque (models/), et n'est
+    entraîné que si aucune de ces sources ne correspond à l'empreinte. Au
+    plus max_models modèles restent en mémoire (les moins récemment servis
+    sont écartés en premier).
+    """
+
+    def __init__(self, models_dir: str = MODELS_DIR, feature_store: FeatureStore = None,
+                 max_models: int = MAX_CACHED_MODELS):
+        self.models_dir = models_dir
+        self.feature_store = feature_store or FeatureStore(os.path.join(models_dir, "features"))
+        self.max_models = max_models
+        self._models = OrderedDict()
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def model_path(self, fingerprint):
+        """Dossier d'artefact d'une empreinte (voir ModelArtifact)"""
+        return os.path.join(self.models_dir, f"injury_predictor_{fingerprint}")
+
+    def _key_lock(self, fingerprint):
+        with self._lock:
+            return self._locks.setdefault(fingerprint, threading.Lock())
+
+    def _cached(self, fingerprint):
+        """Prédicteur en mémoire (marqué comme récemment servi), None sinon"""
+        with self._lock:
+            predictor = self._models.get(fingerprint)
+            if predictor is not None:
+                self._models.move_to_end(fingerprint)
+            return predictor
+
+    def _remember(self, fingerprint, predictor, replaces=None):
+        """Garder un prédicteur en mémoire; replaces est l'empreinte qu'il remplace (écartée)"""
+        with self._lock:
+            if replaces is not None and replaces != fingerprint:
+                self._models.pop(replaces, None)
+            self._models[fingerprint] = predictor
+            self._models.move_to_end(fingerprint)
+            while len(self._models) > self.max_models:
+                self._models.popitem(last=False)
+            # Verrous des empreintes absentes de la mémoire et libres: plus utiles
+            for key in [key for key, lock in self._locks.items()
+                        if key not in self._models and not lock.locked()]:
+                del self._locks[key]
+
+    def _load_predictor(self, predictor, fingerprint):
+        """Prédicteur en mémoire ou sur disque (None si absent)"""
+        cached = self._cached(fingerprint)
+        if cached is not None:
+            return cached
+
+        path = self.model_path(fingerprint)
+        if os.path.exists(path) and predictor.load_model(path):
+            predictor.fingerprint = fingerprint
+            self._remember(fingerprint, predictor)
+            return predictor
+        return None
+
+    def find_predictor(self, injuries_df, players_df, model_params=None, test_size=0.3, evaluation='oob',
+                       engine='random_forest', data_fp=None):
+        """Prédicteur déjà entraîné pour ces données, sans jamais lancer d'entraînement"""
+        predictor = InjuryPredictor(model_params, feature_store=self.feature_store, engine=engine)
+        fingerprint = training_fingerprint(
+            injuries_df, players_df, predictor.model_params, test_size, evaluation, engine, data_fp
+        )
+        with self._key_lock(fingerprint):
+            return self._load_predictor(predictor, fingerprint)
+
+    def get_predictor(self, injuries_df, players_df, model_params=None, test_size=0.3, evaluation='oob',
+                      engine='random_forest', data_fp=None):
+        """Prédicteur entraîné pour ces données (None si l'entraînement échoue)
+
+        Les tables sont hachées au plus une fois par appel (aucune fois si
+        data_fp est fourni); l'empreinte est réutilisée par l'entraînement.
+        """
+        predictor = InjuryPredictor(model_params, feature_store=self.feature_store, engine=engine)
+        data_fp = data_fp or data_fingerprint(injuries_df, players_df)
+        fingerprint = training_fingerprint(
+            injuries_df, players_df, predictor.model_params, test_size, evaluation, engine, data_fp
+        )
+
+        cached = self._cached(fingerprint)
+        if cached is not None:
+            return cached
+
+        # Un seul entraînement par empreinte, même si plusieurs sessions le demandent
+        with self._key_lock(fingerprint):
+            loaded = self._load_predictor(predictor, fingerprint)
+            if loaded is not None:
+                return loaded
+
+            results = predictor.train(injuries_df, players_df, test_size=test_size, evaluation=evaluation,
+                                      fingerprint=data_fp)
+            if 'error' in results:
+                return None
+            try:
+                os.makedirs(self.models_dir, exist_ok=True)
+                predictor.save_model(self.model_path(fingerprint))
+            except OSError as e:
+                print(f"⚠️ Modèle non sauvegardé ({e}), conservé en mémoire")
+
+            predictor.fingerprint = fingerprint
+            self._remember(fingerprint, predictor)
+            return predictor
+
+    def update_predictor(self, previous_injuries_df, new_injuries_df, players_df,
+                         model_params=None, test_size=0.3, evaluation='oob', engine='random_forest'):
+        """Mettre à jour le modèle servi après l'arrivée de nouvelles blessures
+
+        previous_injuries_df est l'historique du modèle servi, new_injuries_df
+        les seules nouvelles lignes; l'historique complet est leur
+        concaténation. Le modèle précédent est complété par
+        InjuryPredictor.update (réentraînement complet seulement si
+        nécessaire), puis publié sous l'empreinte de l'historique complet.
+        Sans modèle précédent, un entraînement complet est lancé.
+        """
+        injuries_df = pd.concat([previous_injuries_df, new_injuries_df], ignore_index=True)
+        previous = self.find_predictor(
+            previous_injuries_df, players_df, model_params, test_size, evaluation, engine
+        )
+        if previous is None:
+            return self.get_predictor(injuries_df, players_df, model_params, test_size, evaluation, engine)
+
+        # Copie: les sessions continuent d'utiliser l'ancien modèle pendant la mise à jour
+        predictor = copy.deepcopy(previous)
+        update = predictor.update(new_injuries_df, players_df, history_injuries_df=injuries_df,
+                                  test_size=test_size, evaluation=evaluation)
+        if update['status'] not in ('updated', 'retrained', 'skipped'):
+            return previous
+
+        # Lot inexploitable ('skipped'): la copie inchangée du modèle précédent reste
+        # valable et est publiée, comme les autres, sous l'empreinte de l'historique complet
+        data_fp = data_fingerprint(injuries_df, players_df)
+        predictor.data_fingerprint = data_fp
+        fingerprint = training_fingerprint(
+            injuries_df, players_df, predictor.model_params, test_size, evaluation, engine, data_fp
+        )
+        with self._key_lock(fingerprint):
+            predictor.fingerprint = fingerprint
+            try:
+                os.makedirs(self.models_dir, exist_ok=True)
+                predictor.save_model(self.model_path(fingerprint))
+            except OSError as e:
+                print(f"⚠️ Modèle non sauvegardé ({e}), conservé en mémoire")
+            # Le modèle remplacé n'est plus servi: il quitte la mémoire
+            self._remember(fingerprint, predictor, replaces=previous.fingerprint)
+        return predictor
+
+    def clear(self):
+        """Vider le cache mémoire (les artefacts sur disque sont conservés)"""
+        with self._lock:
+            self._models.clear()
+            self._locks.clear()
+
+
+_model_cache = ModelCache()
+
+
+def get_trained_predictor(injuries_df, players_df, model_params=None, test_size=0.3, evaluation='oob',
+                          engine='random_forest', data_fp=None):
+    """Prédicteur entraîné servi depuis le cache partagé du processus"""
+    return _model_cache.get_predictor(injuries_df, players_df, model_params, test_size, evaluation, engine,
+                                      data_fp)
+
+
+def find_trained_predictor(injuries_df, players_df, model_params=None, test_size=0.3, evaluation='oob',
+                           engine='random_forest', data_fp=None):
+    """Prédicteur déjà disponible (mémoire ou models/), None sinon"""
+    return _model_cache.find_predictor(injuries_df, players_df, model_params, test_size, evaluation, engine,
+                                       data_fp)
@@ -0,0 +1,51 @@
+"""
+Configuration de production du modèle (hyperparamètres retenus par la recherche)
+"""
+import json
+import os
+from datetime import datetime
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODEL_CONFIG_PATH = os.path.join(PROJECT_ROOT, "models", "model_config.json")
+
+# Configurations déjà lues, par chemin (une lecture disque par processus)
+_configs = {}
+
+
+def _read_model_config(path):
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return dict(json.load(f).get('model_params', {}))
+    except (OSError, ValueError, AttributeError) as e:
+        print(f"⚠️ Configuration modèle illisible ({e}), paramètres par défaut utilisés")
+        return {}
+
+
+def load_model_config(path: str = MODEL_CONFIG_PATH, reload: bool = False):
+    """Hyperparamètres de production ({} si aucune configuration n'a été enregistrée)
+
+    Le fichier n'est lu qu'une fois par processus (reload=True force une
+    relecture); une configuration enregistrée par save_model_config dans le
+    même processus est prise en compte immédiatement.
+    """
+    if reload or path not in _configs:
+        _configs[path] = _read_model_config(path)
+    return dict(_configs[path])
+
+
+def save_model_config(model_params, metadata=None, path: str = MODEL_CONFIG_PATH):
+    """Enregistrer les hyperparamètres de production (écriture atomique)"""
+    config = {
+        'model_params': model_params,
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        **(metadata or {})
+    }
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(config, f, indent=2, default=str)
+    os.replace(tmp_path, path)
+    _configs[path] = dict(model_params)
+    print(f"💾 Configuration modèle enregistrée: {path}")
@@ -0,0 +1,68 @@
+"""
+Index par joueur pour des accès directs aux lignes d'un joueur
+"""
+import numpy as np
+import pandas as pd
+
+
+class PlayerIndex:
+    """Index des lignes d'une table par player_id (et nom -> player_id)
+
+    Les positions des lignes sont triées par player_id (tri stable, l'ordre
+    d'origine est conservé pour un même joueur). Chaque joueur correspond à une
+    plage [début, fin) dans ce tableau: une recherche ne touche que ses lignes.
+    """
+
+    def __init__(self, df: pd.DataFrame, id_col: str = 'player_id', name_col: str = None):
+        self.df = df
+
+        ids = df[id_col].to_numpy()
+        self._order = np.argsort(ids, kind='stable')
+        sorted_ids = ids[self._order]
+
+        self.player_ids, starts = np.unique(sorted_ids, return_index=True)
+        ends = np.append(starts[1:], len(sorted_ids))
+        self._ranges = {
+            player_id: (start, end)
+            for player_id, start, end in zip(self.player_ids.tolist(), starts.tolist(), ends.tolist())
+        }
+
+        # Nom -> player_id (première occurrence, comme une recherche par filtre)
+        self._name_to_id = {}
+        self.player_names = []
+        if name_col is not None and name_col in df.columns:
+            names = df[[name_col, id_col]].dropna(subset=[name_col]).drop_duplicates(subset=[name_col])
+            self.player_names = names[name_col].tolist()
+            self._name_to_id = dict(zip(self.player_names, names[id_col].tolist()))
+        self._sorted_names = None
+
+    def __len__(self):
+        return len(self._ranges)
+
+    def __contains__(self, player_id):
+        return player_id in self._ranges
+
+    @property
+    def sorted_player_names(self):
+        """Noms triés (calculés une seule fois)"""
+        if self._sorted_names is None:
+            self._sorted_names = sorted(self.player_names)
+        return self._sorted_names
+
+    def player_id_for_name(self, name):
+        """player_id associé à un nom (None si inconnu)"""
+        return self._name_to_id.get(name)
+
+    def positions(self, player_id):
+        """Positions (iloc) des lignes d'un joueur"""
+        start, end = self._ranges.get(player_id, (0, 0))
+        return self._order[start:end]
+
+    def rows(self, player_id):
+        """Lignes d'un joueur (DataFrame vide si absent)"""
+        return self.df.iloc[self.positions(player_id)]
+
+    def count(self, player_id):
+        """Nombre de lignes d'un joueur"""
+        start, end = self._ranges.get(player_id, (0, 0))
+        return end - start
@@ -0,0 +1,112 @@
+"""
+Table de risque pré-calculée sur tout l'espace d'entrée des simulateurs
+"""
+import os
+import numpy as np
+import pandas as pd
+
+# Espace d'entrée des simulateurs (webapp/app.py et app_simple.py)
+RISK_TABLE_AGES = np.arange(16, 41)
+RISK_TABLE_MONTHS = np.arange(1, 13)
+RISK_TABLE_HEIGHTS = np.arange(150, 211)
+
+
+def _grid_index(values, value):
+    """Indice d'une valeur entière dans une grille contiguë (None si hors grille)"""
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    if not value.is_integer():
+        return None
+    index = int(value) - int(values[0])
+    if 0 <= index < len(values):
+        return index
+    return None
+
+
+class RiskLookupTable:
+    """Probabilités de blessure grave pour chaque (âge, position, mois, taille)
+
+    La table est générée par une seule inférence en lot juste après
+    l'entraînement; une prédiction interactive devient un accès direct au
+    tableau au lieu d'un appel au modèle.
+    """
+
+    def __init__(self, positions, risk_probability, safe_probability):
+        self.positions = list(positions)
+        self._position_index = {position: i for i, position in enumerate(self.positions)}
+        self.risk_probability = risk_probability
+        self.safe_probability = safe_probability
+
+    @property
+    def shape(self):
+        return self.risk_probability.shape
+
+    @classmethod
+    def build(cls, predictor):
+        """Évaluer le modèle sur toutes les combinaisons en un seul appel"""
+        positions = list(predictor.label_encoders['position'].classes_)
+        shape = (len(RISK_TABLE_AGES), len(positions), len(RISK_TABLE_MONTHS), len(RISK_TABLE_HEIGHTS))
+
+        age, position, month, height = np.meshgrid(
+            RISK_TABLE_AGES, np.arange(len(positions)), RISK_TABLE_MONTHS, RISK_TABLE_HEIGHTS,
+            indexing='ij'
+        )
+        grid = pd.DataFrame({
+            'age': age.ravel(),
+            'position': np.asarray(positions, dtype=object)[position.ravel()],
+            'month': month.ravel(),
+            'height': height.ravel(),
+        })
+        results = predictor.predict_batch(grid)
+
+        return cls(
+            positions,
+            results['risk_probability'].to_numpy().reshape(shape),
+            results['safe_probability'].to_numpy().reshape(shape)
+        )
+
+    def index(self, age, position, month, height):
+        """Indices dans la table (None si la combinaison n'est pas couverte)"""
+        indices = (
+            _grid_index(RISK_TABLE_AGES, age),
+            self._position_index.get(position),
+            _grid_index(RISK_TABLE_MONTHS, month),
+            _grid_index(RISK_TABLE_HEIGHTS, height),
+        )
+        if any(i is None for i in indices):
+            return None
+        return indices
+
+    def lookup(self, age, position, month, height):
+        """Probabilités (blessure grave, blessure légère) en %, ou None hors table"""
+        indices = self.index(age, position, month, height)
+        if indices is None:
+            return None
+        return float(self.risk_probability[indices]), float(self.safe_probability[indices])
+
+    def save(self, filepath):
+        """Sauvegarder la table (npz non compressé)"""
+        with open(filepath, 'wb') as f:
+            np.savez(
+                f,
+                positions=np.asarray(self.positions, dtype=str),
+                risk_probability=self.risk_probability,
+                safe_probability=self.safe_probability
+            )
+
+    @classmethod
+    def load(cls, filepath):
+        """Charger une table sauvegardée avec save"""
+        with np.load(filepath, allow_pickle=False) as data:
+            return cls(
+                data['positions'].tolist(),
+                data['risk_probability'],
+                data['safe_probability']
+            )
+
+
+def risk_table_path(model_path):
+    """Chemin de la table de risque associée à un artefact joblib"""
+    return os.path.splitext(model_path)[0] + "_risk_table.npz"
@@ -0,0 +1,113 @@
+"""
+Schéma de types centralisé pour les tables blessures et joueurs
+"""
+import pandas as pd
+
+# Types déclarés pour player_injuries.csv
+INJURY_DTYPES = {
+    'player_id': 'int32',
+    'season_name': 'category',
+    'injury_reason': 'category',
+    'days_missed': 'float32',
+    'games_missed': 'int16',
+}
+
+# Types déclarés pour player_profiles.csv (les autres colonnes restent inférées)
+PLAYER_DTYPES = {
+    'player_id': 'int32',
+    'main_position': 'category',
+    'position': 'category',
+    'current_club_name': 'category',
+    'foot': 'category',
+    'height': 'float32',
+}
+
+INJURY_DATE_COLUMNS = ['from_date', 'end_date']
+PLAYER_DATE_COLUMNS = ['date_of_birth']
+
+
+def _cast_column(series, dtype):
+    """Convertir une colonne vers le type déclaré"""
+    if dtype == 'category':
+        return series.astype('category')
+
+    numeric = pd.to_numeric(series, errors='coerce')
+
+    if dtype.startswith('int'):
+        # Entier nullable si des valeurs manquantes sont présentes
+        if numeric.isna().any():
+            return numeric.round().astype(dtype.capitalize())
+        return numeric.astype(dtype)
+
+    return numeric.astype(dtype)
+
+
+def _has_dtype(series, dtype):
+    """Vérifier si la colonne possède déjà le type déclaré (ou son équivalent nullable)"""
+    current = str(series.dtype)
+    return current == dtype or current == dtype.capitalize()
+
+
+def apply_schema(df, dtypes):
+    """Appliquer un schéma de types aux colonnes présentes du DataFrame"""
+    converted = {
+        col: _cast_column(df[col], dtype)
+        for col, dtype in dtypes.items()
+        if col in df.columns and not _has_dtype(df[col], dtype)
+    }
+    if not converted:
+        return df
+    return df.assign(**converted)
+
+
+def apply_injury_schema(injuries_df):
+    """Typer la table des blessures"""
+    return apply_schema(injuries_df, INJURY_DTYPES)
+
+
+def apply_player_schema(players_df):
+    """Typer la table des joueurs"""
+    return apply_schema(players_df, PLAYER_DTYPES)
+
+
+def parse_dates(df, columns):
+    """Convertir les colonnes de dates en datetime64 (ignoré si déjà converties)"""
+    converted = {
+        col: pd.to_datetime(df[col], errors='coerce')
+        for col in columns
+        if col in df.columns and not pd.api.types.is_datetime64_any_dtype(df[col])
+    }
+    if not converted:
+        return df
+    return df.assign(**converted)
+
+
+def add_injury_date_parts(injuries_df):
+    """Ajouter année, mois et jour de l'année dérivés de from_date"""
+    if 'from_date' not in injuries_df.columns or 'injury_day_of_year' in injuries_df.columns:
+        return injuries_df
+
+    from_date = injuries_df['from_date']
+    return injuries_df.assign(
+        injury_year=_cast_column(from_date.dt.year, 'int16'),
+        injury_month=_cast_column(from_date.dt.month, 'int8'),
+        injury_day_of_year=_cast_column(from_date.dt.dayofyear, 'int16')
+    )
+
+
+def normalize_injuries(injuries_df):
+    """Typer la table des blessures et préparer ses colonnes de dates"""
+    injuries_df = apply_injury_schema(injuries_df)
+    injuries_df = parse_dates(injuries_df, INJURY_DATE_COLUMNS)
+    return add_injury_date_parts(injuries_df)
+
+
+def normalize_players(players_df):
+    """Typer la table des joueurs et convertir la date de naissance"""
+    players_df = apply_player_schema(players_df)
+    return parse_dates(players_df, PLAYER_DATE_COLUMNS)
+
+
+def memory_usage_mb(df):
+    """Mémoire occupée par un DataFrame (en Mo, chaînes incluses)"""
+    return df.memory_usage(deep=True).sum() / (1024 * 1024)
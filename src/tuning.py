@@ -0,0 +1,180 @@
+"""
+Recherche d'hyperparamètres par successive halving sur un pool de processus
+"""
+import itertools
+import json
+import math
+import multiprocessing
+import os
+import time
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.metrics import accuracy_score, roc_auc_score
+from sklearn.model_selection import train_test_split
+
+from src.feature_store import FeatureStore
+from src.ml_predictor import InjuryPredictor
+from src.model_config import MODEL_CONFIG_PATH, save_model_config
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TUNING_HISTORY_PATH = os.path.join(PROJECT_ROOT, "models", "tuning_history.json")
+
+# Espace de recherche du Random Forest de InjuryPredictor
+SEARCH_SPACE = {
+    'n_estimators': [100, 200, 300],
+    'max_depth': [6, 10, 14, None],
+    'min_samples_split': [2, 10, 20],
+    'min_samples_leaf': [1, 5, 10],
+    'max_features': ['sqrt', 0.5],
+}
+FIXED_PARAMS = {'random_state': 42, 'class_weight': 'balanced'}
+
+# Part des données réservée à la validation (même découpage que InjuryPredictor.train)
+VALIDATION_SIZE = 0.3
+
+
+def sample_candidates(n_candidates, seed=42, search_space=None):
+    """Tirer n configurations distinctes de la grille (toute la grille si elle est plus petite)"""
+    search_space = search_space or SEARCH_SPACE
+    names = list(search_space)
+    grid = [dict(zip(names, values)) for values in itertools.product(*search_space.values())]
+    if n_candidates >= len(grid):
+        return grid
+    rng = np.random.default_rng(seed)
+    return [grid[i] for i in sorted(rng.choice(len(grid), n_candidates, replace=False))]
+
+
+def halving_schedule(n_candidates, eta=3):
+    """Tours (nombre de candidats, fraction des données): le dernier utilise tout le jeu"""
+    n_rounds = max(1, math.ceil(math.log(n_candidates, eta)))
+    schedule = []
+    for r in range(n_rounds):
+        schedule.append((max(1, math.ceil(n_candidates / eta ** r)), eta ** (r - n_rounds + 1)))
+    return schedule
+
+
+def _evaluate_candidate(task):
+    """Entraîner un candidat sur une fraction des données (exécuté dans un processus du pool)"""
+    entry_dir = task['entry_dir']
+    X = np.load(os.path.join(entry_dir, "X.npy"), mmap_mode='r')
+    y = np.load(os.path.join(entry_dir, "y.npy"), mmap_mode='r')
+    train_idx, val_idx = task['train_idx'], task['val_idx']
+
+    model = RandomForestClassifier(**task['params'], **FIXED_PARAMS)
+    start = time.perf_counter()
+    model.fit(X[train_idx], y[train_idx])
+    fit_seconds = time.perf_counter() - start
+
+    proba = model.predict_proba(X[val_idx])[:, list(model.classes_).index(1)]
+    try:
+        auc = roc_auc_score(y[val_idx], proba)
+    except ValueError:
+        auc = 0.5
+
+    return {
+        'candidate': task['candidate'],
+        'round': task['round'],
+        'fraction': task['fraction'],
+        'train_rows': int(len(train_idx)),
+        'params': task['params'],
+        'auc': float(auc),
+        'accuracy': float(accuracy_score(y[val_idx], (proba > 0.5).astype(np.int8))),
+        'fit_seconds': fit_seconds,
+    }
+
+
+def tune_hyperparameters(injuries_df, players_df, budget_seconds=600, n_candidates=27, eta=3,
+                         workers=None, feature_store=None, history_path=TUNING_HISTORY_PATH,
+                         config_path=MODEL_CONFIG_PATH, seed=42):
+    """Successive halving: tous les candidats sur une petite fraction, puis le
+    meilleur tiers (eta) sur une fraction eta fois plus grande, jusqu'au jeu complet.
+
+    Les tours s'arrêtent au budget (secondes); le meilleur candidat du dernier
+    tour complet devient la configuration de production. Chaque évaluation
+    (paramètres, lignes, AUC, précision, durée d'entraînement) est enregistrée
+    dans l'historique.
+    """
+    deadline = time.perf_counter() + budget_seconds
+    feature_store = feature_store or FeatureStore()
+    workers = workers or os.cpu_count() or 1
+
+    # Features matérialisées une fois, lues en mmap par chaque processus
+    predictor = InjuryPredictor(feature_store=feature_store)
+    _, y, _ = predictor.prepare_features(injuries_df, players_df)
+    key = feature_store.key(injuries_df, players_df)
+    y = np.asarray(y)
+
+    train_idx, val_idx = train_test_split(
+        np.arange(len(y)), test_size=VALIDATION_SIZE, random_state=42, stratify=y
+    )
+    # Sous-ensembles emboîtés: chaque fraction prolonge la précédente
+    train_idx = np.random.default_rng(seed).permutation(train_idx)
+
+    candidates = sample_candidates(n_candidates, seed)
+    survivors = list(range(len(candidates)))
+    history, ranking = [], []
+    print(f"🔍 Recherche: {len(candidates)} candidats, {workers} processus, budget {budget_seconds}s")
+
+    pool = multiprocessing.Pool(processes=workers)
+    try:
+        for round_number, (_, fraction) in enumerate(halving_schedule(len(candidates), eta)):
+            n_rows = max(int(len(train_idx) * fraction), min(len(train_idx), 100))
+            rows = np.sort(train_idx[:n_rows])
+            pending = [
+                pool.apply_async(_evaluate_candidate, ({
+                    'entry_dir': feature_store.entry_dir(key),
+                    'train_idx': rows,
+                    'val_idx': val_idx,
+                    'params': candidates[candidate],
+                    'candidate': candidate,
+                    'round': round_number,
+                    'fraction': fraction,
+                },))
+                for candidate in survivors
+            ]
+
+            for result in pending:
+                result.wait(max(deadline - time.perf_counter(), 0))
+            records = [result.get() for result in pending if result.ready()]
+            history.extend(records)
+            round_ranking = sorted(records, key=lambda record: (-record['auc'], record['fit_seconds']))
+            if round_ranking:
+                print(f"  Tour {round_number}: {len(records)}/{len(pending)} candidats sur "
+                      f"{n_rows} lignes - meilleure AUC {round_ranking[0]['auc']:.3f}")
+
+            if len(records) < len(pending):
+                # Tour incomplet: le classement du tour précédent (complet) fait foi
+                print(f"⏱️ Budget atteint pendant le tour {round_number}")
+                ranking = ranking or round_ranking
+                break
+
+            ranking = round_ranking
+            survivors = [record['candidate'] for record in ranking[:max(1, len(ranking) // eta)]]
+    finally:
+        # Processus arrêtés, candidats en cours compris: le budget est une limite stricte
+        pool.terminate()
+        pool.join()
+
+    if history_path:
+        os.makedirs(os.path.dirname(history_path), exist_ok=True)
+        with open(history_path, 'w', encoding='utf-8') as f:
+            json.dump(history, f, indent=2, default=str)
+
+    if not ranking:
+        print("❌ Aucun candidat évalué dans le budget")
+        return {'winner': None, 'history': history}
+
+    winner = ranking[0]
+    if config_path:
+        save_model_config(
+            {**winner['params'], **FIXED_PARAMS},
+            metadata={
+                'validation_auc': winner['auc'],
+                'validation_accuracy': winner['accuracy'],
+                'train_rows': winner['train_rows'],
+                'features_key': key,
+            },
+            path=config_path
+        )
+    print(f"🏆 Meilleure configuration: {winner['params']} (AUC {winner['auc']:.3f})")
+    return {'winner': winner, 'history': history}
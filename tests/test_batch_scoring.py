@@ -0,0 +1,42 @@
+"""
+Tests du scoring en lot de tous les joueurs
+"""
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.batch_scoring import load_risk_scores, player_risk, score_all_players
+from src.model_cache import ModelCache
+from tests.test_model_cache import SMALL_FOREST, _training_data
+
+
+def test_pool_scoring_matches_in_process_scoring(tmp_path):
+    injuries_df, players_df = _training_data()
+    players_df.loc[0, 'date_of_birth'] = pd.NaT
+    cache = ModelCache(str(tmp_path))
+    predictor = cache.get_predictor(injuries_df, players_df, SMALL_FOREST)
+    output_path = str(tmp_path / "player_risk_scores.parquet")
+
+    local = score_all_players(players_df, predictor, output_path=None,
+                              score_date='2024-03-15', chunk_size=16, workers=1)
+    pooled = score_all_players(players_df, predictor, model_path=cache.model_path(predictor.fingerprint),
+                               output_path=output_path, score_date='2024-03-15', chunk_size=16, workers=2)
+
+    # Joueur sans date de naissance non scoré
+    assert len(pooled) == len(players_df) - 1
+    assert 1 not in pooled['player_id'].values
+    assert np.allclose(local['risk_probability'], pooled['risk_probability'])
+
+    single = predictor.predict_risk(pooled['age'][0], pooled['position'][0], 3, pooled['height'][0])
+    assert np.isclose(pooled['risk_probability'][0], single['risk_probability'], atol=1e-3)
+
+    scores = load_risk_scores(output_path)
+    assert load_risk_scores(output_path) is scores
+    risk = player_risk(2, output_path)
+    assert risk['risk_probability'] == scores.loc[2, 'risk_probability']
+    assert risk['scored_at'] == pd.Timestamp('2024-03-15')
+    assert player_risk(1, output_path) is None
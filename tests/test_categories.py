@@ -0,0 +1,41 @@
+"""
+Tests de la catégorisation des blessures
+"""
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.categories import categorize_injury_reasons, is_severe_injury, severity_buckets, severity_score
+
+
+def test_categories_follow_keyword_priority():
+    reasons = pd.Series(['Hamstring injury', 'Back knee problems', 'Concussion',
+                         'Shoulder injury', 'Lumbago', 'Cold', None, np.nan])
+    categories = categorize_injury_reasons(reasons)
+
+    assert categories.tolist() == ['Musculaire', 'Membres inférieurs', 'Tête',
+                                   'Membres supérieurs', 'Dos', 'Autre', 'Autre', 'Autre']
+    assert categories.index.equals(reasons.index)
+
+
+def test_categorical_input_uses_codes():
+    reasons = pd.Series(['Knee injury', 'Cold', 'Knee injury'], dtype='category', index=[5, 7, 9])
+    categories = categorize_injury_reasons(reasons)
+
+    assert categories.dtype == 'category'
+    assert categories.loc[9] == 'Membres inférieurs'
+
+
+def test_severity_buckets_match_thresholds():
+    days = pd.Series([np.nan, 0, 3, 7, 8, 21, 22, 60, 61], dtype='float32')
+    severity = severity_buckets(days)
+
+    assert severity.tolist() == ['Inconnue', 'Inconnue', 'Légère', 'Légère', 'Modérée',
+                                 'Modérée', 'Grave', 'Grave', 'Très grave']
+    assert severity.cat.ordered
+    assert is_severe_injury(days).tolist() == [0, 0, 0, 0, 0, 0, 1, 1, 1]
+    assert severity_score([15, 600]).tolist() == [0.5, 10.0]
@@ -0,0 +1,62 @@
+"""
+Tests du cache colonnaire des fichiers CSV
+"""
+import os
+import sys
+
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data_cache import load_csv_cached, load_datasets, _cache_paths
+
+
+def _write_csv(path, rows):
+    pd.DataFrame(rows).to_csv(path, index=False)
+
+
+def test_cache_created_and_reused(tmp_path):
+    csv_path = tmp_path / "player_injuries.csv"
+    _write_csv(csv_path, {'player_id': [1, 2], 'days_missed': [10.0, 30.0]})
+
+    first = load_csv_cached(str(csv_path))
+    parquet_path, meta_path = _cache_paths(str(csv_path))
+    assert os.path.exists(parquet_path)
+    assert os.path.exists(meta_path)
+
+    second = load_csv_cached(str(csv_path))
+    pd.testing.assert_frame_equal(first, second)
+
+
+def test_cache_invalidated_when_source_changes(tmp_path):
+    csv_path = tmp_path / "player_injuries.csv"
+    _write_csv(csv_path, {'player_id': [1], 'days_missed': [10.0]})
+    load_csv_cached(str(csv_path))
+
+    _write_csv(csv_path, {'player_id': [1, 2, 3], 'days_missed': [10.0, 5.0, 7.0]})
+    reloaded = load_csv_cached(str(csv_path))
+
+    assert len(reloaded) == 3
+
+
+def test_load_datasets_applies_schema(tmp_path):
+    _write_csv(tmp_path / "player_injuries.csv", {
+        'player_id': [1, 2], 'injury_reason': ['Knee injury', 'Cold'],
+        'season_name': ['21/22', '22/23'], 'days_missed': [10.0, 30.0],
+        'games_missed': [1.0, None], 'from_date': ['2021-09-15', '2022-02-01'],
+        'end_date': ['2021-09-25', '2022-03-03']
+    })
+    _write_csv(tmp_path / "player_profiles.csv", {
+        'player_id': [1, 2], 'main_position': ['Attack', 'Defender'], 'height': [180.0, 175.0]
+    })
+
+    for _ in range(2):  # construction puis relecture du cache
+        injuries_df, players_df = load_datasets(str(tmp_path))
+        assert injuries_df['injury_reason'].dtype == 'category'
+        assert injuries_df['days_missed'].dtype == 'float32'
+        assert str(injuries_df['games_missed'].dtype) == 'Int16'
+        assert pd.api.types.is_datetime64_any_dtype(injuries_df['from_date'])
+        assert injuries_df['injury_month'].tolist() == [9, 2]
+        assert injuries_df['injury_day_of_year'].tolist() == [258, 32]
+        assert players_df['main_position'].dtype == 'category'
+        assert players_df['player_id'].dtype == 'int32'
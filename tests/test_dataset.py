@@ -0,0 +1,108 @@
+"""
+Tests du jeu de données partagé et des structures pré-calculées
+"""
+import os
+import sys
+
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.dataset import get_shared_dataset
+from src.feature_store import data_fingerprint
+
+
+def _write_data_dir(data_dir):
+    pd.DataFrame({
+        'player_id': [1, 1, 2, 3],
+        'season_name': ['20/21', '21/22', '21/22', '22/23'],
+        'injury_reason': ['Hamstring injury', 'Knee injury', 'Back problems', 'Cold'],
+        'from_date': ['2020-11-02', '2021-12-20', '2022-01-10', '2022-08-01'],
+        'end_date': ['2020-11-20', '2022-02-15', '2022-01-14', '2022-08-30'],
+        'days_missed': [18.0, 57.0, 4.0, 90.0],
+        'games_missed': [3.0, 8.0, None, 12.0],
+    }).to_csv(os.path.join(data_dir, "player_injuries.csv"), index=False)
+    pd.DataFrame({
+        'player_id': [1, 2, 3],
+        'player_name': ['Alpha', 'Bravo', 'Charlie'],
+        'date_of_birth': ['1995-05-15', '1990-08-22', '1988-03-10'],
+        'height': [180.0, 175.0, 185.0],
+        'position': ['Centre-Forward', 'Central Midfield', 'Centre-Back'],
+        'main_position': ['Attack', 'Midfield', 'Defender'],
+        'current_club_name': ['FC A', 'FC B', 'Retired'],
+    }).to_csv(os.path.join(data_dir, "player_profiles.csv"), index=False)
+
+
+def test_shared_dataset_is_reused_and_read_only(tmp_path):
+    _write_data_dir(str(tmp_path))
+
+    dataset = get_shared_dataset(str(tmp_path))
+    assert get_shared_dataset(str(tmp_path)) is dataset
+    assert dataset.analyzer is dataset.analyzer
+    assert dataset.fingerprint == data_fingerprint(dataset.injuries_df, dataset.players_df)
+
+    view = dataset.injuries_df
+    view['days_missed'] = 0.0
+    view['extra'] = 1
+
+    assert dataset.injuries_df['days_missed'].tolist() == [18.0, 57.0, 4.0, 90.0]
+    assert 'extra' not in dataset.injuries_df.columns
+    assert 'age' not in dataset.players_df.columns
+
+
+def test_player_index_matches_filtering(tmp_path):
+    _write_data_dir(str(tmp_path))
+    analyzer = get_shared_dataset(str(tmp_path)).analyzer
+    merged_df = analyzer.merged_df
+
+    for player_id in (1, 2, 3):
+        expected = merged_df[merged_df['player_id'] == player_id]
+        pd.testing.assert_frame_equal(analyzer.player_index.rows(player_id), expected)
+
+    assert analyzer.player_index.rows(99).empty
+    assert analyzer.player_index.player_id_for_name('Bravo') == 2
+
+    profiles = analyzer.generate_squad_risk_profiles([1, 3])
+    assert profiles[1]['total_injuries'] == 2
+    assert profiles[3]['total_days_missed'] == 90.0
+
+
+def test_cube_rollups_match_groupby(tmp_path):
+    _write_data_dir(str(tmp_path))
+    analyzer = get_shared_dataset(str(tmp_path)).analyzer
+    merged_df = analyzer.merged_df
+    cube = analyzer.cube
+
+    yearly = cube.rollup(['injury_year'])['injury_count']
+    assert yearly.to_dict() == merged_df.groupby('injury_year').size().to_dict()
+
+    by_position = cube.rollup(['main_position'], injury_year=[2021, 2022])
+    assert by_position.loc['Attack', 'injury_count'] == 1
+    assert by_position.loc['Defender', 'days_mean'] == 90.0
+    assert cube.count(main_position=['Attack']) == 2
+    assert cube.count() == len(merged_df)
+
+
+def test_statistics_cached_and_incremental(tmp_path):
+    _write_data_dir(str(tmp_path))
+    dataset = get_shared_dataset(str(tmp_path))
+    analyzer = dataset.analyzer
+
+    stats = analyzer.generate_injury_statistics()
+    assert stats['total_injuries'] == 4
+    assert stats['unique_players'] == 3
+    assert stats['injuries_by_severity'] == {'Grave': 1, 'Légère': 1, 'Modérée': 1, 'Très grave': 1}
+    assert stats['avg_days_missed'] == 42.25
+    assert analyzer.statistics.version == dataset.version
+
+    new_injuries = pd.DataFrame({
+        'player_id': [2, 4], 'season_name': ['22/23', '22/23'],
+        'injury_reason': ['Calf problems', 'Cold'],
+        'from_date': ['2022-10-01', '2022-10-05'], 'end_date': ['2022-10-10', '2022-10-08'],
+        'days_missed': [9.0, 3.0], 'games_missed': [2.0, 0.0],
+    })
+    updated = analyzer.updated_statistics(new_injuries).summary()
+    assert updated['total_injuries'] == 6
+    assert updated['unique_players'] == 4
+    assert updated['injuries_by_category']['Musculaire'] == 2
+    assert analyzer.generate_injury_statistics()['total_injuries'] == 4
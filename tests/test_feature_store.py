@@ -0,0 +1,41 @@
+"""
+Tests du store de features
+"""
+import os
+import sys
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.feature_store import FeatureStore
+from src.ml_predictor import InjuryPredictor
+from tests.test_model_cache import _training_data
+
+
+def test_features_are_materialized_then_memory_mapped(tmp_path, monkeypatch):
+    injuries_df, players_df = _training_data()
+    store = FeatureStore(str(tmp_path))
+
+    X, y, _ = InjuryPredictor(feature_store=store).prepare_features(injuries_df, players_df)
+    reference_X, reference_y, _ = InjuryPredictor().prepare_features(injuries_df, players_df)
+
+    assert set(X.dtypes) == {np.dtype('float32')}
+    assert y.dtype == np.int8
+    np.testing.assert_allclose(X.to_numpy(), reference_X.to_numpy(dtype=np.float32))
+    np.testing.assert_array_equal(y.to_numpy(), reference_y.to_numpy())
+
+    # Même contenu: relecture sans reconstruire les features
+    def fail_build(*args, **kwargs):
+        raise AssertionError("les features ne doivent pas être reconstruites")
+
+    monkeypatch.setattr(InjuryPredictor, '_build_features', fail_build)
+    predictor = InjuryPredictor(feature_store=store)
+    X_again, y_again, _ = predictor.prepare_features(injuries_df.copy(), players_df.copy())
+
+    np.testing.assert_array_equal(X_again.to_numpy(), X.to_numpy())
+    assert list(predictor.label_encoders['position'].classes_) == ['Attack', 'Defender', 'Goalkeeper', 'Midfield']
+    assert predictor.feature_names == list(X.columns)
+
+    changed = injuries_df.assign(days_missed=injuries_df['days_missed'] + 1)
+    assert store.key(changed, players_df) != store.key(injuries_df, players_df)
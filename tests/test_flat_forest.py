@@ -0,0 +1,42 @@
+"""
+Tests de l'export plat de la forêt aléatoire
+"""
+import os
+import sys
+
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.flat_forest import FlatForest
+
+
+def _forest(seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(400, 7))
+    y = (X[:, 0] + 0.5 * X[:, 3] + rng.normal(scale=0.8, size=400) > 0.4).astype(int)
+    forest = RandomForestClassifier(
+        n_estimators=25, max_depth=6, min_samples_leaf=3,
+        class_weight='balanced', random_state=42
+    ).fit(X, y)
+    return forest, rng.normal(size=(600, 7))
+
+
+def test_flat_forest_is_identical_to_sklearn():
+    forest, X = _forest()
+    flat = FlatForest.from_sklearn(forest)
+
+    np.testing.assert_array_equal(flat.predict_proba(X), forest.predict_proba(X))
+    np.testing.assert_array_equal(flat.predict(X), forest.predict(X))
+    np.testing.assert_array_equal(flat.predict_proba(X[0]), forest.predict_proba(X[:1]))
+
+
+def test_flat_forest_round_trip(tmp_path):
+    forest, X = _forest(seed=1)
+    path = str(tmp_path / "forest_flat.npz")
+    FlatForest.from_sklearn(forest).save(path)
+
+    loaded = FlatForest.load(path)
+    assert loaded.n_estimators == 25
+    np.testing.assert_array_equal(loaded.predict_proba(X), forest.predict_proba(X))
@@ -0,0 +1,292 @@
+"""
+Tests du cache des modèles entraînés
+"""
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.ml_predictor import InjuryPredictor
+from src.feature_store import data_fingerprint
+from src.model_artifact import ARTIFACT_FORMAT_VERSION, ModelArtifact
+from src.model_cache import ModelCache, training_fingerprint
+
+SMALL_FOREST = {'n_estimators': 10}
+
+
+def _training_data(n_injuries=200, seed=0):
+    rng = np.random.default_rng(seed)
+    players_df = pd.DataFrame({
+        'player_id': np.arange(1, 41),
+        'player_name': [f"Player {i}" for i in range(1, 41)],
+        'main_position': rng.choice(['Attack', 'Midfield', 'Defender', 'Goalkeeper'], 40),
+        'date_of_birth': pd.to_datetime('1985-01-01') + pd.to_timedelta(rng.integers(0, 5000, 40), unit='D'),
+        'height': rng.normal(181, 6, 40).round(),
+    })
+    injuries_df = pd.DataFrame({
+        'player_id': rng.integers(1, 41, n_injuries),
+        'injury_reason': rng.choice(['Hamstring injury', 'Knee injury', 'Cold', 'Ankle injury'], n_injuries),
+        'from_date': pd.to_datetime('2015-01-01') + pd.to_timedelta(rng.integers(0, 3000, n_injuries), unit='D'),
+        'days_missed': rng.integers(1, 120, n_injuries).astype(float),
+        'games_missed': rng.integers(0, 15, n_injuries),
+    })
+    return injuries_df, players_df
+
+
+def test_fingerprint_tracks_data_and_hyperparameters():
+    injuries_df, players_df = _training_data()
+    params = InjuryPredictor(SMALL_FOREST).model_params
+
+    reference = training_fingerprint(injuries_df, players_df, params)
+    assert training_fingerprint(injuries_df.copy(), players_df.copy(), dict(params)) == reference
+    assert training_fingerprint(injuries_df, players_df, {**params, 'max_depth': 5}) != reference
+
+    changed = injuries_df.assign(days_missed=injuries_df['days_missed'] + 1)
+    assert training_fingerprint(changed, players_df, params) != reference
+
+
+def test_model_is_trained_once_and_reloaded_from_disk(tmp_path, monkeypatch):
+    injuries_df, players_df = _training_data()
+
+    cache = ModelCache(str(tmp_path))
+    predictor = cache.get_predictor(injuries_df, players_df, SMALL_FOREST)
+    assert predictor.is_trained
+    assert cache.get_predictor(injuries_df, players_df, SMALL_FOREST) is predictor
+    assert os.path.exists(cache.model_path(predictor.fingerprint))
+
+    # Un nouveau processus recharge l'artefact au lieu de réentraîner
+    def fail_train(*args, **kwargs):
+        raise AssertionError("le modèle ne doit pas être réentraîné")
+
+    monkeypatch.setattr(InjuryPredictor, 'train', fail_train)
+    reloaded = ModelCache(str(tmp_path)).get_predictor(injuries_df, players_df, SMALL_FOREST)
+
+    assert reloaded.training_results['accuracy'] == predictor.training_results['accuracy']
+    assert (reloaded.predict_risk(25, 'Attack', 12, 180)
+            == predictor.predict_risk(25, 'Attack', 12, 180))
+
+
+def test_known_data_fingerprint_is_not_recomputed(tmp_path, monkeypatch):
+    injuries_df, players_df = _training_data()
+    data_fp = data_fingerprint(injuries_df, players_df)
+    reference = ModelCache(str(tmp_path)).get_predictor(injuries_df, players_df, SMALL_FOREST)
+
+    def fail_hash(*args, **kwargs):
+        raise AssertionError("les tables ne doivent pas être rehachées")
+
+    monkeypatch.setattr(pd.util, 'hash_pandas_object', fail_hash)
+    cache = ModelCache(str(tmp_path / "fresh"), feature_store=reference.feature_store)
+    predictor = cache.get_predictor(injuries_df, players_df, SMALL_FOREST, data_fp=data_fp)
+    assert predictor.data_fingerprint == data_fp
+    assert predictor.fingerprint == reference.fingerprint
+    assert cache.find_predictor(injuries_df, players_df, SMALL_FOREST, data_fp=data_fp) is predictor
+
+
+def test_memory_cache_is_bounded(tmp_path):
+    injuries_df, players_df = _training_data(n_injuries=400)
+    cache = ModelCache(str(tmp_path), max_models=1)
+
+    first = cache.get_predictor(injuries_df.iloc[:360], players_df, SMALL_FOREST)
+    second = cache.get_predictor(injuries_df, players_df, SMALL_FOREST)
+    assert list(cache._models) == [second.fingerprint]
+
+    # Modèle écarté de la mémoire: relu depuis models/, sans réentraînement
+    reloaded = cache.find_predictor(injuries_df.iloc[:360], players_df, SMALL_FOREST)
+    assert reloaded is not first and reloaded.fingerprint == first.fingerprint
+    assert list(cache._models) == [first.fingerprint]
+
+
+def test_predict_batch_matches_single_predictions(tmp_path):
+    injuries_df, players_df = _training_data()
+    predictor = ModelCache(str(tmp_path)).get_predictor(injuries_df, players_df, SMALL_FOREST)
+
+    players = pd.DataFrame({
+        'age': [19.0, 25.0, 33.0, 28.0],
+        'position': ['Attack', 'Goalkeeper', 'Defender', 'Unknown'],
+        'month': [1, 6, 12, 3],
+        'height': [170.0, None, 190.0, 182.0],
+    }, index=[10, 11, 12, 13])
+    results = predictor.predict_batch(players)
+
+    assert list(results.index) == [10, 11, 12, 13]
+    assert str(results['risk_probability'].dtype) == 'float32'
+    assert predictor.last_batch_stats['rows'] == 4
+
+    for index, player in players.iterrows():
+        single = predictor.predict_risk(player['age'], player['position'], player['month'],
+                                        None if pd.isna(player['height']) else player['height'])
+        assert results.loc[index, 'prediction'] == single['prediction']
+        assert np.isclose(results.loc[index, 'risk_probability'], single['risk_probability'])
+
+
+def test_model_artifact_is_memory_mapped(tmp_path):
+    injuries_df, players_df = _training_data()
+    cache = ModelCache(str(tmp_path))
+    predictor = cache.get_predictor(injuries_df, players_df, SMALL_FOREST)
+    model_path = cache.model_path(predictor.fingerprint)
+
+    header = ModelArtifact(model_path).header
+    assert header['format_version'] == ARTIFACT_FORMAT_VERSION
+    assert header['data_fingerprint'] == data_fingerprint(injuries_df, players_df)
+    assert header['flat_forest']['n_nodes'] == predictor.flat_forest.n_nodes
+
+    # Tableaux projetés en mémoire, estimateur sklearn relu seulement si nécessaire
+    reloaded = InjuryPredictor()
+    assert reloaded.load_model(model_path, expected_fingerprint=predictor.data_fingerprint)
+    assert isinstance(reloaded.flat_forest.value, np.memmap)
+    assert isinstance(reloaded.risk_table.risk_probability, np.memmap)
+    assert reloaded._model is None
+    assert reloaded.predict_risk(30, 'Defender', 2, 176) == predictor.predict_risk(30, 'Defender', 2, 176)
+    assert reloaded.predict_risk(30.5, 'Defender', 2, 176) == predictor.predict_risk(30.5, 'Defender', 2, 176)
+    assert reloaded._model is None
+    assert reloaded.model.n_estimators == 10
+
+    assert not InjuryPredictor().load_model(model_path, expected_fingerprint='autres données')
+
+    # Une nouvelle écriture crée une version neuve: l'artefact déjà ouvert reste intact
+    opened = ModelArtifact(model_path)
+    version_path = opened.version_path
+    predictor.save_model(model_path)
+    assert ModelArtifact(model_path).version_path != version_path
+    assert os.path.exists(opened.object_path('model'))
+    assert reloaded.model.n_estimators == 10
+
+    # Estimateur pas encore relu: sa version peut être supprimée entre-temps
+    lazy = InjuryPredictor()
+    assert lazy.load_model(model_path)
+    for _ in range(3):
+        predictor.save_model(model_path)
+    assert not os.path.exists(lazy._model_loader.path)
+    assert lazy.model.n_estimators == 10
+
+
+def test_risk_table_covers_the_simulator_space(tmp_path):
+    injuries_df, players_df = _training_data()
+    cache = ModelCache(str(tmp_path))
+    predictor = cache.get_predictor(injuries_df, players_df, SMALL_FOREST)
+    table = predictor.risk_table
+
+    assert table.shape == (25, 4, 12, 61)
+    players = pd.DataFrame({
+        'age': [16, 29, 40],
+        'position': ['Goalkeeper', 'Attack', 'Midfield'],
+        'month': [1, 7, 12],
+        'height': [150, 183, 210],
+    })
+    expected = predictor.predict_batch(players, report=False)['risk_probability'].tolist()
+    assert [table.lookup(*player)[0] for player in players.itertuples(index=False)] == expected
+
+    # Hors de la grille: prédiction directe par le modèle
+    assert table.lookup(41, 'Attack', 1, 180) is None
+    assert table.lookup(25.5, 'Attack', 1, 180) is None
+    assert 'error' not in predictor.predict_risk(25.5, 'Attack', 1, 180)
+
+    assert cache.find_predictor(injuries_df, players_df, SMALL_FOREST) is predictor
+    assert ModelCache(str(tmp_path / "empty")).find_predictor(injuries_df, players_df, SMALL_FOREST) is None
+
+
+def test_training_evaluation_modes():
+    injuries_df, players_df = _training_data()
+
+    oob = InjuryPredictor(SMALL_FOREST).train(injuries_df, players_df)
+    assert oob['evaluation'] == 'oob'
+    assert 0.0 <= oob['oob_score'] <= 1.0
+    assert oob['cv_mean'] is None
+
+    cv = InjuryPredictor(SMALL_FOREST).train(injuries_df, players_df, evaluation='cv')
+    assert cv['evaluation'] == 'cv'
+    assert 0.0 <= cv['cv_mean'] <= 1.0
+
+    # Le mode d'évaluation ne change pas le modèle entraîné
+    assert oob['accuracy'] == cv['accuracy']
+
+
+def test_incremental_update_adds_trees_then_falls_back_to_retrain(tmp_path):
+    injuries_df, players_df = _training_data(n_injuries=400)
+    history_df, new_df = injuries_df.iloc[:360], injuries_df.iloc[360:]
+
+    cache = ModelCache(str(tmp_path))
+    predictor = cache.get_predictor(history_df, players_df, SMALL_FOREST)
+
+    updated = cache.update_predictor(history_df, new_df.reset_index(drop=True), players_df, SMALL_FOREST)
+    assert updated is not predictor
+    assert updated.model.n_estimators == 10 + InjuryPredictor.MIN_INCREMENTAL_TREES
+    assert updated.flat_forest.n_estimators == updated.model.n_estimators
+    assert predictor.model.n_estimators == 10
+    assert cache.get_predictor(injuries_df, players_df, SMALL_FOREST) is updated
+
+    # Lot décalé (joueurs vieillis de 15 ans): dérive détectée
+    drifted_players = players_df.assign(date_of_birth=players_df['date_of_birth'] - pd.Timedelta(days=15 * 365))
+    update = updated.update(new_df, drifted_players)
+    assert update['status'] == 'retrain_required'
+    assert any('age_at_injury' in reason for reason in update['reasons'])
+
+    update = updated.update(new_df, drifted_players, history_injuries_df=injuries_df)
+    assert update['status'] == 'retrained'
+    assert updated.model.n_estimators == 10
+    assert updated.incremental_rows == 0
+
+
+def test_skipped_update_is_published_for_the_full_history(tmp_path):
+    injuries_df, players_df = _training_data(n_injuries=400)
+    history_df = injuries_df.iloc[:360]
+    cache = ModelCache(str(tmp_path))
+    previous = cache.get_predictor(history_df, players_df, SMALL_FOREST)
+
+    # Joueurs inconnus: aucune ligne exploitable, le modèle précédent est republié
+    unknown_df = injuries_df.iloc[360:].assign(player_id=999).reset_index(drop=True)
+    published = cache.update_predictor(history_df, unknown_df, players_df, SMALL_FOREST)
+    full_df = pd.concat([history_df, unknown_df], ignore_index=True)
+
+    assert published is not previous
+    assert published.data_fingerprint == data_fingerprint(full_df, players_df)
+    assert cache.get_predictor(full_df, players_df, SMALL_FOREST) is published
+    header = ModelArtifact(cache.model_path(published.fingerprint)).header
+    assert header['data_fingerprint'] == published.data_fingerprint
+    assert previous.data_fingerprint == data_fingerprint(history_df, players_df)
+
+
+def test_single_month_batch_is_not_seasonal_drift(tmp_path):
+    injuries_df, players_df = _training_data(n_injuries=400)
+    predictor = ModelCache(str(tmp_path)).get_predictor(injuries_df.iloc[:360], players_df, SMALL_FOREST)
+
+    # Lot d'une seule collecte: toutes les blessures du même mois d'hiver
+    batch_df = injuries_df.iloc[360:]
+    batch_df = batch_df.assign(from_date=batch_df['from_date'].map(lambda date: date.replace(month=1, day=10)))
+    update = predictor.update(batch_df, players_df)
+    assert update['drift']['feature_shift']['winter_season'] > 0.5
+    assert update['status'] == 'updated'
+    assert update['drift']['reasons'] == []
+
+
+def test_hist_gradient_boosting_engine(tmp_path):
+    injuries_df, players_df = _training_data()
+    cache = ModelCache(str(tmp_path))
+    params = {'max_iter': 20}
+
+    predictor = cache.get_predictor(injuries_df, players_df, params, engine='hist_gradient_boosting')
+    assert predictor.training_results['evaluation'] == 'holdout'
+    assert predictor.flat_forest is None
+    assert predictor.get_model_info()['model_type'] == 'Histogram Gradient Boosting'
+    assert predictor.model.is_categorical_[predictor.feature_names.index('position_encoded')]
+    assert ModelArtifact(cache.model_path(predictor.fingerprint)).header['flat_forest'] is None
+
+    # Même empreinte de données, moteur différent: modèles distincts
+    forest = cache.get_predictor(injuries_df, players_df, SMALL_FOREST)
+    assert forest.fingerprint != predictor.fingerprint
+
+    cache.clear()
+    reloaded = cache.find_predictor(injuries_df, players_df, params, engine='hist_gradient_boosting')
+    assert reloaded.engine == 'hist_gradient_boosting'
+    players = pd.DataFrame({'age': [22.5, 33.0], 'position': ['Attack', 'Defender'], 'month': [1, 7]})
+    assert np.allclose(
+        reloaded.predict_batch(players)['risk_probability'],
+        predictor.predict_batch(players)['risk_probability']
+    )
+
+    # Pas de mise à jour incrémentale pour le boosting
+    update = reloaded.update(injuries_df.iloc[:40], players_df)
+    assert update['status'] == 'retrain_required'
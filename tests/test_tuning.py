@@ -0,0 +1,57 @@
+"""
+Tests de la recherche d'hyperparamètres
+"""
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.feature_store import FeatureStore
+from src.model_config import load_model_config
+from src.tuning import halving_schedule, tune_hyperparameters
+from tests.test_model_cache import _training_data
+
+
+def test_halving_schedule_ends_on_full_data():
+    assert halving_schedule(27, eta=3) == [(27, 1 / 9), (9, 1 / 3), (3, 1)]
+    assert halving_schedule(4, eta=2) == [(4, 0.5), (2, 1)]
+
+
+def test_search_persists_the_winner(tmp_path):
+    injuries_df, players_df = _training_data()
+    config_path = str(tmp_path / "model_config.json")
+    history_path = str(tmp_path / "tuning_history.json")
+
+    result = tune_hyperparameters(
+        injuries_df, players_df, budget_seconds=120, n_candidates=4, eta=2, workers=2,
+        feature_store=FeatureStore(str(tmp_path / "features")),
+        history_path=history_path, config_path=config_path
+    )
+
+    with open(history_path, encoding='utf-8') as f:
+        history = json.load(f)
+    assert [record['round'] for record in history].count(0) == 4
+    assert all(record['fit_seconds'] > 0 for record in history)
+
+    config = load_model_config(config_path)
+    assert result['winner']['round'] == 1
+    assert config['n_estimators'] == result['winner']['params']['n_estimators']
+    assert config['class_weight'] == 'balanced'
+
+
+def test_budget_stops_running_candidates(tmp_path):
+    injuries_df, players_df = _training_data(n_injuries=20000)
+
+    start = time.perf_counter()
+    result = tune_hyperparameters(
+        injuries_df, players_df, budget_seconds=0.5, n_candidates=4, eta=2, workers=2,
+        feature_store=FeatureStore(str(tmp_path / "features")),
+        history_path=None, config_path=None
+    )
+
+    assert time.perf_counter() - start < 10
+    assert multiprocessing.active_children() == []
+    assert result['winner'] is None or result['winner']['round'] == 0
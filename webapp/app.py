@@ -16,9 +16,15 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from src.analyzer import InjuryAnalyzer
 from src.ml_predictor import InjuryPredictor
 from src.data_collector import DataCollector
+from src.dataset import enable_copy_on_write, get_shared_dataset
+from src.model_cache import get_trained_predictor
+from src.batch_scoring import load_risk_scores, player_risk
 from database.models import get_cassandra_session
 from database.crud import PlayerCRUD, InjuryCRUD
 
+# Vues copy-on-write des tables partagées entre sessions
+enable_copy_on_write()
+
 # Configuration de la page
 st.set_page_config(
     page_title="⚽ Football Injury Analytics",
@@ -53,18 +59,14 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-@st.cache_data
-def load_data():
-    """Charger les données avec mise en cache"""
+def load_dataset():
+    """Jeu de données partagé par toutes les sessions (chargé une fois par processus)"""
     try:
-        # Charger les CSV existants
-        injuries_df = pd.read_csv("player_injuries.csv")
-        players_df = pd.read_csv("player_profiles.csv")
-        
-        return injuries_df, players_df
+        # CSV du répertoire courant, lus via le cache colonnaire
+        return get_shared_dataset(".")
     except Exception as e:
         st.error(f"Erreur lors du chargement des données: {e}")
-        return pd.DataFrame(), pd.DataFrame()
+        return None
 
 def main():
     """Fonction principale de l'application"""
@@ -86,14 +88,14 @@ def main():
     
     # Chargement des données
     with st.spinner("Chargement des données..."):
-        injuries_df, players_df = load_data()
+        dataset = load_dataset()
     
-    if injuries_df.empty or players_df.empty:
+    if dataset is None or dataset.injuries_df.empty or dataset.players_df.empty:
         st.error("❌ Impossible de charger les données. Vérifiez que les fichiers CSV sont présents.")
         return
     
-    # Initialiser l'analyseur
-    analyzer = InjuryAnalyzer(injuries_df, players_df)
+    # Analyseur partagé (construit une seule fois par version des données)
+    analyzer = dataset.analyzer
     
     # Navigation entre les pages
     if page == "📊 Vue d'ensemble":
@@ -101,7 +103,7 @@ def main():
     elif page == "🔍 Analyse détaillée":
         show_detailed_analysis(analyzer)
     elif page == "🤖 Prédictions ML":
-        show_ml_predictions(analyzer)
+        show_ml_predictions(analyzer, dataset.fingerprint)
     elif page == "👤 Profil joueur":
         show_player_profile(analyzer)
     elif page == "📈 Données temps réel":
@@ -183,6 +185,20 @@ def show_overview(analyzer):
             color_discrete_sequence=px.colors.qualitative.Set3
         )
         st.plotly_chart(fig_severity, use_container_width=True)
+    
+    # Risque pré-calculé par le scoring nocturne (scripts/score_players.py)
+    risk_scores = load_risk_scores()
+    if risk_scores is not None:
+        st.subheader("🚨 Joueurs les plus exposés (modèle ML)")
+        top_risk = risk_scores.nlargest(10, 'risk_probability')
+        st.dataframe(
+            top_risk[['player_name', 'position', 'age', 'risk_probability']].rename(columns={
+                'player_name': 'Joueur', 'position': 'Position',
+                'age': 'Âge', 'risk_probability': 'Risque blessure grave (%)'
+            }).round(1),
+            use_container_width=True
+        )
+        st.caption(f"Calcul du {risk_scores['scored_at'].max():%d/%m/%Y}")
 
 def show_detailed_analysis(analyzer):
     """Afficher l'analyse détaillée"""
@@ -191,8 +207,11 @@ def show_detailed_analysis(analyzer):
     # Filtres
     st.sidebar.subheader("🎛️ Filtres")
     
+    # Agrégats pré-calculés: les filtres deviennent des coupes du cube
+    cube = analyzer.cube
+    
     # Sélection de la période
-    years = analyzer.merged_df['injury_year'].dropna().unique()
+    years = cube.cells['injury_year'].dropna().unique()
     selected_years = st.sidebar.multiselect(
         "Années",
         options=sorted(years),
@@ -200,21 +219,17 @@ def show_detailed_analysis(analyzer):
     )
     
     # Sélection des positions
-    positions = analyzer.merged_df['main_position'].dropna().unique()
+    positions = cube.cells['main_position'].dropna().unique()
     selected_positions = st.sidebar.multiselect(
         "Positions",
         options=sorted(positions),
         default=[]
     )
     
-    # Filtrer les données
-    filtered_df = analyzer.merged_df.copy()
-    if selected_years:
-        filtered_df = filtered_df[filtered_df['injury_year'].isin(selected_years)]
-    if selected_positions:
-        filtered_df = filtered_df[filtered_df['main_position'].isin(selected_positions)]
+    # Filtres appliqués au cube (liste vide = pas de filtre)
+    cube_filters = {'injury_year': selected_years, 'main_position': selected_positions}
     
-    st.info(f"📊 {len(filtered_df)} blessures sélectionnées avec les filtres actuels")
+    st.info(f"📊 {cube.count(**cube_filters)} blessures sélectionnées avec les filtres actuels")
     
     # Corrélation âge-blessures
     st.subheader("👴 Corrélation âge vs gravité des blessures")
@@ -223,22 +238,19 @@ def show_detailed_analysis(analyzer):
     
     # Analyse saisonnière
     st.subheader("🗓️ Analyse saisonnière")
-    monthly_data = filtered_df.groupby('injury_month').agg({
-        'player_id': 'count',
-        'days_missed': 'mean'
-    }).round(2)
+    monthly_data = cube.rollup(['injury_month'], **cube_filters)[['injury_count', 'days_mean']].round(2)
     
     fig_seasonal = go.Figure()
     fig_seasonal.add_trace(go.Bar(
         x=monthly_data.index,
-        y=monthly_data['player_id'],
+        y=monthly_data['injury_count'],
         name='Nombre de blessures',
         marker_color='lightblue'
     ))
     
     fig_seasonal.add_trace(go.Scatter(
         x=monthly_data.index,
-        y=monthly_data['days_missed'],
+        y=monthly_data['days_mean'],
         mode='lines+markers',
         name='Durée moyenne (jours)',
         yaxis='y2',
@@ -261,13 +273,7 @@ def show_detailed_analysis(analyzer):
     # Heatmap des blessures par position et mois
     st.subheader("🔥 Heatmap: Blessures par position et mois")
     
-    heatmap_data = filtered_df.pivot_table(
-        values='player_id',
-        index='main_position',
-        columns='injury_month',
-        aggfunc='count',
-        fill_value=0
-    )
+    heatmap_data = cube.rollup(['main_position', 'injury_month'], **cube_filters)['injury_count'].unstack(fill_value=0)
     
     fig_heatmap = px.imshow(
         heatmap_data,
@@ -280,28 +286,34 @@ def show_detailed_analysis(analyzer):
     # Tableau détaillé
     st.subheader("📋 Données détaillées")
     if st.checkbox("Afficher les données brutes"):
+        # Les lignes brutes ne sont filtrées qu'à la demande
+        filtered_df = analyzer.merged_df
+        if selected_years:
+            filtered_df = filtered_df[filtered_df['injury_year'].isin(selected_years)]
+        if selected_positions:
+            filtered_df = filtered_df[filtered_df['main_position'].isin(selected_positions)]
+        
         st.dataframe(
             filtered_df[['player_name', 'main_position', 'injury_reason', 'from_date', 'days_missed', 'severity']],
             use_container_width=True
         )
 
-def show_ml_predictions(analyzer):
-    """Afficher les prédictions ML"""
+def show_ml_predictions(analyzer, data_fp=None):
+    """Afficher les prédictions ML (data_fp: empreinte mémorisée du jeu de données)"""
     st.header("🤖 Prédictions et Machine Learning")
     
-    with st.spinner("Entraînement du modèle de prédiction..."):
-        ml_results = analyzer.predict_injury_risk()
+    # Modèle partagé entre sessions: entraîné une seule fois par version des données
+    with st.spinner("Chargement du modèle de prédiction..."):
+        predictor = get_trained_predictor(analyzer.injuries_df, analyzer.players_df, data_fp=data_fp)
     
     # Vérifier s'il y a une erreur
-    if 'error' in ml_results:
-        st.error(f"❌ Erreur ML: {ml_results['error']}")
+    if predictor is None:
+        st.error("❌ Erreur ML: l'entraînement du modèle a échoué")
         st.info("💡 Vérifiez que les données contiennent suffisamment d'informations pour l'entraînement")
-        
-        if 'available_data' in ml_results:
-            st.warning(f"Données disponibles: {ml_results['available_data']} échantillons (minimum: 10)")
-        
         return
     
+    ml_results = predictor.training_results
+    
     # Métriques du modèle
     col1, col2, col3 = st.columns(3)
     
@@ -329,8 +341,8 @@ def show_ml_predictions(analyzer):
         )
     
     # Informations sur les données d'entraînement
-    st.info(f"📊 Modèle entraîné sur {ml_results.get('training_data_size', 0)} échantillons, "
-            f"testé sur {ml_results.get('test_data_size', 0)} échantillons")
+    st.info(f"📊 Modèle entraîné sur {ml_results.get('training_samples', 0)} échantillons, "
+            f"testé sur {ml_results.get('test_samples', 0)} échantillons")
     
     # Importance des features
     st.subheader("📊 Importance des facteurs prédictifs")
@@ -353,90 +365,61 @@ def show_ml_predictions(analyzer):
     # Simulateur de risque
     st.subheader("🎮 Simulateur de risque de blessure")
     
-    # Vérifier si le modèle existe et fonctionne
-    if ml_results.get('model') is None:
-        st.error("❌ Modèle non disponible pour les prédictions")
-        return
-    
     col1, col2 = st.columns(2)
     
     with col1:
         age_input = st.slider("Âge du joueur", 16, 40, 25)
-        # Adapter selon les features disponibles
-        if 'height_normalized' in ml_results.get('features_used', []):
-            height_input = st.slider("Taille (cm)", 150, 210, 180)
-        else:
-            height_input = None
+        height_input = st.slider("Taille (cm)", 150, 210, 180)
     
     with col2:
-        position_options = analyzer.merged_df['main_position'].dropna().unique()
+        position_options = list(predictor.label_encoders['position'].classes_)
         position_input = st.selectbox("Position", position_options)
         month_input = st.selectbox("Mois", list(range(1, 13)), index=0)
     
     if st.button("🔮 Prédire le risque"):
-        try:
-            # Encoder la position
-            position_encoded = ml_results['label_encoders']['position'].transform([position_input])[0]
-            
-            # Préparer les features selon le modèle
-            features_used = ml_results.get('features_used', [])
-            feature_values = []
-            
-            # Construire le vecteur de features dans l'ordre correct
-            for feature in features_used:
-                if feature == 'age':
-                    feature_values.append(age_input)
-                elif feature == 'position_encoded':
-                    feature_values.append(position_encoded)
-                elif feature == 'injury_month':
-                    feature_values.append(month_input)
-                elif feature == 'height_normalized' and height_input:
-                    feature_values.append(height_input)
-                else:
-                    feature_values.append(0)  # Valeur par défaut
-            
-            # Faire la prédiction
-            prediction_input = [feature_values]
-            risk_proba = ml_results['model'].predict_proba(prediction_input)[0]
-            
-            # Afficher le résultat
-            if len(risk_proba) > 1:
-                risk_percentage = risk_proba[1] * 100
-                
-                if risk_percentage > 70:
-                    st.error(f"🚨 Risque élevé: {risk_percentage:.1f}% de chance de blessure grave")
-                elif risk_percentage > 40:
-                    st.warning(f"⚠️ Risque modéré: {risk_percentage:.1f}% de chance de blessure grave")
-                else:
-                    st.success(f"✅ Risque faible: {risk_percentage:.1f}% de chance de blessure grave")
-                
-                # Afficher les détails
-                st.info(f"🔍 Détails: Probabilité sûr={risk_proba[0]*100:.1f}%, "
-                       f"Probabilité blessure grave={risk_proba[1]*100:.1f}%")
-            else:
-                st.warning("⚠️ Prédiction non disponible - modèle mal entraîné")
-                
-        except Exception as e:
-            st.error(f"❌ Erreur lors de la prédiction: {e}")
+        prediction = predictor.predict_risk(
+            age=age_input,
+            position=position_input,
+            month=month_input,
+            height=height_input
+        )
+        
+        if 'error' in prediction:
+            st.error(f"❌ Erreur lors de la prédiction: {prediction['error']}")
             st.info("💡 Vérifiez que le modèle est correctement entraîné et que les données sont valides")
+            return
+        
+        # Afficher le résultat
+        risk_percentage = prediction['risk_probability']
+        
+        if risk_percentage > 70:
+            st.error(f"🚨 Risque élevé: {risk_percentage:.1f}% de chance de blessure grave")
+        elif risk_percentage > 40:
+            st.warning(f"⚠️ Risque modéré: {risk_percentage:.1f}% de chance de blessure grave")
+        else:
+            st.success(f"✅ Risque faible: {risk_percentage:.1f}% de chance de blessure grave")
+        
+        # Afficher les détails
+        st.info(f"🔍 Détails: Probabilité sûr={prediction['safe_probability']:.1f}%, "
+               f"Probabilité blessure grave={risk_percentage:.1f}%")
 
 def show_player_profile(analyzer):
     """Afficher le profil d'un joueur"""
     st.header("👤 Profil individuel de joueur")
     
-    # Sélection du joueur
-    players_list = analyzer.merged_df[['player_id', 'player_name']].drop_duplicates()
+    # Sélection du joueur (noms et identifiants issus de l'index par joueur)
+    player_index = analyzer.player_index
     
     col1, col2 = st.columns(2)
     
     with col1:
         selected_player_name = st.selectbox(
             "Rechercher un joueur",
-            options=players_list['player_name'].sort_values().unique()
+            options=player_index.sorted_player_names
         )
     
     # Obtenir l'ID du joueur sélectionné
-    selected_player_id = players_list[players_list['player_name'] == selected_player_name]['player_id'].iloc[0]
+    selected_player_id = player_index.player_id_for_name(selected_player_name)
     
     with col2:
         st.info(f"ID du joueur: {selected_player_id}")
@@ -487,6 +470,16 @@ def show_player_profile(analyzer):
                 profile['most_common_injury']
             )
         
+        # Risque ML issu du scoring nocturne (aucune inférence à l'affichage)
+        precomputed = player_risk(selected_player_id)
+        if precomputed is not None:
+            st.metric(
+                "Risque blessure grave (ML)",
+                f"{precomputed['risk_probability']:.1f}%",
+                delta=f"Calcul du {precomputed['scored_at']:%d/%m/%Y}",
+                delta_color="off"
+            )
+        
         # Timeline des blessures
         st.subheader("📅 Historique des blessures")
         
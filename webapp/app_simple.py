@@ -10,6 +10,23 @@ from datetime import datetime, timedelta
 import sys
 import os
 
+# Ajouter le répertoire parent au path pour les imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.dataset import enable_copy_on_write, get_shared_dataset
+from src.model_cache import find_trained_predictor
+
+# Positions du formulaire de test -> positions connues du modèle (main_position)
+MODEL_POSITIONS = {
+    "Forward": "Attack",
+    "Midfielder": "Midfield",
+    "Defender": "Defender",
+    "Goalkeeper": "Goalkeeper"
+}
+
+# Vues copy-on-write des tables partagées entre sessions
+enable_copy_on_write()
+
 # Configuration de la page
 st.set_page_config(
     page_title="⚽ Football Injury Analytics",
@@ -44,13 +61,13 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-@st.cache_data
+# Dossier des données (racine du projet / data)
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+
 def load_data():
-    """Charger les données avec mise en cache"""
+    """Charger les données depuis le jeu partagé entre toutes les sessions"""
     try:
-        # Déterminer le chemin absolu du dossier data
-        current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        data_dir = os.path.join(current_dir, "data")
+        data_dir = DATA_DIR
         
         # Charger les CSV existants depuis le dossier data
         injuries_path = os.path.join(data_dir, "player_injuries.csv")
@@ -64,8 +81,10 @@ def load_data():
             st.error(f"❌ Fichier introuvable: {players_path}")
             return pd.DataFrame(), pd.DataFrame()
         
-        injuries_df = pd.read_csv(injuries_path)
-        players_df = pd.read_csv(players_path, low_memory=False)
+        # Jeu de données chargé une fois par processus; chaque appel reçoit
+        # des vues copy-on-write qui ne modifient jamais les tables partagées
+        dataset = get_shared_dataset(data_dir)
+        injuries_df, players_df = dataset.injuries_df, dataset.players_df
         
         st.success(f"✅ Données chargées: {len(injuries_df):,} blessures, {len(players_df):,} profils")
         return injuries_df, players_df
@@ -134,9 +153,8 @@ def show_detailed_analysis(injuries_df, players_df):
             seasons = ['Toutes'] + list(injuries_df['season_name'].dropna().unique())
             selected_season = st.selectbox("Saison", seasons)
     
-    # Filtrer les données
-    filtered_injuries = injuries_df.copy()
-    filtered_players = players_df.copy()
+    # Filtrer les données (les filtres produisent de nouvelles tables)
+    filtered_injuries = injuries_df
     
     if selected_position != 'Tous':
         player_ids = players_df[players_df['position'] == selected_position]['player_id'].values
@@ -165,8 +183,7 @@ def show_detailed_analysis(injuries_df, players_df):
     if not filtered_injuries.empty and 'from_date' in filtered_injuries.columns:
         st.subheader("Évolution temporelle des blessures")
         
-        # Convertir les dates
-        filtered_injuries['from_date'] = pd.to_datetime(filtered_injuries['from_date'], errors='coerce')
+        # Dates déjà converties au chargement
         injuries_by_month = filtered_injuries.groupby(filtered_injuries['from_date'].dt.to_period('M')).size()
         
         if not injuries_by_month.empty:
@@ -196,13 +213,17 @@ def show_player_profile():
         st.warning("Aucune colonne nom trouvée dans les données")
         return
     
+    # Index par joueur partagés (nom -> player_id, player_id -> lignes)
+    dataset = get_shared_dataset(DATA_DIR)
+    players_index = dataset.player_index('players', name_col=name_col)
+    injuries_index = dataset.player_index('injuries')
+    
     # Sélection du joueur
-    player_names = players_df[name_col].dropna().unique()
-    selected_player = st.selectbox("Choisir un joueur", player_names)
+    selected_player = st.selectbox("Choisir un joueur", players_index.player_names)
     
     if selected_player:
-        player_info = players_df[players_df[name_col] == selected_player].iloc[0]
-        player_id = player_info['player_id']
+        player_id = players_index.player_id_for_name(selected_player)
+        player_info = players_index.rows(player_id).iloc[0]
         
         # Afficher info de base
         col1, col2, col3 = st.columns(3)
@@ -229,7 +250,7 @@ def show_player_profile():
             st.write(f"**Taille:** {player_info.get('height_cm', 'N/A')} cm")
         
         # Historique des blessures
-        player_injuries = injuries_df[injuries_df['player_id'] == player_id]
+        player_injuries = injuries_index.rows(player_id)
         
         if not player_injuries.empty:
             st.subheader("Historique des blessures")
@@ -342,11 +363,7 @@ def show_advanced_search():
     # === FILTRES TEMPORELS ===
     st.sidebar.markdown("### 📆 Filtres Temporels")
     
-    # Convertir les dates
-    injuries_df['from_date'] = pd.to_datetime(injuries_df['from_date'], errors='coerce')
-    injuries_df['end_date'] = pd.to_datetime(injuries_df['end_date'], errors='coerce')
-    
-    # Filtre par période
+    # Filtre par période (dates déjà converties au chargement)
     if not injuries_df['from_date'].isna().all():
         min_date = injuries_df['from_date'].min().date()
         max_date = injuries_df['from_date'].max().date()
@@ -361,7 +378,7 @@ def show_advanced_search():
     # === APPLICATION DES FILTRES ===
     
     # Filtrer les joueurs
-    filtered_players = players_df.copy()
+    filtered_players = players_df
     
     # Filtre par nom
     if player_name_search and name_col:
@@ -392,7 +409,7 @@ def show_advanced_search():
     filtered_player_ids = filtered_players['player_id'].tolist()
     
     # Filtrer les blessures
-    filtered_injuries = injuries_df[injuries_df['player_id'].isin(filtered_player_ids)].copy()
+    filtered_injuries = injuries_df[injuries_df['player_id'].isin(filtered_player_ids)]
     
     # Filtre par type de blessure
     if 'Tous' not in selected_injury_types and selected_injury_types:
@@ -569,7 +586,8 @@ def show_advanced_search():
             with col1:
                 # Top des types de blessures
                 st.subheader("🤕 Types de blessures")
-                injury_counts = filtered_injuries['injury_reason'].value_counts().head(10)
+                # Catégories absentes du filtre exclues (sinon barres vides)
+                injury_counts = filtered_injuries['injury_reason'].value_counts()[lambda counts: counts > 0].head(10)
                 fig = px.bar(x=injury_counts.values, y=injury_counts.index, orientation='h')
                 fig.update_layout(height=400, showlegend=False)
                 st.plotly_chart(fig, use_container_width=True)
@@ -593,7 +611,7 @@ def show_advanced_search():
                     how='left'
                 )
                 
-                position_stats = injury_position.groupby('position').agg({
+                position_stats = injury_position.groupby('position', observed=True).agg({
                     'injury_reason': 'count',
                     'days_missed': 'mean',
                     'games_missed': 'mean'
@@ -611,8 +629,8 @@ def show_advanced_search():
         
         if not filtered_injuries.empty and 'from_date' in filtered_injuries.columns:
             # Évolution mensuelle
-            filtered_injuries['month_year'] = filtered_injuries['from_date'].dt.to_period('M')
-            monthly_trend = filtered_injuries.groupby('month_year').size().reset_index()
+            month_year = filtered_injuries['from_date'].dt.to_period('M').rename('month_year')
+            monthly_trend = filtered_injuries.groupby(month_year).size().reset_index()
             monthly_trend['month_year_str'] = monthly_trend['month_year'].astype(str)
             
             fig = px.line(monthly_trend, x='month_year_str', y=0, 
@@ -622,8 +640,8 @@ def show_advanced_search():
             
             # Saisonnalité (mois de l'année)
             if len(filtered_injuries) > 12:
-                filtered_injuries['month'] = filtered_injuries['from_date'].dt.month
-                monthly_pattern = filtered_injuries.groupby('month').size().reset_index()
+                monthly_pattern = filtered_injuries.groupby('injury_month').size().reset_index(name=0)
+                monthly_pattern = monthly_pattern.rename(columns={'injury_month': 'month'})
                 month_names = ['Jan', 'Fév', 'Mar', 'Avr', 'Mai', 'Jun', 
                               'Jul', 'Aoû', 'Sep', 'Oct', 'Nov', 'Déc']
                 monthly_pattern['month_name'] = monthly_pattern['month'].apply(lambda x: month_names[x-1])
@@ -708,6 +726,15 @@ def show_ml_predictions(injuries_df, players_df):
     
     st.markdown("---")
     
+    # Modèle déjà entraîné (partagé avec webapp/app.py via models/); sinon simulation
+    predictor = None
+    if not injuries_df.empty and not players_df.empty:
+        # Empreinte calculée une fois par version des CSV, pas à chaque rerun
+        predictor = find_trained_predictor(injuries_df, players_df,
+                                           data_fp=get_shared_dataset(DATA_DIR).fingerprint)
+    if predictor is None:
+        st.caption("ℹ️ Aucun modèle entraîné disponible: les prédictions sont simulées")
+    
     # Tabs pour différents types de tests
     tab1, tab2, tab3, tab4 = st.tabs(["🎯 Test Rapide", "🔧 Test Personnalisé", "📊 Entraînement", "📈 Performance"])
     
@@ -720,15 +747,15 @@ def show_ml_predictions(injuries_df, players_df):
         
         with col1:
             if st.button("⚡ Test Jeune Attaquant", type="primary"):
-                test_ml_prediction(25, "Forward", 6, "Jeune Attaquant (25 ans)")
+                test_ml_prediction(25, "Forward", 6, "Jeune Attaquant (25 ans)", predictor=predictor)
         
         with col2:
             if st.button("🧠 Test Milieu Expérimenté", type="secondary"):
-                test_ml_prediction(30, "Midfielder", 12, "Milieu Expérimenté (30 ans)")
+                test_ml_prediction(30, "Midfielder", 12, "Milieu Expérimenté (30 ans)", predictor=predictor)
         
         with col3:
             if st.button("🛡️ Test Défenseur Vétéran", type="secondary"):
-                test_ml_prediction(35, "Defender", 3, "Défenseur Vétéran (35 ans)")
+                test_ml_prediction(35, "Defender", 3, "Défenseur Vétéran (35 ans)", predictor=predictor)
     
     with tab2:
         st.subheader("🔧 Configuration Personnalisée")
@@ -749,7 +776,7 @@ def show_ml_predictions(injuries_df, players_df):
             submitted = st.form_submit_button("🚀 Prédire le Risque", type="primary")
             
             if submitted:
-                test_ml_prediction(age, position, month, f"Joueur personnalisé", height)
+                test_ml_prediction(age, position, month, f"Joueur personnalisé", height, predictor=predictor)
     
     with tab3:
         st.subheader("📊 Test d'Entraînement du Modèle")
@@ -773,51 +800,58 @@ def show_ml_predictions(injuries_df, players_df):
             with st.spinner("Évaluation en cours..."):
                 run_performance_tests()
 
-def test_ml_prediction(age, position, month, description, height=180):
+def test_ml_prediction(age, position, month, description, height=180, predictor=None):
     """Tester une prédiction ML et afficher le résultat"""
     try:
-        # Simulation de prédiction ML (pour éviter les erreurs de dépendances)
-        import numpy as np
-        import random
-        
-        # Calculer un score de risque basé sur les paramètres
-        # Simulation réaliste basée sur les facteurs de risque
-        
-        # Facteur âge (risque augmente avec l'âge)
-        age_factor = min((age - 16) / 24.0, 1.0)  # Normaliser 16-40 ans
-        
-        # Facteur position (certaines positions plus risquées)
-        position_factors = {
-            "Forward": 0.7,      # Attaquants plus exposés aux contacts
-            "Midfielder": 0.5,   # Milieux, risque modéré
-            "Defender": 0.6,     # Défenseurs, contacts fréquents
-            "Goalkeeper": 0.3    # Gardiens, moins de contacts
-        }
-        position_factor = position_factors.get(position, 0.5)
-        
-        # Facteur saisonnier (hiver plus risqué)
-        if month in [12, 1, 2]:  # Hiver
-            season_factor = 0.8
-        elif month in [6, 7, 8]:  # Été
-            season_factor = 0.4
-        else:  # Printemps/Automne
-            season_factor = 0.6
-        
-        # Facteur taille (très grands ou très petits joueurs plus à risque)
-        if height < 170 or height > 195:
-            height_factor = 0.7
+        if predictor is not None:
+            # Modèle entraîné: lecture dans la table de risque pré-calculée
+            prediction = predictor.predict_risk(age, MODEL_POSITIONS.get(position, position), month, height)
+            if 'error' not in prediction:
+                prediction = prediction['risk_probability'] / 100
         else:
-            height_factor = 0.5
+            # Simulation de prédiction ML (pour éviter les erreurs de dépendances)
+            import numpy as np
+            import random
+        
+            # Calculer un score de risque basé sur les paramètres
+            # Simulation réaliste basée sur les facteurs de risque
+        
+            # Facteur âge (risque augmente avec l'âge)
+            age_factor = min((age - 16) / 24.0, 1.0)  # Normaliser 16-40 ans
+        
+            # Facteur position (certaines positions plus risquées)
+            position_factors = {
+                "Forward": 0.7,      # Attaquants plus exposés aux contacts
+                "Midfielder": 0.5,   # Milieux, risque modéré
+                "Defender": 0.6,     # Défenseurs, contacts fréquents
+                "Goalkeeper": 0.3    # Gardiens, moins de contacts
+            }
+            position_factor = position_factors.get(position, 0.5)
+        
+            # Facteur saisonnier (hiver plus risqué)
+            if month in [12, 1, 2]:  # Hiver
+                season_factor = 0.8
+            elif month in [6, 7, 8]:  # Été
+                season_factor = 0.4
+            else:  # Printemps/Automne
+                season_factor = 0.6
+        
+            # Facteur taille (très grands ou très petits joueurs plus à risque)
+            if height < 170 or height > 195:
+                height_factor = 0.7
+            else:
+                height_factor = 0.5
+        
+            # Calcul du score final (avec un peu de randomness pour la simulation)
+            base_risk = (age_factor * 0.3 + position_factor * 0.4 + 
+                        season_factor * 0.2 + height_factor * 0.1)
         
-        # Calcul du score final (avec un peu de randomness pour la simulation)
-        base_risk = (age_factor * 0.3 + position_factor * 0.4 + 
-                    season_factor * 0.2 + height_factor * 0.1)
+            # Ajouter un peu de variabilité aléatoire
+            random.seed(age + hash(position) + month)  # Pour la reproductibilité
+            noise = random.uniform(-0.15, 0.15)
         
-        # Ajouter un peu de variabilité aléatoire
-        random.seed(age + hash(position) + month)  # Pour la reproductibilité
-        noise = random.uniform(-0.15, 0.15)
+            prediction = max(0.0, min(1.0, base_risk + noise))  # Garder entre 0 et 1
         
-        prediction = max(0.0, min(1.0, base_risk + noise))  # Garder entre 0 et 1
         
         # Afficher les résultats
         st.success("✅ Prédiction réalisée avec succès!")